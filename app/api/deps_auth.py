@@ -4,12 +4,15 @@ from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db, get_db
 from app.core.config import settings
 from app.db.models.user import User
 from app.services.jwt_service import decode_access_token
+from app.services.principal_cache import UserPrincipal, get_principal_cache
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -38,11 +41,9 @@ def _parse_user_id(raw: str) -> str | UUID:
         return raw
 
 
-def get_current_user(
-    request: Request,
-    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+def _user_id_from_request(
+    request: Request, creds: HTTPAuthorizationCredentials | None
+) -> str | UUID:
     token = get_token_from_request(request, creds)
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -53,7 +54,69 @@ def get_current_user(
     if not user_id_raw or not isinstance(user_id_raw, str):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user_id = _parse_user_id(user_id_raw)
+    return _parse_user_id(user_id_raw)
+
+
+def get_current_principal(
+    request: Request,
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> UserPrincipal:
+    """
+    Authenticated user's id/email without an ORM load. The JWT is still verified on
+    every request; the user lookup is cached (see principal_cache), so a hit never
+    checks out a DB connection.
+    """
+    user_id = _user_id_from_request(request, creds)
+
+    cache = get_principal_cache()
+    principal = cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = db.query(User.id, User.email).filter(User.id == user_id).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    principal = UserPrincipal(id=row.id, email=row.email)
+    cache.put(principal)
+    return principal
+
+
+async def get_current_principal_async(
+    request: Request,
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPrincipal:
+    """
+    get_current_principal for async routes: the Redis tier uses the async client and
+    a miss goes through the async engine, so nothing blocks the event loop.
+    """
+    user_id = _user_id_from_request(request, creds)
+
+    cache = get_principal_cache()
+    principal = await cache.aget(user_id)
+    if principal is not None:
+        return principal
+
+    row = (await db.execute(select(User.id, User.email).where(User.id == user_id))).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    principal = UserPrincipal(id=row.id, email=row.email)
+    await cache.aput(principal)
+    return principal
+
+
+def get_current_user(
+    request: Request,
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    """
+    Full ORM user, for routes that read or modify the users row itself.
+    """
+    user_id = _user_id_from_request(request, creds)
 
     user = db.query(User).filter(User.id == user_id).one_or_none()
     if not user:
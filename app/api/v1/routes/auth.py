@@ -1,21 +1,36 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.api.deps_auth import get_current_user
+from app.api.deps_auth import get_current_principal
 from app.api.v1.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
 from app.core.config import settings
 from app.db.models.user import User
 from app.services.jwt_service import create_access_token
 from app.services.password_policy import validate_password
-from app.services.rate_limiter import rate_limit_or_429
+from app.services.principal_cache import UserPrincipal
+from app.services.rate_limit_window import RateLimit
+from app.services.rate_limiter import rate_limits_or_429
 from app.services.security import hash_password, verify_password
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def _auth_rate_limits(scope: str, email: str, request: Request) -> None:
+    """
+    Per-email and per-client-IP windows, checked (and counted) together.
+    """
+    ip = request.client.host if request.client else "unknown"
+    rate_limits_or_429(
+        [
+            RateLimit(scope, email.lower(), settings.rate_limit_auth_per_minute, 60),
+            RateLimit(f"{scope}:ip", ip, settings.rate_limit_auth_ip_per_minute, 60),
+        ]
+    )
+
+
 def _set_auth_cookie(response: Response, token: str) -> None:
     response.set_cookie(
         key=getattr(settings, "AUTH_COOKIE_NAME", "access_token"),
@@ -31,15 +46,11 @@ def _set_auth_cookie(response: Response, token: str) -> None:
 @router.post("/register", response_model=TokenResponse)
 def register(
     payload: RegisterRequest,
+    request: Request,
     response: Response,
     db: Session = Depends(get_db),
 ) -> TokenResponse:
-    rate_limit_or_429(
-        scope="auth:register",
-        identity=payload.email.lower(),
-        limit=settings.rate_limit_auth_per_minute,
-        window_seconds=60,
-    )
+    _auth_rate_limits("auth:register", payload.email, request)
 
     # ✅ password policy
     try:
@@ -70,15 +81,11 @@ def register(
 @router.post("/login", response_model=TokenResponse)
 def login(
     payload: LoginRequest,
+    request: Request,
     response: Response,
     db: Session = Depends(get_db),
 ) -> TokenResponse:
-    rate_limit_or_429(
-        scope="auth:login",
-        identity=payload.email.lower(),
-        limit=settings.rate_limit_auth_per_minute,
-        window_seconds=60,
-    )
+    _auth_rate_limits("auth:login", payload.email, request)
 
     user = db.query(User).filter(User.email == payload.email).one_or_none()
 
@@ -95,7 +102,7 @@ def login(
 
 
 @router.get("/me")
-def me(current_user: User = Depends(get_current_user)):
+def me(current_user: UserPrincipal = Depends(get_current_principal)):
     return {
         "id": str(current_user.id),
         "email": current_user.email,
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from app.services.llm_cache import get_llm_cache
+
 router = APIRouter()
 
 
@@ -13,4 +15,11 @@ async def health_check() -> dict[str, str]:
     - Docker health checks (later)
     - Load balancer probes (future)
     """
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@router.get("/health/llm-cache", tags=["Health"])
+def llm_cache_health() -> dict:
+    """
+    LLM response cache hit ratio (this process and, with Redis, all workers).
+    """
+    return get_llm_cache().stats()
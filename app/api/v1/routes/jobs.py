@@ -1,42 +1,79 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.api.deps_auth import get_current_user
+from app.api.deps import get_async_db, get_db
+from app.api.deps_auth import get_current_principal, get_current_principal_async
 from app.api.v1.schemas.job_progress import JobProgressResponse
 from app.api.v1.schemas.jobs import JobCreateRequest, JobListResponse, JobResponse
 from app.core.config import settings
+from app.core.redis_client import async_redis_client
 from app.db.models.job import Job, JobStatus
-from app.db.models.user import User
-from app.db.repositories.chat import get_chat_session, list_messages
-from app.db.repositories.final_results import get_final_result
+from app.db.session import SessionLocal
+from app.db.repositories.chat import add_message, get_chat_session, list_messages
+from app.db.repositories.final_results import get_final_result_async
+from app.db.repositories.job_events import list_job_events_after
 from app.db.repositories.jobs import (
-    count_jobs_for_user,
+    count_jobs_for_user_async,
     delete_job as delete_job_repo,
     get_job,
-    list_jobs_for_user,
+    list_jobs_for_user_after_async,
+    list_jobs_for_user_async,
     update_job_fields,
 )
-from app.db.repositories.transcript import count_segments, fetch_segments_page
-from app.db.repositories.transcript_search import count_search_hits, search_segments
+from app.db.repositories.transcript import (
+    count_segments_async,
+    fetch_segments_after_async,
+    fetch_segments_page_async,
+    iter_segments_for_export,
+)
+from app.db.repositories.transcript_search import search_segments_page
 from app.schemas.ask_video import AskVideoCitation, AskVideoRequest, AskVideoResponse
 from app.schemas.export import MarkdownExportOut
 from app.schemas.results import JobResultsOut
 from app.schemas.transcript import TranscriptPageOut
 from app.schemas.transcript_search import TranscriptSearchHit, TranscriptSearchResponse
-from app.services.ask_video_service import ask_video
+from app.services.ask_video_service import PreparedAsk, ask_video, prepare_ask, stream_ask_events
+from app.services.audio_store_service import release_job_audio
 from app.services.job_service import create_or_get_job_for_youtube
+from app.services.job_stream import (
+    JOB_STREAM_REPLAY_LIMIT,
+    event_payload,
+    parse_last_event_id,
+    progress_payload,
+    stream_job_updates,
+)
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.services.principal_cache import UserPrincipal
 from app.services.rate_limiter import rate_limit_or_429
+from app.services.sse import SSE_HEADERS, format_sse
+from app.services.transcript_export import (
+    EXPORT_FORMATS,
+    accepts_gzip,
+    gzip_stream,
+    iter_encoded,
+    iter_transcript_export,
+)
 from app.workers.celery_app import celery_app
 
 router = APIRouter(tags=["Jobs"])
 
 
+def _decode_cursor_or_400(cursor: str, kind: str, parse) -> Any:
+    try:
+        return parse(decode_cursor(cursor, kind))
+    except (InvalidCursorError, KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 def job_to_response(job: Job) -> JobResponse:
     """
     FE-26 polish: include created_at + youtube_url + title in JobResponse.
@@ -64,7 +101,7 @@ def job_to_response(job: Job) -> JobResponse:
 def create_job(
     payload: JobCreateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_principal),
 ) -> JobResponse:
     """
     Create a processing job for a YouTube URL.
@@ -106,7 +143,7 @@ def create_job(
 def get_job_status(
     job_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_principal),
 ) -> JobResponse:
     job = get_job(db, job_id)
     if job is None or job.user_id != user.id:
@@ -116,18 +153,37 @@ def get_job_status(
 
 
 @router.get("/jobs", response_model=JobListResponse)
-def list_jobs(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+async def list_jobs(
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(get_current_principal_async),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True),
 ) -> JobListResponse:
-    items = list_jobs_for_user(db, user.id, limit=limit, offset=offset)
-    total = count_jobs_for_user(db, user.id)
+    if cursor is None and offset:
+        # Legacy offset paging
+        items = await list_jobs_for_user_async(db, user.id, limit=limit + 1, offset=offset)
+    else:
+        after = None
+        if cursor is not None:
+            after = _decode_cursor_or_400(
+                cursor, "jobs", lambda c: (datetime.fromisoformat(c["requested_at"]), UUID(c["id"]))
+            )
+        items = await list_jobs_for_user_after_async(db, user.id, after=after, limit=limit + 1)
+
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_cursor = (
+        encode_cursor("jobs", requested_at=items[-1].requested_at.isoformat(), id=str(items[-1].id))
+        if has_more
+        else None
+    )
 
     return JobListResponse(
         items=[job_to_response(j) for j in items],
-        total=total,
+        total=await count_jobs_for_user_async(db, user.id) if include_total else None,
+        next_cursor=next_cursor,
     )
 
 
@@ -135,7 +191,7 @@ def list_jobs(
 def cancel_job(
     job_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_principal),
 ) -> JobResponse:
     """
     Cancel an in-progress job.
@@ -168,13 +224,15 @@ def cancel_job(
 def delete_job_route(
     job_id: UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_principal),
 ):
     job = get_job(db, job_id)
     if job is None or job.user_id != user.id:
         raise HTTPException(status_code=404, detail="Job not found")
 
     try:
+        # Drop the shared audio blob reference in the same transaction as the delete
+        release_job_audio(db, job.id)
         delete_job_repo(db, job)
     except Exception as e:
         raise HTTPException(
@@ -186,60 +244,150 @@ def delete_job_route(
 
 
 @router.get("/jobs/{job_id}/progress", response_model=JobProgressResponse)
-def get_job_progress(
+async def get_job_progress(
     job_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(get_current_principal_async),
 ) -> JobProgressResponse:
-    job = get_job(db, job_id)
+    job = await db.get(Job, job_id)
     if job is None or job.user_id != user.id:
         raise HTTPException(status_code=404, detail="Job not found")
 
     return JobProgressResponse.model_validate(job)
 
 
+def _load_job_updates(job_id: UUID, after_id: int) -> tuple[dict | None, list[dict]]:
+    # Own session: the request-scoped one is closed before the body is streamed.
+    with SessionLocal() as db:
+        job = get_job(db, job_id)
+        if job is None:
+            return None, []
+        events = list_job_events_after(
+            db, job_id, after_id=after_id, limit=JOB_STREAM_REPLAY_LIMIT
+        )
+        return progress_payload(job), [event_payload(e) for e in events]
+
+
+@router.get("/jobs/{job_id}/progress/stream")
+def stream_job_progress(
+    job_id: UUID,
+    request: Request,
+    last_event_id: str | None = Query(None),
+    db: Session = Depends(get_db),
+    user: UserPrincipal = Depends(get_current_principal),
+) -> StreamingResponse:
+    """
+    Push alternative to polling /progress, over SSE:
+    job_event* (id = job_events.id) -> progress -> (progress | job_event)* -> done.
+
+    Reconnects resume after the Last-Event-ID header (or ?last_event_id=, since
+    EventSource can't set headers on the first request).
+    """
+    job = get_job(db, job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def load(after_id: int) -> tuple[dict | None, list[dict]]:
+        return await run_in_threadpool(_load_job_updates, job_id, after_id)
+
+    body = stream_job_updates(
+        job_id,
+        pubsub=async_redis_client.pubsub(),
+        load=load,
+        last_event_id=parse_last_event_id(request.headers.get("last-event-id") or last_event_id),
+    )
+    return StreamingResponse(body, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/jobs/{job_id}/transcript", response_model=TranscriptPageOut)
-def get_job_transcript(
+async def get_job_transcript(
     job_id: UUID,
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(get_current_principal_async),
 ) -> TranscriptPageOut:
-    job = db.query(Job).filter(Job.id == job_id).one_or_none()
+    job = await db.get(Job, job_id)
     if job is None or job.user_id != user.id:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    total = count_segments(db, job_id)
-    rows = fetch_segments_page(db, job_id, limit=limit, offset=offset)
-    next_offset = offset + limit if (offset + limit) < total else None
+    # Fetch one extra row to learn whether another page exists without a COUNT.
+    if cursor is None and offset:
+        rows = await fetch_segments_page_async(db, job_id, limit=limit + 1, offset=offset)
+    else:
+        after_idx = _decode_cursor_or_400(cursor, "segments", lambda c: int(c["idx"])) if cursor else None
+        rows = await fetch_segments_after_async(db, job_id, after_idx=after_idx, limit=limit + 1)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
     return TranscriptPageOut(
         job_id=str(job_id),
-        total=total,
+        total=await count_segments_async(db, job_id) if include_total else None,
         limit=limit,
         offset=offset,
-        next_offset=next_offset,
+        next_offset=offset + limit if (has_more and cursor is None) else None,
+        next_cursor=encode_cursor("segments", idx=rows[-1]["idx"]) if has_more else None,
         items=rows,
     )
 
 
+def _stream_transcript_export(job_id: UUID, fmt: str):
+    # Own session: the request-scoped one is closed before the body is streamed.
+    with SessionLocal() as db:
+        yield from iter_transcript_export(iter_segments_for_export(db, job_id), fmt)
+
+
+@router.get("/jobs/{job_id}/transcript/export")
+async def export_job_transcript(
+    job_id: UUID,
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|srt|vtt|txt)$"),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(get_current_principal_async),
+) -> StreamingResponse:
+    job = await db.get(Job, job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    media_type, ext = EXPORT_FORMATS[format]
+    headers = {
+        "Content-Disposition": f'attachment; filename="job-{job_id}-transcript.{ext}"',
+        "Vary": "Accept-Encoding",
+    }
+
+    body = iter_encoded(_stream_transcript_export(job_id, format))
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
 @router.get("/jobs/{job_id}/transcript/search", response_model=TranscriptSearchResponse)
 def search_job_transcript(
     job_id: UUID,
     q: str = Query(..., min_length=1),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_principal),
 ) -> TranscriptSearchResponse:
     job = db.query(Job).filter(Job.id == job_id).one_or_none()
     if job is None or job.user_id != user.id:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    total = count_search_hits(db, job_id, q)
-    rows = search_segments(db, job_id, q, limit=limit, offset=offset)
-    next_offset = offset + limit if (offset + limit) < total else None
+    after = None
+    if cursor is not None:
+        after = _decode_cursor_or_400(cursor, "search", lambda c: (float(c["rank"]), int(c["idx"])))
+        offset = 0
+
+    rows, total = search_segments_page(db, job_id, q, limit=limit + 1, offset=offset, after=after)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
     return TranscriptSearchResponse(
         job_id=str(job_id),
@@ -247,25 +395,26 @@ def search_job_transcript(
         total=total,
         limit=limit,
         offset=offset,
-        next_offset=next_offset,
+        next_offset=offset + limit if (has_more and cursor is None) else None,
+        next_cursor=encode_cursor("search", rank=rows[-1]["rank"], idx=rows[-1]["idx"]) if has_more else None,
         items=[TranscriptSearchHit(**r) for r in rows],
     )
 
 
 @router.get("/jobs/{job_id}/results", response_model=JobResultsOut)
-def get_job_results(
+async def get_job_results(
     job_id: UUID,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(get_current_principal_async),
 ) -> JobResultsOut:
-    job = db.query(Job).filter(Job.id == job_id).one_or_none()
+    job = await db.get(Job, job_id)
     if job is None or job.user_id != user.id:
         raise HTTPException(status_code=404, detail="Job not found")
 
     if job.status == JobStatus.FAILED.value:
         raise HTTPException(status_code=409, detail="Job failed; results unavailable")
 
-    final = get_final_result(db, job_id)
+    final = await get_final_result_async(db, job_id)
     if final is None:
         raise HTTPException(status_code=404, detail="Results not ready")
 
@@ -276,20 +425,20 @@ def get_job_results(
     "/jobs/{job_id}/export/markdown",
     responses={200: {"content": {"text/markdown": {}}}},
 )
-def export_job_markdown(
+async def export_job_markdown(
     job_id: UUID,
     format: str = Query("raw", pattern="^(raw|json)$"),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(get_current_principal_async),
 ):
-    job = db.query(Job).filter(Job.id == job_id).one_or_none()
+    job = await db.get(Job, job_id)
     if job is None or job.user_id != user.id:
         raise HTTPException(status_code=404, detail="Job not found")
 
     if job.status == JobStatus.FAILED.value:
         raise HTTPException(status_code=409, detail="Job failed; export unavailable")
 
-    final = get_final_result(db, job_id)
+    final = await get_final_result_async(db, job_id)
     if final is None:
         raise HTTPException(status_code=404, detail="Results not ready")
 
@@ -310,7 +459,7 @@ def ask_the_video(
     job_id: str,
     payload: AskVideoRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_principal),
 ):
     try:
         job_uuid = UUID(job_id)
@@ -336,6 +485,8 @@ def ask_the_video(
             question=payload.question,
             k=payload.top_k,
             session_id=session_uuid,
+            ef_search=payload.ef_search,
+            retrieval_mode=payload.retrieval_mode,
         )
         db.commit()
     except ValueError as e:
@@ -356,12 +507,78 @@ def ask_the_video(
     return JSONResponse(content=result.model_dump())
 
 
+async def _stream_ask(prepared: PreparedAsk):
+    def _save(content: str, citations: list[dict]) -> None:
+        # Own session: the request-scoped one is closed before the body is streamed.
+        with SessionLocal() as db:
+            add_message(
+                db,
+                session_id=prepared.session_id,
+                role="assistant",
+                content=content,
+                citations_json=citations,
+            )
+            db.commit()
+
+    async def save_answer(content: str, citations: list[dict]) -> None:
+        await run_in_threadpool(_save, content, citations)
+
+    async for event, data in stream_ask_events(prepared, save_answer=save_answer):
+        yield format_sse(event, data)
+
+
+@router.post("/jobs/{job_id}/ask/stream")
+def ask_the_video_stream(
+    job_id: UUID,
+    payload: AskVideoRequest,
+    db: Session = Depends(get_db),
+    user: UserPrincipal = Depends(get_current_principal),
+) -> StreamingResponse:
+    """
+    Same as /ask, but streams the answer over SSE:
+    session -> token* -> citations -> done (or error).
+    """
+    job = db.query(Job).filter(Job.id == job_id).one_or_none()
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    session_uuid = None
+    if payload.session_id:
+        try:
+            session_uuid = UUID(payload.session_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid session_id")
+
+    try:
+        prepared = prepare_ask(
+            db,
+            job_id=job_id,
+            user_id=user.id,
+            question=payload.question,
+            k=payload.top_k,
+            session_id=session_uuid,
+            ef_search=payload.ef_search,
+            retrieval_mode=payload.retrieval_mode,
+        )
+        db.commit()  # user message is visible before the first token
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception:
+        db.rollback()
+        raise
+
+    return StreamingResponse(_stream_ask(prepared), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/jobs/{job_id}/chat/{session_id}")
 def get_chat_history(
     job_id: UUID,
     session_id: UUID,
+    limit: int = Query(200, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor to load older messages"),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: UserPrincipal = Depends(get_current_principal),
 ):
     job = db.query(Job).filter(Job.id == job_id).one_or_none()
     if job is None or job.user_id != user.id:
@@ -371,10 +588,15 @@ def get_chat_history(
     if session is None or session.user_id != user.id or session.job_id != job_id:
         raise HTTPException(status_code=404, detail="Chat session not found")
 
-    msgs = list_messages(db, session_id=session_id, limit=200)
+    before_id = _decode_cursor_or_400(cursor, "chat", lambda c: int(c["id"])) if cursor else None
+    msgs = list_messages(db, session_id=session_id, limit=limit + 1, before_id=before_id)
+    has_more = len(msgs) > limit
+    msgs = msgs[-limit:]  # chronological; drop the extra (oldest) row
+
     return {
         "job_id": str(job_id),
         "session_id": str(session_id),
+        "next_cursor": encode_cursor("chat", id=msgs[0].id) if has_more else None,
         "messages": [
             {
                 "id": m.id,
@@ -26,4 +26,5 @@ class JobResponse(BaseModel):
 
 class JobListResponse(BaseModel):
     items: list[JobResponse]
-    total: int
\ No newline at end of file
+    total: int | None  # None when include_total=false
+    next_cursor: str | None = None
\ No newline at end of file
@@ -24,6 +24,33 @@ class Settings(BaseSettings):
     rate_limit_enabled: bool = Field(True, alias="RATE_LIMIT_ENABLED")
     rate_limit_jobs_per_minute: int = Field(10, alias="RATE_LIMIT_JOBS_PER_MINUTE")
     rate_limit_auth_per_minute: int = Field(20, alias="RATE_LIMIT_AUTH_PER_MINUTE")
+    # Per client IP across all emails (credential stuffing / signup bursts)
+    rate_limit_auth_ip_per_minute: int = Field(100, alias="RATE_LIMIT_AUTH_IP_PER_MINUTE")
+
+    # Map-summarize fan-out (LLM calls in flight per task)
+    map_summarize_concurrency: int = Field(4, alias="MAP_SUMMARIZE_CONCURRENCY")
+    map_summarize_chunk_retries: int = Field(2, alias="MAP_SUMMARIZE_CHUNK_RETRIES")
+
+    # Transcription writes segments in batches: every N segments or T seconds
+    transcribe_flush_segments: int = Field(50, alias="TRANSCRIBE_FLUSH_SEGMENTS")
+    transcribe_flush_seconds: float = Field(10.0, alias="TRANSCRIBE_FLUSH_SECONDS")
+
+    # Parallel transcription: split long audio at silences into up to N windows
+    # (1 = off) decoded by a pool of workers
+    transcribe_parallel_windows: int = Field(1, alias="TRANSCRIBE_PARALLEL_WINDOWS")
+    transcribe_parallel_workers: int = Field(4, alias="TRANSCRIBE_PARALLEL_WORKERS")
+    transcribe_min_window_seconds: float = Field(120.0, alias="TRANSCRIBE_MIN_WINDOW_SECONDS")
+
+    # Transcript chunking token budgets (see transcript_chunking_service.ChunkingParams)
+    summary_chunk_tokens: int = Field(1000, alias="SUMMARY_CHUNK_TOKENS")
+    summary_chunk_overlap_tokens: int = Field(0, alias="SUMMARY_CHUNK_OVERLAP_TOKENS")
+    retrieval_chunk_tokens: int = Field(256, alias="RETRIEVAL_CHUNK_TOKENS")
+    retrieval_chunk_overlap_tokens: int = Field(48, alias="RETRIEVAL_CHUNK_OVERLAP_TOKENS")
+
+    # Hierarchical reduce: prompt budget per merge call, max sections per call, calls in flight
+    reduce_batch_tokens: int = Field(6000, alias="REDUCE_BATCH_TOKENS")
+    reduce_max_fan_in: int = Field(8, alias="REDUCE_MAX_FAN_IN")
+    reduce_concurrency: int = Field(4, alias="REDUCE_CONCURRENCY")
 
     # Auth cookie settings
     AUTH_COOKIE_NAME: str = "access_token"
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+import redis
+import redis.asyncio
+
+from app.core.config import settings
+
+# Shared clients (same Redis as the Celery broker). Connections are opened lazily
+# from each client's pool; the async client is for use inside the API event loop.
+redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+async_redis_client = redis.asyncio.Redis.from_url(settings.redis_url, decode_responses=True)
@@ -0,0 +1,31 @@
+"""add (user_id, requested_at, id) index on jobs for keyset pagination
+
+Revision ID: 0aec075abc32
+Revises: 15632e2ba11c
+Create Date: 2026-10-18 12:48:10.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0aec075abc32'
+down_revision: Union[str, Sequence[str], None] = '15632e2ba11c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Scanned backwards for ORDER BY requested_at DESC, id DESC with a row-value seek.
+    op.create_index(
+        "ix_jobs_user_requested_at_id",
+        "jobs",
+        ["user_id", "requested_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_user_requested_at_id", table_name="jobs")
@@ -0,0 +1,55 @@
+"""add transcript_cache_entries table
+
+Revision ID: 10917e9270f9
+Revises: c76a3dd3f6f7
+Create Date: 2026-10-18 09:12:41.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '10917e9270f9'
+down_revision: Union[str, Sequence[str], None] = 'c76a3dd3f6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transcript_cache_entries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("video_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("source_job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("whisper_model", sa.String(length=64), nullable=False),
+        sa.Column("compute_type", sa.String(length=32), nullable=False),
+        sa.Column("beam_size", sa.Integer(), nullable=False),
+        sa.Column("vad_filter", sa.Boolean(), nullable=False),
+        sa.Column("language", sa.String(length=16), nullable=True),
+        sa.Column("segment_count", sa.Integer(), nullable=False),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["source_job_id"], ["jobs.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_transcript_cache_entries_cache_key", "transcript_cache_entries", ["cache_key"], unique=True
+    )
+    op.create_index("ix_transcript_cache_entries_video_id", "transcript_cache_entries", ["video_id"])
+    op.create_index(
+        "ix_transcript_cache_entries_source_job_id", "transcript_cache_entries", ["source_job_id"]
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_transcript_cache_entries_source_job_id;")
+    op.execute("DROP INDEX IF EXISTS ix_transcript_cache_entries_video_id;")
+    op.execute("DROP INDEX IF EXISTS ix_transcript_cache_entries_cache_key;")
+    op.execute("DROP TABLE IF EXISTS transcript_cache_entries;")
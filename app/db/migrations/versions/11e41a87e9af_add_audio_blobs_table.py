@@ -0,0 +1,45 @@
+"""add audio_blobs table
+
+Revision ID: 11e41a87e9af
+Revises: 10917e9270f9
+Create Date: 2026-10-18 10:02:17.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '11e41a87e9af'
+down_revision: Union[str, Sequence[str], None] = '10917e9270f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audio_blobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("video_fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("storage_uri", sa.String(length=2048), nullable=False),
+        sa.Column("ext", sa.String(length=16), nullable=False, server_default=""),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column(
+            "last_accessed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False
+        ),
+    )
+    op.create_index("ix_audio_blobs_content_sha256", "audio_blobs", ["content_sha256"], unique=True)
+    op.create_index("ix_audio_blobs_video_fingerprint", "audio_blobs", ["video_fingerprint"])
+    op.create_index("ix_audio_blobs_last_accessed_at", "audio_blobs", ["last_accessed_at"])
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_audio_blobs_last_accessed_at;")
+    op.execute("DROP INDEX IF EXISTS ix_audio_blobs_video_fingerprint;")
+    op.execute("DROP INDEX IF EXISTS ix_audio_blobs_content_sha256;")
+    op.execute("DROP TABLE IF EXISTS audio_blobs;")
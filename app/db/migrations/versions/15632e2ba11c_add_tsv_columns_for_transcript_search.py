@@ -0,0 +1,36 @@
+"""add stored tsvector columns for transcript search
+
+Revision ID: 15632e2ba11c
+Revises: f48c5a0ac8c6
+Create Date: 2026-10-18 12:05:41.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15632e2ba11c'
+down_revision: Union[str, Sequence[str], None] = 'f48c5a0ac8c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same expression the search queries used inline, now computed once per row on write.
+    for table in ("transcript_segments", "transcript_chunks"):
+        op.execute(
+            f"""
+            ALTER TABLE {table}
+            ADD COLUMN IF NOT EXISTS tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED;
+            """
+        )
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_tsv ON {table} USING gin (tsv);")
+
+
+def downgrade() -> None:
+    for table in ("transcript_chunks", "transcript_segments"):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_tsv;")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS tsv;")
@@ -0,0 +1,50 @@
+"""add kind to transcript_chunks
+
+Revision ID: 3811b43c117f
+Revises: ab4ddb53d0ee
+Create Date: 2026-10-18 16:20:37.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3811b43c117f'
+down_revision: Union[str, Sequence[str], None] = 'ab4ddb53d0ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing chunks keep their embeddings as the retrieval set ...
+    op.add_column(
+        "transcript_chunks",
+        sa.Column("kind", sa.String(length=16), nullable=False, server_default="retrieval"),
+    )
+    op.alter_column("transcript_chunks", "kind", server_default=None)
+
+    op.drop_constraint("uq_chunk_job_idx", "transcript_chunks", type_="unique")
+    op.create_unique_constraint(
+        "uq_chunk_job_kind_idx", "transcript_chunks", ["job_id", "kind", "idx"]
+    )
+
+    # ... and are copied (without embeddings) as the summary set, so map summaries of
+    # existing jobs still line up with their chunk idx.
+    op.execute(
+        """
+        INSERT INTO transcript_chunks (job_id, kind, idx, start_seconds, end_seconds, text)
+        SELECT job_id, 'summary', idx, start_seconds, end_seconds, text
+        FROM transcript_chunks
+        WHERE kind = 'retrieval'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM transcript_chunks WHERE kind = 'summary';")
+    op.drop_constraint("uq_chunk_job_kind_idx", "transcript_chunks", type_="unique")
+    op.create_unique_constraint("uq_chunk_job_idx", "transcript_chunks", ["job_id", "idx"])
+    op.drop_column("transcript_chunks", "kind")
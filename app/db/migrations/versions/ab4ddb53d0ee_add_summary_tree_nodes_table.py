@@ -0,0 +1,41 @@
+"""add summary_tree_nodes table
+
+Revision ID: ab4ddb53d0ee
+Revises: 0fc53d1db383
+Create Date: 2026-10-18 15:02:11.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab4ddb53d0ee'
+down_revision: Union[str, Sequence[str], None] = '0fc53d1db383'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "summary_tree_nodes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("level", sa.Integer(), nullable=False),
+        sa.Column("idx", sa.Integer(), nullable=False),
+        sa.Column("start_seconds", sa.Float(), nullable=False),
+        sa.Column("end_seconds", sa.Float(), nullable=False),
+        sa.Column("summary_md", sa.Text(), nullable=False),
+        sa.Column("input_hash", sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("job_id", "level", "idx", name="uq_summary_tree_nodes_job_level_idx"),
+    )
+    op.create_index("ix_summary_tree_nodes_job_id", "summary_tree_nodes", ["job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_summary_tree_nodes_job_id", table_name="summary_tree_nodes")
+    op.drop_table("summary_tree_nodes")
@@ -0,0 +1,43 @@
+"""add hnsw index on transcript_chunks embedding
+
+Revision ID: f48c5a0ac8c6
+Revises: 11e41a87e9af
+Create Date: 2026-10-18 11:20:04.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f48c5a0ac8c6'
+down_revision: Union[str, Sequence[str], None] = '11e41a87e9af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 51a6d07590dc indexed transcript_segments.embedding, which is never populated;
+    # retrieval orders transcript_chunks by cosine distance (<=>).
+    op.execute("DROP INDEX IF EXISTS ix_transcript_segments_embedding_hnsw;")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_transcript_chunks_embedding_hnsw
+        ON transcript_chunks
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_transcript_chunks_embedding_hnsw;")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_transcript_segments_embedding_hnsw
+        ON transcript_segments
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64);
+        """
+    )
@@ -14,3 +14,7 @@ from app.db.models.action_item import ActionItem
 from app.db.models.final_result import FinalResult
 from app.db.models.chat_session import ChatSession
 from app.db.models.chat_message import ChatMessage
+from app.db.models.transcript_cache_entry import TranscriptCacheEntry
+from app.db.models.audio_blob import AudioBlob
+from app.db.models.llm_response_cache_entry import LLMResponseCacheEntry
+from app.db.models.summary_tree_node import SummaryTreeNode
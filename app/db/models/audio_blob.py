@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AudioBlob(Base):
+    """
+    One downloaded audio file in the shared, content-addressed store.
+    Per-job AUDIO artifacts point at storage_uri; ref_count tracks jobs still holding it.
+    """
+
+    __tablename__ = "audio_blobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    content_sha256: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    video_fingerprint: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+
+    storage_uri: Mapped[str] = mapped_column(String(2048), nullable=False)
+    ext: Mapped[str] = mapped_column(String(16), nullable=False, default="")
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_accessed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True, nullable=False
+    )
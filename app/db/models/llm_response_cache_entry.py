@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LLMResponseCacheEntry(Base):
+    """
+    Durable tier of the LLM response cache (see services.llm_cache).
+    """
+
+    __tablename__ = "llm_response_cache"
+
+    # sha256 of (provider, model, system, user, params)
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    provider: Mapped[str] = mapped_column(String(32), nullable=False)
+    model: Mapped[str] = mapped_column(String(128), nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), index=True, nullable=False
+    )
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
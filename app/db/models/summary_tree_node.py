@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SummaryTreeNode(Base):
+    """
+    Intermediate node of the hierarchical reduce (level 1 merges map_summaries,
+    level 2 merges level 1, ...). input_hash lets a retry reuse finished nodes.
+    """
+
+    __tablename__ = "summary_tree_nodes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    job_id: Mapped[UUID] = mapped_column(
+        ForeignKey("jobs.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    level: Mapped[int] = mapped_column(Integer, nullable=False)
+    idx: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    start_seconds: Mapped[float] = mapped_column(nullable=False)
+    end_seconds: Mapped[float] = mapped_column(nullable=False)
+
+    summary_md: Mapped[str] = mapped_column(Text, nullable=False)
+    input_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("job_id", "level", "idx", name="uq_summary_tree_nodes_job_level_idx"),
+    )
@@ -0,0 +1,46 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class TranscriptCacheEntry(Base):
+    """
+    Points a (video fingerprint, ASR params) content address at the job whose
+    transcript_segments / transcript_chunks rows can be cloned for new jobs.
+    """
+
+    __tablename__ = "transcript_cache_entries"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # sha256 of fingerprint + ASR params (see services.transcript_cache)
+    cache_key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+
+    video_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    # Deleting the source job drops the entry with it
+    source_job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+
+    whisper_model: Mapped[str] = mapped_column(String(64), nullable=False)
+    compute_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    beam_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    vad_filter: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    language: Mapped[str | None] = mapped_column(String(16), nullable=True)
+
+    segment_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    chunk_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
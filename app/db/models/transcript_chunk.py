@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from sqlalchemy import ForeignKey, Integer, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from enum import Enum
+
+from sqlalchemy import Computed, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from pgvector.sqlalchemy import Vector
 
 from app.db.base import Base
 
 
+class ChunkKind(str, Enum):
+    SUMMARY = "summary"  # large chunks fed to map-summarize
+    RETRIEVAL = "retrieval"  # small overlapping chunks, embedded for RAG
+
+
 class TranscriptChunk(Base):
     __tablename__ = "transcript_chunks"
 
@@ -19,6 +26,7 @@ class TranscriptChunk(Base):
         nullable=False,
     )
 
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
     idx: Mapped[int] = mapped_column(Integer, nullable=False)
 
     # timestamps
@@ -27,6 +35,14 @@ class TranscriptChunk(Base):
 
     text: Mapped[str] = mapped_column(Text, nullable=False)
 
+    # Full-text search vector, maintained by Postgres (GIN-indexed); deferred so
+    # ORM loads don't pull it.
+    tsv: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+        deferred=True,
+    )
+
     # ✅ NEW — pgvector embedding (1536 dims for OpenAI text-embedding-3-small)
     embedding: Mapped[list[float] | None] = mapped_column(
         Vector(1536),
@@ -34,5 +50,13 @@ class TranscriptChunk(Base):
     )
 
     __table_args__ = (
-        UniqueConstraint("job_id", "idx", name="uq_chunk_job_idx"),
+        UniqueConstraint("job_id", "kind", "idx", name="uq_chunk_job_kind_idx"),
+        Index("ix_transcript_chunks_tsv", "tsv", postgresql_using="gin"),
+        Index(
+            "ix_transcript_chunks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
     )
\ No newline at end of file
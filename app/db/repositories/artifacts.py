@@ -26,7 +26,8 @@ def upsert_artifact(
     Idempotent artifact creation:
     - if exists, update fields
     - if not, insert
-    - safe under concurrency via unique constraint
+    - safe under concurrency via unique constraint; the insert runs in a savepoint so
+      losing the race does not roll back the caller's pending changes (e.g. a blob ref)
     """
     existing = get_artifact(db, job_id=job_id, type=type)
     if existing:
@@ -48,12 +49,9 @@ def upsert_artifact(
         meta=meta,
     )
     try:
-        db.add(art)
-        db.commit()
-        db.refresh(art)
-        return art
+        with db.begin_nested():
+            db.add(art)
     except IntegrityError:
-        db.rollback()
         # Another worker inserted first — fetch and update
         existing = get_artifact(db, job_id=job_id, type=type)
         if not existing:
@@ -65,4 +63,8 @@ def upsert_artifact(
         db.add(existing)
         db.commit()
         db.refresh(existing)
-        return existing
\ No newline at end of file
+        return existing
+
+    db.commit()
+    db.refresh(art)
+    return art
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.audio_blob import AudioBlob
+
+
+def get_blob_by_sha256(db: Session, content_sha256: str) -> AudioBlob | None:
+    return db.query(AudioBlob).filter(AudioBlob.content_sha256 == content_sha256).one_or_none()
+
+
+def list_blobs_for_fingerprint(db: Session, video_fingerprint: str) -> list[AudioBlob]:
+    return (
+        db.query(AudioBlob)
+        .filter(AudioBlob.video_fingerprint == video_fingerprint)
+        .order_by(AudioBlob.last_accessed_at.desc())
+        .all()
+    )
+
+
+def upsert_blob(
+    db: Session,
+    *,
+    content_sha256: str,
+    video_fingerprint: str,
+    storage_uri: str,
+    ext: str,
+    size_bytes: int,
+) -> AudioBlob:
+    stmt = insert(AudioBlob).values(
+        content_sha256=content_sha256,
+        video_fingerprint=video_fingerprint,
+        storage_uri=storage_uri,
+        ext=ext,
+        size_bytes=size_bytes,
+        ref_count=0,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AudioBlob.content_sha256],
+        set_={
+            "storage_uri": stmt.excluded.storage_uri,
+            "size_bytes": stmt.excluded.size_bytes,
+            "last_accessed_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+    db.flush()
+
+    blob = get_blob_by_sha256(db, content_sha256)
+    if blob is None:
+        raise RuntimeError(f"audio blob vanished after upsert: {content_sha256}")
+    return blob
+
+
+def increment_blob_ref(db: Session, blob_id: int) -> bool:
+    """
+    Atomically take a reference. Returns False if the blob was evicted meanwhile.
+    """
+    result = db.execute(
+        text(
+            """
+            UPDATE audio_blobs
+            SET ref_count = ref_count + 1, last_accessed_at = now()
+            WHERE id = :id
+            """
+        ),
+        {"id": blob_id},
+    )
+    return bool(result.rowcount)
+
+
+def decrement_blob_ref(db: Session, content_sha256: str) -> None:
+    db.execute(
+        text(
+            """
+            UPDATE audio_blobs
+            SET ref_count = GREATEST(ref_count - 1, 0)
+            WHERE content_sha256 = :sha
+            """
+        ),
+        {"sha": content_sha256},
+    )
+
+
+def total_blob_bytes(db: Session) -> int:
+    return int(db.query(func.coalesce(func.sum(AudioBlob.size_bytes), 0)).scalar() or 0)
+
+
+def list_unreferenced_blobs_lru(db: Session, limit: int = 100) -> list[AudioBlob]:
+    return (
+        db.query(AudioBlob)
+        .filter(AudioBlob.ref_count == 0)
+        .order_by(AudioBlob.last_accessed_at.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def delete_blob_if_unreferenced(db: Session, blob_id: int) -> str | None:
+    """
+    Delete the row only if nobody took a reference in the meantime.
+    Returns the storage_uri of the deleted row (caller removes the file), else None.
+    """
+    row = db.execute(
+        text(
+            """
+            DELETE FROM audio_blobs
+            WHERE id = :id AND ref_count = 0
+            RETURNING storage_uri
+            """
+        ),
+        {"id": blob_id},
+    ).mappings().one_or_none()
+    return row["storage_uri"] if row else None
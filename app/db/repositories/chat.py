@@ -32,11 +32,17 @@ def add_message(
     return m
 
 
-def list_messages(db: Session, *, session_id: uuid.UUID, limit: int = 50) -> list[ChatMessage]:
-    return (
-        db.query(ChatMessage)
-        .filter(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.id.desc())
-        .limit(limit)
-        .all()
-    )[::-1]  # return chronological
\ No newline at end of file
+def list_messages(
+    db: Session,
+    *,
+    session_id: uuid.UUID,
+    limit: int = 50,
+    before_id: int | None = None,
+) -> list[ChatMessage]:
+    """
+    Latest `limit` messages (or the ones older than before_id), in chronological order.
+    """
+    q = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+    if before_id is not None:
+        q = q.filter(ChatMessage.id < before_id)
+    return q.order_by(ChatMessage.id.desc()).limit(limit).all()[::-1]  # return chronological
\ No newline at end of file
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models.final_result import FinalResult
@@ -19,4 +22,9 @@ def upsert_final_result(db: Session, job_id, *, payload_json: dict) -> None:
     db.flush()
 
 def get_final_result(db: Session, job_id) -> FinalResult | None:
-    return db.query(FinalResult).filter(FinalResult.job_id == job_id).one_or_none()
\ No newline at end of file
+    return db.query(FinalResult).filter(FinalResult.job_id == job_id).one_or_none()
+
+
+async def get_final_result_async(db: AsyncSession, job_id) -> FinalResult | None:
+    stmt = select(FinalResult).where(FinalResult.job_id == job_id)
+    return (await db.execute(stmt)).scalar_one_or_none()
@@ -1,8 +1,14 @@
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, event, insert
+from sqlalchemy.orm import Session, SessionTransaction
 
 from app.db.models.job_event import JobEvent
+from app.services.job_stream import publish_job_event
+
+# Session.info keys: events waiting for the next flush, and inserted rows waiting for commit
+_PENDING = "pending_job_events"
+_FLUSHED = "flushed_job_events"
 
 
 def create_job_event(
@@ -14,19 +20,55 @@ def create_job_event(
     from_status: str | None = None,
     to_status: str | None = None,
     meta: dict[str, Any] | None = None,
-) -> JobEvent:
-    evt = JobEvent(
-        job_id=job_id,
-        type=type,
-        message=message,
-        from_status=from_status,
-        to_status=to_status,
-        meta=meta,
+) -> None:
+    """
+    Buffer an event in the caller's transaction; written by flush_job_events, at the
+    latest when the session commits. Nothing is written if the transaction rolls back.
+    """
+    db.info.setdefault(_PENDING, []).append(
+        {
+            "job_id": job_id,
+            "type": type,
+            "message": message,
+            "from_status": from_status,
+            "to_status": to_status,
+            "meta": meta,
+        }
     )
-    db.add(evt)
-    db.commit()
-    db.refresh(evt)
-    return evt
+
+
+def flush_job_events(db: Session) -> list[Row]:
+    """
+    Write all buffered events with one multi-row INSERT (no commit). Returned rows are
+    published to job progress subscribers once the transaction commits.
+    """
+    pending = db.info.pop(_PENDING, None)
+    if not pending:
+        return []
+
+    rows = list(db.execute(insert(JobEvent).values(pending).returning(*JobEvent.__table__.c)))
+    db.info.setdefault(_FLUSHED, []).extend(rows)
+    return rows
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_on_commit(session: Session) -> None:
+    flush_job_events(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    for row in session.info.pop(_FLUSHED, None) or []:
+        publish_job_event(row)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_on_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    # Only when the outermost transaction ends (after commit or rollback): a savepoint
+    # rolling back (begin_nested) must not drop events of the still-open transaction
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+        session.info.pop(_FLUSHED, None)
 
 
 def list_job_events(db: Session, job_id, limit: int = 100) -> list[JobEvent]:
@@ -36,4 +78,19 @@ def list_job_events(db: Session, job_id, limit: int = 100) -> list[JobEvent]:
         .order_by(JobEvent.id.asc())
         .limit(limit)
         .all()
-    )
\ No newline at end of file
+    )
+
+
+def list_job_events_after(
+    db: Session, job_id, *, after_id: int, limit: int = 500
+) -> list[JobEvent]:
+    """
+    Events with id > after_id (SSE Last-Event-ID replay), oldest first.
+    """
+    return (
+        db.query(JobEvent)
+        .filter(JobEvent.job_id == job_id, JobEvent.id > after_id)
+        .order_by(JobEvent.id.asc())
+        .limit(limit)
+        .all()
+    )
@@ -3,11 +3,22 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import desc
+from sqlalchemy import Select, desc, func, select, tuple_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from app.db.models.job import Job, JobStatus
+from app.services.audio_store_service import release_job_audio
+from app.services.job_stream import publish_job_progress
+
+# Jobs in these states are over: no stage may move them on, and they never read
+# their audio again
+STOPPED_STATUSES = frozenset({JobStatus.FAILED.value, JobStatus.CANCELED.value})
+
+
+def is_job_stopped(job: Job) -> bool:
+    return (job.status or "").upper() in STOPPED_STATUSES
 
 
 def create_job(
@@ -79,21 +90,74 @@ def list_jobs_for_user(db: Session, user_id, limit: int = 50, offset: int = 0) -
     )
 
 
+def list_jobs_for_user_after(
+    db: Session,
+    user_id,
+    *,
+    after: tuple[datetime, Any] | None,
+    limit: int = 50,
+) -> list[Job]:
+    """
+    Keyset page ordered by (requested_at, id) desc; `after` is the last row of the
+    previous page. Uses ix_jobs_user_requested_at_id.
+    """
+    q = db.query(Job).options(joinedload(Job.video)).filter(Job.user_id == user_id)
+    if after is not None:
+        q = q.filter(tuple_(Job.requested_at, Job.id) < tuple_(*after))
+    return q.order_by(desc(Job.requested_at), desc(Job.id)).limit(limit).all()
+
+
 def count_jobs_for_user(db: Session, user_id) -> int:
     return db.query(Job).filter(Job.user_id == user_id).count()
 
 
+# --- async reads (API hot paths; relationships must be eager-loaded, no lazy IO) ---
+
+
+def _jobs_for_user_stmt(user_id) -> Select:
+    return select(Job).options(joinedload(Job.video)).where(Job.user_id == user_id)
+
+
+async def list_jobs_for_user_async(
+    db: AsyncSession, user_id, limit: int = 50, offset: int = 0
+) -> list[Job]:
+    stmt = _jobs_for_user_stmt(user_id).order_by(desc(Job.requested_at)).offset(offset).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def list_jobs_for_user_after_async(
+    db: AsyncSession,
+    user_id,
+    *,
+    after: tuple[datetime, Any] | None,
+    limit: int = 50,
+) -> list[Job]:
+    stmt = _jobs_for_user_stmt(user_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(Job.requested_at, Job.id) < tuple_(*after))
+    stmt = stmt.order_by(desc(Job.requested_at), desc(Job.id)).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def count_jobs_for_user_async(db: AsyncSession, user_id) -> int:
+    stmt = select(func.count()).select_from(Job).where(Job.user_id == user_id)
+    return int((await db.execute(stmt)).scalar_one())
+
+
 def update_job_fields(db: Session, job: Job, **fields: Any) -> Job:
     """
     Update a job with given fields and commit.
 
-    Cancel safety:
-    - If job is already CANCELED, do NOT allow overwriting status away from CANCELED.
-    - Also block stage/progress updates once canceled.
+    Cancel / failure safety:
+    - If job is already CANCELED or FAILED, do NOT allow overwriting its status (a
+      sibling DAG stage still running must not revive a failed job).
+    - Also block stage/progress updates once stopped; error fields are still written.
+
+    Moving to FAILED or CANCELED drops the job's shared audio blob reference in the
+    same transaction (COMPLETED releases it in finalize_job).
     """
-    if (job.status or "").upper() == JobStatus.CANCELED.value:
-        if "status" in fields and (fields["status"] or "").upper() != JobStatus.CANCELED.value:
-            fields.pop("status", None)
+    if is_job_stopped(job):
+        fields.pop("status", None)
         fields.pop("stage", None)
         fields.pop("progress", None)
 
@@ -101,8 +165,13 @@ def update_job_fields(db: Session, job: Job, **fields: Any) -> Job:
         setattr(job, k, v)
 
     db.add(job)
+    if fields.get("status") in STOPPED_STATUSES:
+        release_job_audio(db, job.id)
     db.commit()
     db.refresh(job)
+
+    if fields.keys() & {"status", "stage", "progress"}:
+        publish_job_progress(job)
     return job
 
 
@@ -116,6 +185,10 @@ def delete_job(db: Session, job: Job) -> None:
     db.commit()
 
 
+def get_job_status(db: Session, job_id) -> str | None:
+    return db.execute(select(Job.status).where(Job.id == job_id)).scalar_one_or_none()
+
+
 def get_job_for_update(db: Session, job_id) -> Job | None:
     return db.query(Job).filter(Job.id == job_id).with_for_update().one_or_none()
 
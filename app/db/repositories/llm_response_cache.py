@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.llm_response_cache_entry import LLMResponseCacheEntry
+
+
+def get_cached_response(db: Session, cache_key: str) -> str | None:
+    """
+    Unexpired response for cache_key; bumps hit stats in the same statement.
+    """
+    row = db.execute(
+        text(
+            """
+            UPDATE llm_response_cache
+            SET hit_count = hit_count + 1, last_hit_at = now()
+            WHERE cache_key = :k AND expires_at > now()
+            RETURNING response
+            """
+        ),
+        {"k": cache_key},
+    ).first()
+    return row[0] if row else None
+
+
+def upsert_cached_response(
+    db: Session,
+    *,
+    cache_key: str,
+    provider: str,
+    model: str,
+    response: str,
+    ttl_seconds: int,
+) -> None:
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+    stmt = insert(LLMResponseCacheEntry).values(
+        cache_key=cache_key,
+        provider=provider,
+        model=model,
+        response=response,
+        hit_count=0,
+        expires_at=expires_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LLMResponseCacheEntry.cache_key],
+        set_={"response": stmt.excluded.response, "expires_at": stmt.excluded.expires_at},
+    )
+    db.execute(stmt)
+    db.flush()
+
+
+def delete_cached_response(db: Session, cache_key: str) -> None:
+    db.execute(text("DELETE FROM llm_response_cache WHERE cache_key = :k"), {"k": cache_key})
+    db.flush()
+
+
+def evict_llm_cache(db: Session, *, max_rows: int) -> int:
+    """
+    Drop expired rows, then the least recently used rows beyond max_rows.
+    Returns the number of rows deleted.
+    """
+    expired = db.execute(
+        text("DELETE FROM llm_response_cache WHERE expires_at <= now()")
+    ).rowcount or 0
+    overflow = db.execute(
+        text(
+            """
+            DELETE FROM llm_response_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM llm_response_cache
+                ORDER BY coalesce(last_hit_at, created_at) DESC
+                OFFSET :max_rows
+            )
+            """
+        ),
+        {"max_rows": int(max_rows)},
+    ).rowcount or 0
+    db.flush()
+    return int(expired) + int(overflow)
@@ -10,6 +10,11 @@ def delete_map_summaries_for_job(db: Session, job_id) -> None:
     db.flush()
 
 
+def list_summarized_idxs(db: Session, job_id) -> set[int]:
+    rows = db.query(MapSummary.idx).filter(MapSummary.job_id == job_id).all()
+    return {int(r[0]) for r in rows}
+
+
 def upsert_map_summary(
     db: Session,
     job_id,
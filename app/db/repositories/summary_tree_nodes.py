@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.summary_tree_node import SummaryTreeNode
+
+
+def list_summary_tree_nodes(db: Session, job_id) -> list[SummaryTreeNode]:
+    return (
+        db.query(SummaryTreeNode)
+        .filter(SummaryTreeNode.job_id == job_id)
+        .order_by(SummaryTreeNode.level.asc(), SummaryTreeNode.idx.asc())
+        .all()
+    )
+
+
+def list_top_summary_tree_nodes(db: Session, job_id) -> list[dict]:
+    """
+    Nodes of the highest reduce level (the input of the final reduce), in time order.
+    Empty when the transcript was short enough to reduce in one call.
+    """
+    rows = db.execute(
+        text(
+            """
+            SELECT level, idx, start_seconds, end_seconds, summary_md
+            FROM summary_tree_nodes
+            WHERE job_id = :job_id
+              AND level = (SELECT max(level) FROM summary_tree_nodes WHERE job_id = :job_id)
+            ORDER BY idx ASC
+            """
+        ),
+        {"job_id": str(job_id)},
+    ).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def upsert_summary_tree_node(
+    db: Session,
+    job_id,
+    *,
+    level: int,
+    idx: int,
+    start_seconds: float,
+    end_seconds: float,
+    summary_md: str,
+    input_hash: str,
+) -> None:
+    stmt = insert(SummaryTreeNode).values(
+        job_id=job_id,
+        level=level,
+        idx=idx,
+        start_seconds=start_seconds,
+        end_seconds=end_seconds,
+        summary_md=summary_md,
+        input_hash=input_hash,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_summary_tree_nodes_job_level_idx",
+        set_={
+            "start_seconds": stmt.excluded.start_seconds,
+            "end_seconds": stmt.excluded.end_seconds,
+            "summary_md": stmt.excluded.summary_md,
+            "input_hash": stmt.excluded.input_hash,
+        },
+    )
+    db.execute(stmt)
+    db.flush()
+
+
+def prune_summary_tree(db: Session, job_id, *, level_sizes: list[int]) -> None:
+    """
+    Drop nodes left over from an earlier, larger tree. level_sizes[i] is the node
+    count of level i + 1 in the current tree.
+    """
+    db.execute(
+        text(
+            """
+            DELETE FROM summary_tree_nodes
+            WHERE job_id = :job_id
+              AND (
+                level > :top
+                OR idx >= coalesce((CAST(:sizes AS integer[]))[level], 0)
+              )
+            """
+        ),
+        {"job_id": str(job_id), "top": len(level_sizes), "sizes": list(level_sizes)},
+    )
+    db.flush()
@@ -1,28 +1,97 @@
 from __future__ import annotations
 
+from typing import Iterator
+
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+_COUNT_SQL = text("SELECT COUNT(*) AS c FROM transcript_segments WHERE job_id=:job_id")
+
+_PAGE_SQL = text(
+    """
+    SELECT idx, start_ms, end_ms, text
+    FROM transcript_segments
+    WHERE job_id=:job_id
+    ORDER BY idx
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+
+def _after_sql(after_idx: int | None):
+    where = "job_id=:job_id" if after_idx is None else "job_id=:job_id AND idx > :after_idx"
+    return text(
+        f"""
+        SELECT idx, start_ms, end_ms, text
+        FROM transcript_segments
+        WHERE {where}
+        ORDER BY idx
+        LIMIT :limit
+        """
+    )
+
 
 def count_segments(db: Session, job_id) -> int:
-    row = db.execute(
-        text("SELECT COUNT(*) AS c FROM transcript_segments WHERE job_id=:job_id"),
-        {"job_id": str(job_id)},
-    ).mappings().one()
+    row = db.execute(_COUNT_SQL, {"job_id": str(job_id)}).mappings().one()
     return int(row["c"])
 
 
 def fetch_segments_page(db: Session, job_id, *, limit: int, offset: int) -> list[dict]:
     rows = db.execute(
+        _PAGE_SQL, {"job_id": str(job_id), "limit": limit, "offset": offset}
+    ).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def fetch_segments_after(db: Session, job_id, *, after_idx: int | None, limit: int) -> list[dict]:
+    """
+    Keyset page: segments with idx > after_idx, served straight off the
+    (job_id, idx) unique index no matter how deep the page is.
+    """
+    rows = db.execute(
+        _after_sql(after_idx), {"job_id": str(job_id), "after_idx": after_idx, "limit": limit}
+    ).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def iter_segments_for_export(db: Session, job_id, *, batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Stream every segment in idx order through a server-side cursor
+    (stream_results/yield_per), so memory stays flat for any transcript length.
+    """
+    result = db.execute(
         text(
             """
             SELECT idx, start_ms, end_ms, text
             FROM transcript_segments
             WHERE job_id=:job_id
             ORDER BY idx
-            LIMIT :limit OFFSET :offset
             """
         ),
-        {"job_id": str(job_id), "limit": limit, "offset": offset},
-    ).mappings().all()
-    return [dict(r) for r in rows]
\ No newline at end of file
+        {"job_id": str(job_id)},
+        execution_options={"stream_results": True, "yield_per": batch_size},
+    )
+    for r in result.mappings():
+        yield dict(r)
+
+
+async def count_segments_async(db: AsyncSession, job_id) -> int:
+    row = (await db.execute(_COUNT_SQL, {"job_id": str(job_id)})).mappings().one()
+    return int(row["c"])
+
+
+async def fetch_segments_page_async(
+    db: AsyncSession, job_id, *, limit: int, offset: int
+) -> list[dict]:
+    result = await db.execute(_PAGE_SQL, {"job_id": str(job_id), "limit": limit, "offset": offset})
+    return [dict(r) for r in result.mappings().all()]
+
+
+async def fetch_segments_after_async(
+    db: AsyncSession, job_id, *, after_idx: int | None, limit: int
+) -> list[dict]:
+    result = await db.execute(
+        _after_sql(after_idx), {"job_id": str(job_id), "after_idx": after_idx, "limit": limit}
+    )
+    return [dict(r) for r in result.mappings().all()]
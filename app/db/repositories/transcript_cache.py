@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.transcript_cache_entry import TranscriptCacheEntry
+from app.services.transcript_cache import AsrParams
+
+
+def get_cache_entry(db: Session, cache_key: str) -> TranscriptCacheEntry | None:
+    return (
+        db.query(TranscriptCacheEntry)
+        .filter(TranscriptCacheEntry.cache_key == cache_key)
+        .one_or_none()
+    )
+
+
+def upsert_cache_entry(
+    db: Session,
+    *,
+    cache_key: str,
+    video_id,
+    source_job_id,
+    params: AsrParams,
+    segment_count: int,
+    chunk_count: int,
+) -> None:
+    """
+    Register (or re-point) the cache entry for a freshly transcribed job.
+    Safe under concurrency via ON CONFLICT on the unique cache_key.
+    """
+    values = {
+        "cache_key": cache_key,
+        "video_id": video_id,
+        "source_job_id": source_job_id,
+        "whisper_model": params.whisper_model,
+        "compute_type": params.compute_type,
+        "beam_size": params.beam_size,
+        "vad_filter": params.vad_filter,
+        "language": params.language,
+        "segment_count": segment_count,
+        "chunk_count": chunk_count,
+        "hit_count": 0,
+    }
+    stmt = insert(TranscriptCacheEntry).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TranscriptCacheEntry.cache_key],
+        set_={
+            "source_job_id": stmt.excluded.source_job_id,
+            "segment_count": stmt.excluded.segment_count,
+            "chunk_count": stmt.excluded.chunk_count,
+        },
+    )
+    db.execute(stmt)
+    db.flush()
+
+
+def delete_cache_entry(db: Session, cache_key: str) -> None:
+    db.query(TranscriptCacheEntry).filter(TranscriptCacheEntry.cache_key == cache_key).delete()
+    db.flush()
+
+
+def record_cache_hit(db: Session, entry: TranscriptCacheEntry) -> None:
+    entry.hit_count = (entry.hit_count or 0) + 1
+    entry.last_hit_at = func.now()
+    db.add(entry)
+    db.flush()
+
+
+def clone_transcript(db: Session, *, source_job_id, target_job_id) -> tuple[int, int]:
+    """
+    Copy transcript_segments + transcript_chunks (including embeddings) from one job to another
+    entirely inside Postgres. Caller owns the transaction.
+    Returns (segments_copied, chunks_copied).
+    """
+    seg_result = db.execute(
+        text(
+            """
+            INSERT INTO transcript_segments (id, job_id, idx, start_ms, end_ms, text)
+            SELECT gen_random_uuid(), :target_job_id, idx, start_ms, end_ms, text
+            FROM transcript_segments
+            WHERE job_id = :source_job_id
+            ORDER BY idx
+            """
+        ),
+        {"source_job_id": str(source_job_id), "target_job_id": str(target_job_id)},
+    )
+
+    chunk_result = db.execute(
+        text(
+            """
+            INSERT INTO transcript_chunks
+                (job_id, kind, idx, start_seconds, end_seconds, text, embedding)
+            SELECT :target_job_id, kind, idx, start_seconds, end_seconds, text, embedding
+            FROM transcript_chunks
+            WHERE job_id = :source_job_id
+            ORDER BY kind, idx
+            """
+        ),
+        {"source_job_id": str(source_job_id), "target_job_id": str(target_job_id)},
+    )
+
+    db.flush()
+    return int(seg_result.rowcount or 0), int(chunk_result.rowcount or 0)
@@ -1,21 +1,49 @@
 from __future__ import annotations
 
+import numpy as np
 from sqlalchemy.orm import Session
 
-from app.db.models.transcript_chunk import TranscriptChunk
+from app.db.models.transcript_chunk import ChunkKind, TranscriptChunk
 
 
-def list_chunks_for_job(db: Session, job_id):
+def list_chunks_for_job(db: Session, job_id, *, kind: str = ChunkKind.RETRIEVAL.value):
     return (
         db.query(TranscriptChunk)
-        .filter(TranscriptChunk.job_id == job_id)
+        .filter(TranscriptChunk.job_id == job_id, TranscriptChunk.kind == kind)
         .order_by(TranscriptChunk.idx.asc())
         .all()
     )
 
 
 def set_chunk_embedding(db: Session, chunk_id: int, embedding: list[float]) -> None:
-    db.query(TranscriptChunk).filter(TranscriptChunk.id == chunk_id).update(
-        {"embedding": embedding}
-    )
-    db.flush()
\ No newline at end of file
+    set_chunk_embeddings(db, [(chunk_id, embedding)])
+
+
+def set_chunk_embeddings(db: Session, items: list[tuple[int, list[float]]]) -> int:
+    """
+    Write many embeddings with one UPDATE ... FROM unnest(ids, vectors).
+    items: [(chunk_id, embedding), ...]
+
+    Runs on the session's psycopg connection with %b placeholders so the vector[]
+    is sent in binary (numpy arrays via the pgvector adapter); a bound list in
+    SQLAlchemy's default format would be dumped as text.
+    """
+    if not items:
+        return 0
+
+    db.flush()
+    conn = db.connection().connection.driver_connection
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE transcript_chunks AS c
+            SET embedding = v.embedding
+            FROM unnest(%b::integer[], %b::vector[]) AS v(id, embedding)
+            WHERE c.id = v.id
+            """,
+            (
+                [int(chunk_id) for chunk_id, _ in items],
+                [np.asarray(emb, dtype=np.float32) for _, emb in items],
+            ),
+        )
+        return int(cur.rowcount or 0)
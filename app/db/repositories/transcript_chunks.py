@@ -10,16 +10,18 @@ def delete_chunks_for_job(db: Session, job_id) -> None:
     db.flush()
 
 
-def insert_chunks(db: Session, job_id, chunks: list[dict]) -> None:
+def insert_chunks(db: Session, job_id, chunks: list[dict], *, kind: str) -> None:
     """
     chunks format:
       { "idx": int, "start_seconds": float, "end_seconds": float, "text": str }
+    kind: ChunkKind value ("summary" | "retrieval")
     """
     db.bulk_insert_mappings(
         TranscriptChunk,
         [
         {
             "job_id": job_id,
+            "kind": kind,
             "idx": c["idx"],
             "start_seconds": c["start_seconds"],
             "end_seconds": c["end_seconds"],
@@ -11,7 +11,7 @@ def count_search_hits(db: Session, job_id, q: str) -> int:
             SELECT COUNT(*) AS c
             FROM transcript_segments
             WHERE job_id = :job_id
-              AND to_tsvector('english', coalesce(text, '')) @@ plainto_tsquery('english', :q)
+              AND tsv @@ plainto_tsquery('english', :q)
             """
         ),
         {"job_id": str(job_id), "q": q},
@@ -20,19 +20,61 @@ def count_search_hits(db: Session, job_id, q: str) -> int:
 
 
 def search_segments(db: Session, job_id, q: str, *, limit: int, offset: int) -> list[dict]:
+    rows, _ = search_segments_page(db, job_id, q, limit=limit, offset=offset)
+    return rows
+
+
+def search_segments_page(
+    db: Session,
+    job_id,
+    q: str,
+    *,
+    limit: int,
+    offset: int = 0,
+    after: tuple[float, int] | None = None,
+) -> tuple[list[dict], int]:
+    """
+    One round trip for the page and the total match count (count(*) OVER (), taken
+    before the keyset filter). Uses the stored, GIN-indexed `tsv` column.
+
+    after: (rank, idx) of the last hit on the previous page (keyset); offset is kept
+    for the legacy API.
+    """
+    seek = "" if after is None else "WHERE rank < :after_rank OR (rank = :after_rank AND idx > :after_idx)"
     rows = db.execute(
         text(
-            """
-            SELECT idx, start_ms, end_ms, text,
-                   ts_rank(to_tsvector('english', coalesce(text, '')),
-                           plainto_tsquery('english', :q)) AS rank
-            FROM transcript_segments
-            WHERE job_id = :job_id
-              AND to_tsvector('english', coalesce(text, '')) @@ plainto_tsquery('english', :q)
+            f"""
+            WITH hits AS (
+                SELECT idx, start_ms, end_ms, text,
+                       ts_rank(tsv, query) AS rank,
+                       count(*) OVER () AS total
+                FROM transcript_segments, plainto_tsquery('english', :q) AS query
+                WHERE job_id = :job_id
+                  AND tsv @@ query
+            )
+            SELECT * FROM hits
+            {seek}
             ORDER BY rank DESC, idx ASC
             LIMIT :limit OFFSET :offset
             """
         ),
-        {"job_id": str(job_id), "q": q, "limit": limit, "offset": offset},
+        {
+            "job_id": str(job_id),
+            "q": q,
+            "limit": limit,
+            "offset": offset,
+            "after_rank": after[0] if after else None,
+            "after_idx": after[1] if after else None,
+        },
     ).mappings().all()
-    return [dict(r) for r in rows]
\ No newline at end of file
+
+    if rows:
+        total = int(rows[0]["total"])
+    elif offset > 0 or after is not None:
+        # Page past the end: the window has no row to report the total on.
+        total = count_search_hits(db, job_id, q)
+    else:
+        total = 0
+
+    items = [{k: v for k, v in r.items() if k != "total"} for r in rows]
+    return items, total
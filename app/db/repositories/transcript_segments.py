@@ -117,4 +117,22 @@ def list_segments_for_job(db: Session, job_id, *, limit: int, offset: int) -> li
         .offset(offset)
         .limit(limit)
         .all()
-    )
\ No newline at end of file
+    )
+
+def get_last_segment(db: Session, job_id) -> dict | None:
+    """
+    Highest-idx persisted segment ({idx, end_ms}), used to resume transcription.
+    """
+    row = db.execute(
+        text(
+            """
+            SELECT idx, end_ms
+            FROM transcript_segments
+            WHERE job_id = :job_id
+            ORDER BY idx DESC
+            LIMIT 1
+            """
+        ),
+        {"job_id": str(job_id)},
+    ).mappings().first()
+    return dict(row) if row else None
@@ -1,10 +1,44 @@
-from sqlalchemy import create_engine
+import psycopg
+from pgvector.psycopg import register_vector, register_vector_async
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger()
 
 # Sync engine for now (simpler with Alembic).
 # We can move to async engine later without pain.
 engine = create_engine(settings.database_url, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
\ No newline at end of file
+
+@event.listens_for(engine, "connect")
+def _register_pgvector(dbapi_connection, connection_record) -> None:
+    # Binary dumpers/loaders for `vector`: numpy arrays bind as typed vector params
+    # instead of '[0.1,...]' text literals.
+    try:
+        register_vector(dbapi_connection)
+    except psycopg.ProgrammingError:
+        # Extension not created yet (fresh DB before migrations).
+        logger.warning("db.pgvector_not_registered")
+
+
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# Async engine for the read-heavy API routes (same URL: postgresql+psycopg resolves to
+# psycopg's async driver here), so DB waits don't hold a threadpool worker.
+async_engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _register_pgvector_async(dbapi_connection, connection_record) -> None:
+    try:
+        dbapi_connection.run_async(register_vector_async)
+    except psycopg.ProgrammingError:
+        logger.warning("db.pgvector_not_registered")
+
+
+# expire_on_commit=False: attribute access after commit would need an implicit (sync) refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -7,15 +9,25 @@ from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.logging import configure_logging, get_logger
 from app.core.middleware import RequestContextMiddleware
+from app.services.async_llm_client import aclose_async_http_client
 from fastapi.middleware.cors import CORSMiddleware
 
 configure_logging(log_level=getattr(settings, "log_level", "INFO"))
 logger = get_logger()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Drain the shared LLM connection pool
+    await aclose_async_http_client()
+
+
 app = FastAPI(
     title="AI Video Note Extractor API",
     description="Backend API for AI-powered video note extraction.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(RequestContextMiddleware)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -8,6 +8,10 @@ class AskVideoRequest(BaseModel):
     question: str = Field(..., min_length=1)
     top_k: int = Field(5, ge=1, le=10)
     session_id: Optional[str] = None  # ✅ NEW
+    # ANN recall/latency knob (hnsw.ef_search); None -> server default
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)
+    # "hybrid" = full-text + vector search fused with reciprocal rank fusion
+    retrieval_mode: Literal["vector", "hybrid"] = "vector"
 
 
 class AskVideoCitation(BaseModel):
@@ -22,7 +26,8 @@ class AskVideoCitation(BaseModel):
     range_ts: str
     label: str
 
-    distance: float
+    distance: Optional[float] = None  # None for lexical-only hybrid hits
+    score: Optional[float] = None  # RRF score (hybrid mode)
     preview: str
 
 
@@ -12,8 +12,9 @@ class TranscriptSegmentOut(BaseModel):
 
 class TranscriptPageOut(BaseModel):
     job_id: str
-    total: int
+    total: int | None  # None when include_total=false
     limit: int
     offset: int
     next_offset: int | None
+    next_cursor: str | None = None
     items: list[TranscriptSegmentOut]
\ No newline at end of file
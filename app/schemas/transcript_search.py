@@ -18,4 +18,5 @@ class TranscriptSearchResponse(BaseModel):
     limit: int
     offset: int
     next_offset: int | None
+    next_cursor: str | None = None
     items: list[TranscriptSearchHit]
\ No newline at end of file
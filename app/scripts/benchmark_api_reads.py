@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Hot read endpoints; {job_id} is filled from --job-id or the caller's newest job.
+ENDPOINTS: dict[str, str] = {
+    "progress": "/api/v1/jobs/{job_id}/progress",
+    "jobs": "/api/v1/jobs?limit=20",
+    "transcript": "/api/v1/jobs/{job_id}/transcript?limit=100",
+    "results": "/api/v1/jobs/{job_id}/results",
+    "markdown": "/api/v1/jobs/{job_id}/export/markdown?format=json",
+}
+
+
+def _p(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    r = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def _newest_job_id(client: httpx.AsyncClient) -> str:
+    r = await client.get("/api/v1/jobs", params={"limit": 1, "include_total": False})
+    r.raise_for_status()
+    items = r.json()["items"]
+    if not items:
+        raise SystemExit("No jobs for this user; create one or pass --job-id.")
+    return items[0]["id"]
+
+
+async def _worker(
+    client: httpx.AsyncClient, path: str, deadline: float, latencies: list[float], errors: list[int]
+) -> None:
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            r = await client.get(path)
+            ok = r.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        if not ok:
+            errors.append(1)
+
+
+async def run(
+    client: httpx.AsyncClient, *, name: str, path: str, concurrency: int, seconds: float, label: str
+) -> None:
+    latencies: list[float] = []
+    errors: list[int] = []
+    # Warm up connections and caches (principal, DB pool) before measuring
+    await asyncio.gather(*(client.get(path) for _ in range(concurrency)))
+
+    t0 = time.perf_counter()
+    deadline = t0 + seconds
+    await asyncio.gather(
+        *(_worker(client, path, deadline, latencies, errors) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - t0
+
+    if not latencies:
+        return
+    print(
+        f"{label:>8} {name:>11} {concurrency:>5} {len(latencies) / elapsed:>9.1f} "
+        f"{statistics.median(latencies):>8.1f} {_p(latencies, 0.95):>8.1f} "
+        f"{_p(latencies, 0.99):>8.1f} {len(errors):>7}"
+    )
+
+
+async def amain(args: argparse.Namespace) -> int:
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30.0) as client:
+        token = args.token or await _login(client, args.email, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+        job_id = args.job_id or await _newest_job_id(client)
+        logger.info("Benchmarking job %s at %s", job_id, args.base_url)
+
+        names = [n.strip() for n in args.endpoints.split(",") if n.strip()]
+        print(
+            f"{'label':>8} {'endpoint':>11} {'conc':>5} {'req/s':>9} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        for name in names:
+            path = ENDPOINTS[name].format(job_id=job_id)
+            for concurrency in args.concurrency:
+                await run(
+                    client,
+                    name=name,
+                    path=path,
+                    concurrency=concurrency,
+                    seconds=args.seconds,
+                    label=args.label,
+                )
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Concurrent load on the hot read endpoints of a running API: req/s and latency "
+            "percentiles per endpoint and concurrency. For before/after numbers, run it "
+            "against each build with the same data and compare rows by --label."
+        )
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API base URL.")
+    parser.add_argument("--token", default=None, help="Bearer token (else --email/--password).")
+    parser.add_argument("--email", default=None, help="Login email.")
+    parser.add_argument("--password", default=None, help="Login password.")
+    parser.add_argument("--job-id", default=None, help="Job to read (default: newest job).")
+    parser.add_argument(
+        "--endpoints", default=",".join(ENDPOINTS), help=f"Comma-separated: {','.join(ENDPOINTS)}"
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,10,50,100",
+        type=lambda v: [int(x) for x in v.split(",") if x.strip()],
+        help="Comma-separated concurrent clients.",
+    )
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measured time per run.")
+    parser.add_argument("--label", default="run", help="Tag printed on each row (e.g. sync/async).")
+    parser.add_argument("--verbose", action="store_true", help="Verbose logging.")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    if not args.token and not (args.email and args.password):
+        parser.error("pass --token or --email and --password")
+    unknown = set(n.strip() for n in args.endpoints.split(",") if n.strip()) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    return asyncio.run(amain(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import time
+
+import numpy as np
+from pgvector.psycopg import register_vector
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.services.retrieval_service import ITERATIVE_SCAN_MIN_VERSION, parse_extension_version
+
+logger = logging.getLogger(__name__)
+
+TABLE = "bench_vector_search"
+
+
+def _grow_table(conn: Connection, *, target: int, dim: int, batch: int, job_size: int) -> None:
+    """
+    Fill the scratch table up to `target` rows with random vectors (generated server-side).
+    Consecutive runs of `job_size` rows share a job_id, like one job's transcript chunks.
+    """
+    current = int(conn.execute(text(f"SELECT count(*) FROM {TABLE}")).scalar_one())
+    while current < target:
+        n = min(batch, target - current)
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {TABLE} (job_id, embedding)
+                SELECT
+                    (:offset + g.i - 1) / :job_size,
+                    (
+                        SELECT array_agg(random()::real - 0.5)
+                        FROM generate_series(1, :dim)
+                        WHERE g.i > 0
+                    )::vector
+                FROM generate_series(1, :n) AS g(i)
+                """
+            ),
+            {"dim": dim, "n": n, "offset": current, "job_size": job_size},
+        )
+        conn.commit()
+        current += n
+        logger.info("  rows=%d/%d", current, target)
+
+
+def _build_index(conn: Connection, *, m: int, ef_construction: int) -> float:
+    conn.execute(text(f"DROP INDEX IF EXISTS ix_{TABLE}_hnsw"))
+    t0 = time.perf_counter()
+    conn.execute(
+        text(
+            f"""
+            CREATE INDEX ix_{TABLE}_hnsw ON {TABLE}
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = {int(m)}, ef_construction = {int(ef_construction)})
+            """
+        )
+    )
+    conn.commit()
+    return time.perf_counter() - t0
+
+
+def _search(conn: Connection, qvec: np.ndarray, k: int) -> tuple[list[int], float]:
+    t0 = time.perf_counter()
+    ids = conn.execute(
+        text(f"SELECT id FROM {TABLE} ORDER BY embedding <=> :q LIMIT :k"),
+        {"q": qvec, "k": k},
+    ).scalars().all()
+    return list(ids), (time.perf_counter() - t0) * 1000.0
+
+
+def _job_search_hnsw(
+    conn: Connection, qvec: np.ndarray, job_id: int, k: int
+) -> tuple[list[int], float]:
+    """
+    Production query shape (retrieval_service._hnsw_search): global index + job filter.
+    """
+    t0 = time.perf_counter()
+    ids = conn.execute(
+        text(f"SELECT id FROM {TABLE} WHERE job_id = :job ORDER BY embedding <=> :q LIMIT :k"),
+        {"q": qvec, "job": job_id, "k": k},
+    ).scalars().all()
+    return list(ids), (time.perf_counter() - t0) * 1000.0
+
+
+def _job_search_exact(
+    conn: Connection, qvec: np.ndarray, job_id: int, k: int
+) -> tuple[list[int], float]:
+    """
+    retrieval_service._exact_search: rank one job's rows via the job_id btree index.
+    """
+    t0 = time.perf_counter()
+    ids = conn.execute(
+        text(
+            f"""
+            WITH job_rows AS MATERIALIZED (
+                SELECT id, embedding FROM {TABLE} WHERE job_id = :job
+            )
+            SELECT id FROM job_rows ORDER BY embedding <=> :q LIMIT :k
+            """
+        ),
+        {"q": qvec, "job": job_id, "k": k},
+    ).scalars().all()
+    return list(ids), (time.perf_counter() - t0) * 1000.0
+
+
+def _iterative_scan_supported(conn: Connection) -> bool:
+    version = conn.execute(
+        text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar_one_or_none()
+    return parse_extension_version(version) >= ITERATIVE_SCAN_MIN_VERSION
+
+
+def run_filtered(
+    conn: Connection,
+    *,
+    size: int,
+    queries: list[np.ndarray],
+    job_ids: list[int],
+    k: int,
+    ef_values: list[int],
+) -> None:
+    """
+    Per-job top-k: exact per-job scan (ground truth) vs the filtered HNSW query, with and
+    without iterative scan. `short` = fraction of queries that returned fewer than k rows.
+    """
+    exact: list[list[int]] = []
+    exact_ms: list[float] = []
+    for q, job_id in zip(queries, job_ids):
+        ids, ms = _job_search_exact(conn, q, job_id, k)
+        exact.append(ids)
+        exact_ms.append(ms)
+    conn.commit()
+    print(
+        f"{size:>9} {'job exact':>14} {1.0:>9.3f} {statistics.median(exact_ms):>9.2f} "
+        f"{_p(exact_ms, 0.95):>9.2f} {0.0:>7.2f}"
+    )
+
+    iterative_modes = ["off", "relaxed_order"] if _iterative_scan_supported(conn) else ["off"]
+    for mode in iterative_modes:
+        if mode != "off":
+            conn.execute(text("SELECT set_config('hnsw.iterative_scan', :v, false)"), {"v": mode})
+        for ef in ef_values:
+            conn.execute(
+                text("SELECT set_config('hnsw.ef_search', :v, false)"), {"v": str(max(ef, k))}
+            )
+            recalls: list[float] = []
+            ann_ms: list[float] = []
+            short = 0
+            for q, job_id, truth in zip(queries, job_ids, exact):
+                ids, ms = _job_search_hnsw(conn, q, job_id, k)
+                ann_ms.append(ms)
+                recalls.append(len(set(ids) & set(truth)) / max(1, len(truth)))
+                short += len(ids) < len(truth)
+            conn.commit()
+            label = f"job ef={ef}" + ("" if mode == "off" else "+it")
+            print(
+                f"{size:>9} {label:>14} {statistics.mean(recalls):>9.3f} "
+                f"{statistics.median(ann_ms):>9.2f} {_p(ann_ms, 0.95):>9.2f} "
+                f"{short / max(1, len(queries)):>7.2f}"
+            )
+    if len(iterative_modes) > 1:
+        conn.execute(text("SELECT set_config('hnsw.iterative_scan', 'off', false)"))
+        conn.commit()
+
+
+def _p(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def run(conn: Connection, *, size: int, queries: list[np.ndarray], k: int, ef_values: list[int]) -> None:
+    # Ground truth: exact scan (planner forbidden from using the index).
+    conn.execute(text("SET enable_indexscan = off"))
+    exact: list[list[int]] = []
+    exact_ms: list[float] = []
+    for q in queries:
+        ids, ms = _search(conn, q, k)
+        exact.append(ids)
+        exact_ms.append(ms)
+    conn.execute(text("SET enable_indexscan = on"))
+    conn.commit()
+
+    print(
+        f"{size:>9} {'exact':>14} {1.0:>9.3f} {statistics.median(exact_ms):>9.2f} "
+        f"{_p(exact_ms, 0.95):>9.2f} {'':>7}"
+    )
+
+    for ef in ef_values:
+        conn.execute(text("SELECT set_config('hnsw.ef_search', :v, false)"), {"v": str(max(ef, k))})
+        recalls: list[float] = []
+        ann_ms: list[float] = []
+        for q, truth in zip(queries, exact):
+            ids, ms = _search(conn, q, k)
+            ann_ms.append(ms)
+            recalls.append(len(set(ids) & set(truth)) / max(1, len(truth)))
+        conn.commit()
+        print(
+            f"{size:>9} {'ef=' + str(ef):>14} {statistics.mean(recalls):>9.3f} "
+            f"{statistics.median(ann_ms):>9.2f} {_p(ann_ms, 0.95):>9.2f} {'':>7}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark HNSW (cosine) vs exact scan: recall@k and latency at several table "
+            "sizes, unfiltered and for the per-job filtered query retrieval actually runs."
+        )
+    )
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated row counts.")
+    parser.add_argument("--dim", type=int, default=1536, help="Vector dimension.")
+    parser.add_argument("--queries", type=int, default=50, help="Queries per size.")
+    parser.add_argument("--k", type=int, default=10, help="Top-k per query.")
+    parser.add_argument("--ef-search", default="20,40,100,200", help="Comma-separated hnsw.ef_search values.")
+    parser.add_argument(
+        "--job-size", type=int, default=300, help="Rows per job_id (chunks of one transcript)."
+    )
+    parser.add_argument("--m", type=int, default=16, help="HNSW m (match the production index).")
+    parser.add_argument("--ef-construction", type=int, default=64, help="HNSW ef_construction.")
+    parser.add_argument("--batch", type=int, default=10000, help="Rows inserted per batch.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for query vectors.")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table afterwards.")
+    parser.add_argument("--verbose", action="store_true", help="Verbose logging.")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+
+    db_url = settings.database_url
+    if not db_url:
+        logger.error("DATABASE_URL is not set in settings.")
+        return 2
+
+    sizes = sorted(int(s) for s in args.sizes.split(",") if s.strip())
+    ef_values = [int(s) for s in args.ef_search.split(",") if s.strip()]
+
+    rng = np.random.default_rng(args.seed)
+    queries = [rng.random(args.dim, dtype=np.float32) - 0.5 for _ in range(args.queries)]
+    job_size = max(1, int(args.job_size))
+
+    engine = create_engine(db_url, pool_pre_ping=True)
+    event.listen(engine, "connect", lambda dbapi_conn, _: register_vector(dbapi_conn))
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {TABLE} (id bigserial PRIMARY KEY, job_id bigint NOT NULL, "
+                f"embedding vector({int(args.dim)}))"
+            )
+        )
+        conn.execute(text(f"CREATE INDEX ix_{TABLE}_job_id ON {TABLE} (job_id)"))
+        conn.commit()
+
+        try:
+            print(
+                f"{'rows':>9} {'mode':>14} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9} {'short':>7}"
+            )
+            for size in sizes:
+                logger.info("Growing %s to %d rows...", TABLE, size)
+                _grow_table(conn, target=size, dim=args.dim, batch=args.batch, job_size=job_size)
+                conn.execute(text(f"ANALYZE {TABLE}"))
+                conn.commit()
+
+                build_s = _build_index(conn, m=args.m, ef_construction=args.ef_construction)
+                logger.info("Built HNSW index on %d rows in %.1fs", size, build_s)
+
+                run(conn, size=size, queries=queries, k=args.k, ef_values=ef_values)
+
+                n_jobs = max(1, size // job_size)
+                job_ids = [int(j) for j in rng.integers(0, n_jobs, size=len(queries))]
+                run_filtered(
+                    conn, size=size, queries=queries, job_ids=job_ids, k=args.k, ef_values=ef_values
+                )
+        finally:
+            if not args.keep:
+                conn.rollback()
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+                conn.commit()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
 from uuid import UUID
 
-from app.services.llm_client import LLMClient
-from app.services.retrieval_service import retrieve_top_k_chunks
+from app.services.async_llm_client import AsyncLLMClient
+from app.services.llm_client import ChatAnswerFormatter, LLMClient
+from app.services.retrieval_service import retrieve_hybrid_chunks, retrieve_top_k_chunks
 from app.db.repositories.chat import create_chat_session, get_chat_session, add_message, list_messages
 from app.db.repositories.final_results import get_final_result
 from app.services.text_sanitize import strip_control_chars
@@ -105,7 +108,15 @@ def _results_context_md(db, job_id: UUID) -> str:
     return "\n\n".join(parts).strip()
 
 
-def ask_video(
+@dataclass(frozen=True)
+class PreparedAsk:
+    session_id: UUID
+    question: str
+    context_md: str
+    hits: list[dict]
+
+
+def prepare_ask(
     db,
     *,
     job_id: UUID,
@@ -114,7 +125,13 @@ def ask_video(
     k: int = 5,
     session_id: UUID | None = None,
     history_limit: int = 10,
-) -> tuple[UUID, str, list[dict]]:
+    ef_search: int | None = None,
+    retrieval_mode: str = "vector",
+) -> PreparedAsk:
+    """
+    Validate/create the session, persist the user message, retrieve and build the
+    LLM context. Shared by the blocking and streaming ask paths; caller commits.
+    """
     question = strip_control_chars(question).strip()
     if not question:
         raise ValueError("Question is empty")
@@ -138,14 +155,21 @@ def ask_video(
     broad = _is_broad_question(question)
 
     # Retrieval strategy:
+    # - "vector": pgvector only
+    # - "hybrid": lexical + vector fused with RRF (better recall, so a smaller k is enough)
     # - For broad questions, grab more context to reduce "not enough info"
-    effective_k = max(k, 12) if broad else k
+    if retrieval_mode == "hybrid":
+        retrieve = retrieve_hybrid_chunks
+        effective_k = max(k, 8) if broad else k
+    else:
+        retrieve = retrieve_top_k_chunks
+        effective_k = max(k, 12) if broad else k
 
-    hits = retrieve_top_k_chunks(db, job_id=job_id, query=question, k=effective_k)
+    hits = retrieve(db, job_id=job_id, query=question, k=effective_k, ef_search=ef_search)
 
     # If retrieval is weak (0 hits) and this is broad, try a second pass with higher k
     if broad and not hits and effective_k < 20:
-        hits = retrieve_top_k_chunks(db, job_id=job_id, query=question, k=20)
+        hits = retrieve(db, job_id=job_id, query=question, k=20, ef_search=ef_search)
 
     # Build transcript context
     if not hits:
@@ -165,20 +189,10 @@ def ask_video(
 
     combined_context += "## Retrieved Transcript Context\n" + transcript_md
 
-    # Ask LLM
-    llm = LLMClient()
-    try:
-        answer = strip_control_chars(
-            llm.answer_question(question=question, context_md=combined_context)
-        ).strip()
-        if not answer:
-            raise ValueError("LLM returned an empty answer")
-    except Exception as e:
-        err_text = f"LLM failed to answer: {e}"
-        add_message(db, session_id=session_id, role="assistant", content=err_text, citations_json=[])
-        raise ValueError(err_text) from e
+    return PreparedAsk(session_id=session_id, question=question, context_md=combined_context, hits=hits)
+
 
-    # Citations
+def build_citations(hits: list[dict]) -> list[dict]:
     citations: list[dict] = []
     for h in hits:
         start_s = float(h["start_seconds"])
@@ -195,7 +209,8 @@ def ask_video(
                 "idx": int(h["idx"]),
                 "start_seconds": start_s,
                 "end_seconds": end_s,
-                "distance": float(h.get("distance", 0.0)),
+                "distance": float(h["distance"]) if h.get("distance") is not None else None,
+                "score": float(h["score"]) if h.get("score") is not None else None,
                 "preview": preview,
                 "start_ts": start_ts,
                 "end_ts": end_ts,
@@ -203,8 +218,94 @@ def ask_video(
                 "label": f"[{range_ts}]",
             }
         )
+    return citations
+
+
+def ask_video(
+    db,
+    *,
+    job_id: UUID,
+    user_id: UUID,
+    question: str,
+    k: int = 5,
+    session_id: UUID | None = None,
+    history_limit: int = 10,
+    ef_search: int | None = None,
+    retrieval_mode: str = "vector",
+) -> tuple[UUID, str, list[dict]]:
+    prepared = prepare_ask(
+        db,
+        job_id=job_id,
+        user_id=user_id,
+        question=question,
+        k=k,
+        session_id=session_id,
+        history_limit=history_limit,
+        ef_search=ef_search,
+        retrieval_mode=retrieval_mode,
+    )
+    session_id = prepared.session_id
+
+    # Ask LLM
+    llm = LLMClient()
+    try:
+        answer = strip_control_chars(
+            llm.answer_question(question=prepared.question, context_md=prepared.context_md)
+        ).strip()
+        if not answer:
+            raise ValueError("LLM returned an empty answer")
+    except Exception as e:
+        err_text = f"LLM failed to answer: {e}"
+        add_message(db, session_id=session_id, role="assistant", content=err_text, citations_json=[])
+        raise ValueError(err_text) from e
+
+    citations = build_citations(prepared.hits)
 
     # ✅ Persist assistant message
     add_message(db, session_id=session_id, role="assistant", content=answer, citations_json=citations)
 
-    return session_id, answer, citations
\ No newline at end of file
+    return session_id, answer, citations
+
+
+async def stream_ask_events(
+    prepared: PreparedAsk,
+    *,
+    save_answer: Callable[[str, list[dict]], Awaitable[None]],
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Streaming counterpart of ask_video's LLM step: yields (event, data) pairs
+    ("session", "token"..., "citations", "done" | "error"). Tokens are post-processed
+    incrementally; save_answer persists the final assistant message.
+    A client disconnect cancels the generator, which aborts the provider request.
+    """
+    yield "session", {"session_id": str(prepared.session_id)}
+
+    fmt = ChatAnswerFormatter()
+    parts: list[str] = []
+    try:
+        llm = AsyncLLMClient()
+        deltas = llm.stream_answer_question(question=prepared.question, context_md=prepared.context_md)
+        async for delta in deltas:
+            out = strip_control_chars(fmt.feed(delta))
+            if out:
+                parts.append(out)
+                yield "token", {"text": out}
+        out = strip_control_chars(fmt.finish())
+        if out:
+            parts.append(out)
+            yield "token", {"text": out}
+
+        answer = "".join(parts).strip()
+        if not answer:
+            raise ValueError("LLM returned an empty answer")
+    except Exception as e:
+        err_text = f"LLM failed to answer: {e}"
+        await save_answer(err_text, [])
+        yield "error", {"detail": err_text}
+        return
+
+    citations = build_citations(prepared.hits)
+    yield "citations", {"citations": citations}
+
+    await save_answer(answer, citations)
+    yield "done", {"session_id": str(prepared.session_id)}
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Any, AsyncIterator
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.services.llm_client import (
+    LLM_CONNECT_TIMEOUT_SECONDS,
+    LLM_KEEPALIVE_EXPIRY_SECONDS,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_TEMPERATURE,
+    LLM_TIMEOUT_SECONDS,
+    _postprocess_chat_answer,
+    answer_prompts,
+    mock_answer,
+)
+
+_http_client: httpx.AsyncClient | None = None
+_openai_clients: dict[str, AsyncOpenAI] = {}
+
+
+def _timeout(seconds: float | None) -> httpx.Timeout:
+    return httpx.Timeout(seconds or LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS)
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Shared keep-alive pool for async LLM calls (API process, one event loop).
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=_timeout(None),
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _openai_clients.clear()
+    return _http_client
+
+
+async def aclose_async_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    _openai_clients.clear()
+
+
+class AsyncLLMClient:
+    """
+    Async counterpart of LLMClient for the API (chat answers). Celery tasks keep
+    using the sync LLMClient.
+
+    Every call takes an optional per-call `timeout` (seconds); cancelling the
+    awaiting task aborts the in-flight HTTP request and returns the connection.
+    """
+
+    def __init__(self) -> None:
+        self.mock = os.getenv("LLM_MOCK", "0") == "1"
+
+        self.provider = os.getenv("LLM_PROVIDER", "openai").strip().lower()
+        self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+        self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
+        self.ollama_model = os.getenv("OLLAMA_MODEL", "llama3.1").strip()
+
+        self.http = get_async_http_client()
+        self.client: AsyncOpenAI | None = None
+
+        if self.mock or self.provider == "ollama":
+            return
+
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is missing (or set LLM_MOCK=1, or LLM_PROVIDER=ollama)")
+
+        client = _openai_clients.get(api_key)
+        if client is None:
+            client = AsyncOpenAI(api_key=api_key, http_client=self.http, timeout=_timeout(None))
+            _openai_clients[api_key] = client
+        self.client = client
+
+    async def _ollama_chat(self, *, system: str, user: str, timeout: float | None) -> str:
+        payload: dict[str, Any] = {
+            "model": self.ollama_model,
+            "stream": False,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+        }
+        if LLM_TEMPERATURE is not None:
+            payload["options"] = {"temperature": LLM_TEMPERATURE}
+        resp = await self.http.post(f"{self.ollama_base_url}/api/chat", json=payload, timeout=_timeout(timeout))
+        resp.raise_for_status()
+        data = resp.json()
+        msg = data.get("message", {}) if isinstance(data, dict) else {}
+        content = msg.get("content") if isinstance(msg, dict) else None
+        return (content or "").strip()
+
+    async def complete(self, *, system: str, user: str, timeout: float | None = None) -> str:
+        if self.mock:
+            preview = " ".join(user.split())[:200]
+            return f"(MOCK) Completion\n\nPrompt: {preview}..."
+
+        if self.provider == "ollama":
+            return await self._ollama_chat(system=system, user=user, timeout=timeout)
+
+        kwargs: dict[str, Any] = {}
+        if LLM_TEMPERATURE is not None:
+            kwargs["temperature"] = LLM_TEMPERATURE
+        resp = await self.client.responses.create(
+            model=self.model,
+            input=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            timeout=_timeout(timeout),
+            **kwargs,
+        )
+        return (resp.output_text or "").strip()
+
+    async def answer_question(self, *, question: str, context_md: str, timeout: float | None = None) -> str:
+        if self.mock:
+            return mock_answer(question)
+
+        system, user = answer_prompts(question=question, context_md=context_md)
+        raw = await self.complete(system=system, user=user, timeout=timeout)
+        return _postprocess_chat_answer(raw)
+
+    async def stream_answer_question(
+        self,
+        *,
+        question: str,
+        context_md: str,
+        timeout: float | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield raw answer deltas (see ChatAnswerFormatter for post-processing).
+        """
+        if self.mock:
+            for piece in re.split(r"(?<=\s)", mock_answer(question)):
+                if piece:
+                    yield piece
+            return
+
+        system, user = answer_prompts(question=question, context_md=context_md)
+        messages = [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+        if self.provider == "ollama":
+            payload: dict[str, Any] = {"model": self.ollama_model, "stream": True, "messages": messages}
+            if LLM_TEMPERATURE is not None:
+                payload["options"] = {"temperature": LLM_TEMPERATURE}
+            url = f"{self.ollama_base_url}/api/chat"
+            async with self.http.stream("POST", url, json=payload, timeout=_timeout(timeout)) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    msg = data.get("message") or {}
+                    content = msg.get("content") if isinstance(msg, dict) else None
+                    if content:
+                        yield content
+                    if data.get("done"):
+                        break
+            return
+
+        kwargs: dict[str, Any] = {}
+        if LLM_TEMPERATURE is not None:
+            kwargs["temperature"] = LLM_TEMPERATURE
+        stream = await self.client.responses.create(
+            model=self.model, input=messages, stream=True, timeout=_timeout(timeout), **kwargs
+        )
+        async with stream:
+            async for event in stream:
+                if getattr(event, "type", "") == "response.output_text.delta" and event.delta:
+                    yield event.delta
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.db.models.artifact import Artifact, ArtifactType
+from app.db.models.audio_blob import AudioBlob
+from app.db.models.job import Job, JobStatus
+from app.db.repositories.artifacts import get_artifact, upsert_artifact
+from app.db.repositories.audio_blobs import (
+    decrement_blob_ref,
+    delete_blob_if_unreferenced,
+    increment_blob_ref,
+    list_blobs_for_fingerprint,
+    list_unreferenced_blobs_lru,
+    total_blob_bytes,
+)
+from app.services.storage_service import AUDIO_STORE_MAX_BYTES, file_uri_to_path
+
+logger = get_logger()
+
+
+def find_live_blob(db: Session, video_fingerprint: str) -> AudioBlob | None:
+    """
+    Most recently used blob for this video whose file is still on disk.
+    """
+    for blob in list_blobs_for_fingerprint(db, video_fingerprint):
+        path = file_uri_to_path(blob.storage_uri)
+        if path is not None and path.exists() and path.stat().st_size > 0:
+            return blob
+    return None
+
+
+def _held_blob_sha(artifact: Artifact | None) -> str | None:
+    meta = (artifact.meta or {}) if artifact is not None else {}
+    if meta.get("blob_ref") and meta.get("blob_sha256"):
+        return str(meta["blob_sha256"])
+    return None
+
+
+def attach_blob_to_job(
+    db: Session, *, job_id, blob: AudioBlob, meta: dict | None = None
+) -> Artifact | None:
+    """
+    Point the job's AUDIO artifact at a shared blob and take one reference on it.
+    Idempotent per job: re-attaching the same blob does not take a second reference.
+    Returns None if the blob was evicted concurrently (caller should download instead)
+    or the job already failed / was canceled (its reference would never be released).
+    Commits (via upsert_artifact).
+    """
+    # Job row lock: serializes attaches for the same job (one reference per job), and a
+    # concurrent cancel either waits for this attach (then releases the new reference)
+    # or commits first and is seen here
+    status = db.execute(
+        select(Job.status).where(Job.id == job_id).with_for_update()
+    ).scalar_one_or_none()
+    if status in (JobStatus.FAILED.value, JobStatus.CANCELED.value):
+        db.rollback()
+        return None
+
+    existing = get_artifact(db, job_id=job_id, type=ArtifactType.AUDIO.value)
+    held = _held_blob_sha(existing)
+
+    if held != blob.content_sha256:
+        if not increment_blob_ref(db, blob.id):
+            db.rollback()
+            return None
+        if held is not None:
+            decrement_blob_ref(db, held)
+
+    return upsert_artifact(
+        db,
+        job_id=job_id,
+        type=ArtifactType.AUDIO.value,
+        storage_uri=blob.storage_uri,
+        content_sha256=blob.content_sha256,
+        size_bytes=blob.size_bytes,
+        meta={
+            **(meta or {}),
+            "ext": blob.ext,
+            "blob_sha256": blob.content_sha256,
+            "blob_ref": True,
+        },
+    )
+
+
+def release_job_audio(db: Session, job_id) -> None:
+    """
+    Drop the job's reference on its shared audio blob (job completed, failed, canceled
+    or deleted). Idempotent.
+    The artifact row stays; the file becomes eligible for eviction. Caller commits.
+    """
+    art = get_artifact(db, job_id=job_id, type=ArtifactType.AUDIO.value)
+    held = _held_blob_sha(art)
+    if art is None or held is None:
+        return
+
+    decrement_blob_ref(db, held)
+    art.meta = {**(art.meta or {}), "blob_ref": False}
+    db.add(art)
+    db.flush()
+
+
+def evict_audio_blobs(db: Session, *, max_bytes: int = AUDIO_STORE_MAX_BYTES) -> int:
+    """
+    Size-bounded LRU eviction over blobs no job currently references.
+    Returns number of blobs evicted. Commits.
+    """
+    total = total_blob_bytes(db)
+    if total <= max_bytes:
+        return 0
+
+    evicted = 0
+    while total > max_bytes:
+        candidates = [(b.id, int(b.size_bytes or 0)) for b in list_unreferenced_blobs_lru(db)]
+        if not candidates:
+            break
+
+        progressed = False
+        for blob_id, size_bytes in candidates:
+            if total <= max_bytes:
+                break
+
+            storage_uri = delete_blob_if_unreferenced(db, blob_id)
+            db.commit()
+            if storage_uri is None:
+                continue  # re-referenced since we listed it
+
+            path = file_uri_to_path(storage_uri)
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+            total -= size_bytes
+            evicted += 1
+            progressed = True
+
+        if not progressed:
+            break
+
+    if total > max_bytes:
+        logger.warning("audio.store.over_budget", total_bytes=total, max_bytes=max_bytes)
+
+    logger.info("audio.store.evicted", evicted=evicted, total_bytes=total)
+    return evicted
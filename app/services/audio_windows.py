@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+
+def _silence_gaps(
+    speech_spans: list[tuple[float, float]], *, start: float, end: float
+) -> list[tuple[float, float]]:
+    spans = sorted(speech_spans)
+    gaps: list[tuple[float, float]] = []
+    for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+        if next_start > prev_end and start < prev_end and next_start < end:
+            gaps.append((prev_end, next_start))
+    return gaps
+
+
+def plan_windows(
+    speech_spans: list[tuple[float, float]],
+    *,
+    start: float,
+    end: float,
+    n_windows: int,
+    min_window_seconds: float,
+) -> list[tuple[float, float]]:
+    """
+    Split [start, end] (seconds) into at most n_windows contiguous windows of at least
+    ~min_window_seconds. Each cut lands in the middle of the silence gap (between VAD
+    speech spans) closest to an even split point, so no window starts mid-word. Falls
+    back to the even split point when there is no usable gap.
+    """
+    total = end - start
+    if total <= 0:
+        return []
+
+    n = max(1, min(int(n_windows), int(total // max(1.0, float(min_window_seconds)))))
+    if n == 1:
+        return [(start, end)]
+
+    midpoints = [(a + b) / 2.0 for a, b in _silence_gaps(speech_spans, start=start, end=end)]
+    min_gap = float(min_window_seconds) / 2.0
+
+    cuts: list[float] = []
+    for i in range(1, n):
+        target = start + total * i / n
+        prev = cuts[-1] if cuts else start
+        usable = [m for m in midpoints if m - prev >= min_gap and end - m >= min_gap]
+        cut = min(usable, key=lambda m: abs(m - target)) if usable else target
+        if cut - prev >= min_gap and end - cut >= min_gap:
+            cuts.append(cut)
+
+    bounds = [start, *cuts, end]
+    return list(zip(bounds, bounds[1:]))
+
+
+def stitch_segments(
+    window_results: Iterable[tuple[tuple[float, float], list[dict]]],
+    *,
+    start_idx: int = 0,
+) -> Iterator[dict]:
+    """
+    Turn per-window segments ({start, end, text} in seconds relative to the window)
+    into transcript rows ({idx, start_ms, end_ms, text}) on the full-audio timeline,
+    with continuous idx. Times are clamped to the window and kept monotonic.
+
+    window_results is consumed lazily, so rows are yielded as soon as each window
+    (in order) is available.
+    """
+    idx = start_idx
+    last_end_ms = 0
+    for (window_start, window_end), segments in window_results:
+        window_start_ms = int(window_start * 1000)
+        window_end_ms = int(window_end * 1000)
+        for seg in segments:
+            start_ms = window_start_ms + int(float(seg["start"]) * 1000)
+            end_ms = window_start_ms + int(float(seg["end"]) * 1000)
+
+            start_ms = max(start_ms, last_end_ms, window_start_ms)
+            end_ms = max(start_ms, min(end_ms, window_end_ms))
+
+            yield {
+                "idx": idx,
+                "start_ms": start_ms,
+                "end_ms": end_ms,
+                "text": (seg.get("text") or "").strip(),
+            }
+            idx += 1
+            last_end_ms = end_ms
@@ -1,10 +1,112 @@
 from __future__ import annotations
 
 import os
-from typing import List
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List
 
 from app.services.embeddings_client import EmbeddingsClient, EMBED_DIM
 
+QUERY_EMBED_CACHE_SIZE = int(os.getenv("QUERY_EMBED_CACHE_SIZE", "1024"))
+QUERY_EMBED_CACHE_TTL_SECONDS = float(os.getenv("QUERY_EMBED_CACHE_TTL_SECONDS", "3600"))
+
+_client: EmbeddingsClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_embeddings_client() -> EmbeddingsClient:
+    """
+    Process-wide EmbeddingsClient (one OpenAI client / connection pool per process).
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = EmbeddingsClient()
+    return _client
+
+
+def normalize_query(text: str) -> str:
+    """
+    Cache key normalization: case-insensitive, whitespace-collapsed.
+    """
+    return " ".join((text or "").casefold().split())
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU with per-entry TTL. Thread-safe; counts hits/misses for observability.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = QUERY_EMBED_CACHE_SIZE,
+        ttl_seconds: float = QUERY_EMBED_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: OrderedDict[tuple[str, str, str], tuple[float, tuple[float, ...]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str, str]) -> List[float] | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, vec = item
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return list(vec)
+
+    def put(self, key: tuple[str, str, str], vec: List[float]) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl_seconds, tuple(vec))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+            }
+
+
+query_embedding_cache = QueryEmbeddingCache()
+
+
+def _model_id(client: EmbeddingsClient) -> tuple[str, str]:
+    if client.mock or client.provider == "mock":
+        return "mock", "mock"
+    if client.provider == "ollama":
+        return "ollama", client.ollama_embed_model
+    return client.provider, client.model
+
 
 def embed_text(text: str) -> List[float]:
     """
@@ -15,11 +117,23 @@ def embed_text(text: str) -> List[float]:
       - EMBEDDINGS_PROVIDER=ollama   -> Ollama embeddings
       - EMBEDDINGS_PROVIDER=openai   -> OpenAI embeddings (requires OPENAI_API_KEY)
 
+    Query embeddings are cached per (provider, model, normalized text), so repeated
+    and near-identical chat questions skip the provider round-trip.
+
     NOTE: This function intentionally does NOT depend on LLM_MOCK.
     """
     t = (text or "").strip()
     if not t:
         return [0.0] * EMBED_DIM
 
-    client = EmbeddingsClient()
-    return client.embed(t)
\ No newline at end of file
+    client = get_embeddings_client()
+    provider, model = _model_id(client)
+    key = (provider, model, normalize_query(t))
+
+    cached = query_embedding_cache.get(key)
+    if cached is not None:
+        return cached
+
+    vec = client.embed(t)
+    query_embedding_cache.put(key, vec)
+    return vec
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import hashlib
+import math
 import os
-from typing import List
+from typing import Iterator, List
 
 import requests
 from openai import OpenAI
 
 EMBED_DIM = 1536  # pgvector column is Vector(1536)
 
+# Provider request limits (OpenAI: 2048 inputs, 8191 tokens/input, 300k tokens/request)
+BATCH_MAX_ITEMS = int(os.getenv("EMBEDDINGS_BATCH_SIZE", "128"))
+BATCH_MAX_TOKENS = int(os.getenv("EMBEDDINGS_BATCH_MAX_TOKENS", "200000"))
+MAX_INPUT_TOKENS = int(os.getenv("EMBEDDINGS_MAX_INPUT_TOKENS", "8000"))
+
 
 def _fix_dim(vec: List[float]) -> List[float]:
     """
@@ -22,6 +28,40 @@ def _fix_dim(vec: List[float]) -> List[float]:
     return vec + [0.0] * (EMBED_DIM - len(vec))
 
 
+def approx_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 chars/token for English) used only for request sizing.
+    """
+    return max(1, math.ceil(len(text or "") / 4))
+
+
+def truncate_to_tokens(text: str, max_tokens: int = MAX_INPUT_TOKENS) -> str:
+    max_chars = max_tokens * 4
+    return text if len(text) <= max_chars else text[:max_chars]
+
+
+def iter_batches(
+    texts: List[str],
+    *,
+    max_items: int = BATCH_MAX_ITEMS,
+    max_tokens: int = BATCH_MAX_TOKENS,
+) -> Iterator[List[int]]:
+    """
+    Yield lists of indexes into `texts` so each batch stays under the item and token limits.
+    """
+    batch: List[int] = []
+    batch_tokens = 0
+    for i, t in enumerate(texts):
+        n = approx_tokens(t)
+        if batch and (len(batch) >= max_items or batch_tokens + n > max_tokens):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(i)
+        batch_tokens += n
+    if batch:
+        yield batch
+
+
 class EmbeddingsClient:
     def __init__(self) -> None:
         self.mock = os.getenv("EMBEDDINGS_MOCK", "0") == "1"
@@ -58,6 +98,51 @@ class EmbeddingsClient:
         vec = [float(x) for x in emb]
         return _fix_dim(vec)
 
+    def _ollama_embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Ollama >= 0.3 batch endpoint (/api/embed, "input": [...]).
+        Older servers only have /api/embeddings; fall back to one call per text.
+        """
+        url = f"{self.ollama_base_url}/api/embed"
+        payload = {"model": self.ollama_embed_model, "input": texts}
+        resp = requests.post(url, json=payload, timeout=300)
+        if resp.status_code == 404:
+            return [self._ollama_embed(t) for t in texts]
+        resp.raise_for_status()
+        data = resp.json()
+        embs = data.get("embeddings") if isinstance(data, dict) else None
+        if not isinstance(embs, list) or len(embs) != len(texts):
+            raise RuntimeError("Invalid Ollama batch embeddings response")
+        return [_fix_dim([float(x) for x in e]) for e in embs]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many texts with as few provider calls as the batch limits allow.
+        Output order matches input order; blank texts map to zero vectors.
+        """
+        out: List[List[float]] = [[0.0] * EMBED_DIM for _ in texts]
+        cleaned = [truncate_to_tokens((t or "").strip()) for t in texts]
+        live = [i for i, t in enumerate(cleaned) if t]
+        if not live:
+            return out
+
+        live_texts = [cleaned[i] for i in live]
+        for batch in iter_batches(live_texts):
+            inputs = [live_texts[j] for j in batch]
+
+            if self.mock or self.provider == "mock":
+                vecs = [self.embed(t) for t in inputs]
+            elif self.provider == "ollama":
+                vecs = self._ollama_embed_batch(inputs)
+            else:
+                resp = self.client.embeddings.create(model=self.model, input=inputs)
+                vecs = [_fix_dim(d.embedding) for d in sorted(resp.data, key=lambda d: d.index)]
+
+            for j, vec in zip(batch, vecs):
+                out[live[j]] = vec
+
+        return out
+
     def embed(self, text: str) -> List[float]:
         text = (text or "").strip()
         if not text:
@@ -7,8 +7,16 @@ from app.db.models.job_event import JobEventType
 from app.db.repositories.job_events import create_job_event
 
 
+def _log(db: Session, *, commit: bool = False, **fields: Any) -> None:
+    # Buffered in the caller's transaction (see create_job_event). Failure handlers
+    # commit explicitly: their session is closed right after without another commit.
+    create_job_event(db, **fields)
+    if commit:
+        db.commit()
+
+
 def log_job_created(db: Session, job: Job) -> None:
-    create_job_event(
+    _log(
         db,
         job_id=job.id,
         type=JobEventType.INFO.value,
@@ -22,7 +30,7 @@ def log_status_change(db: Session, job: Job, from_status: str, to_status: str, s
     if stage:
         meta["stage"] = stage
 
-    create_job_event(
+    _log(
         db,
         job_id=job.id,
         type=JobEventType.STATUS_CHANGE.value,
@@ -34,19 +42,22 @@ def log_status_change(db: Session, job: Job, from_status: str, to_status: str, s
 
 
 def log_error(db: Session, job: Job, message: str, meta: dict[str, Any] | None = None) -> None:
-    create_job_event(
+    _log(
         db,
         job_id=job.id,
         type=JobEventType.ERROR.value,
         message=message,
         meta=meta,
+        commit=True,
     )
 
+
 def log_retry(db, job, message: str, meta: dict | None = None) -> None:
-    create_job_event(
+    _log(
         db,
         job_id=job.id,
         type=JobEventType.RETRY.value,
         message=message,
         meta=meta,
+        commit=True,
     )
\ No newline at end of file
@@ -18,4 +18,7 @@ PROGRESS_STEPS: dict[str, ProgressStep] = {
     "transcribe": ProgressStep(status=JobStatus.TRANSCRIBING.value, stage="transcribe", progress=40),
     "summarize": ProgressStep(status=JobStatus.SUMMARIZING.value, stage="summarize", progress=75),
     "finalize": ProgressStep(status=JobStatus.COMPLETED.value, stage="finalize", progress=100),
-}
\ No newline at end of file
+}
+
+# transcribe reports progress from its step value up to here as audio is decoded
+TRANSCRIBE_PROGRESS_END = 70
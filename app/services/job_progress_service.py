@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.db.models.job import Job
 from app.services.job_events_service import log_status_change
-from app.db.repositories.jobs import update_job_fields
+from app.db.repositories.jobs import is_job_stopped, update_job_fields
 
 
 def set_job_progress(
@@ -19,8 +19,12 @@ def set_job_progress(
     Update job status/stage/progress safely:
     - clamps progress to 0..100
     - avoids writing if nothing changed
-    - logs STATUS_CHANGE event when status changes
+    - logs STATUS_CHANGE event when status changes (same commit as the update)
+    - never touches a FAILED or CANCELED job (see update_job_fields)
     """
+    if is_job_stopped(job):
+        return job
+
     if progress is not None:
         progress = max(0, min(100, int(progress)))
 
@@ -31,18 +35,15 @@ def set_job_progress(
     if not (changed_status or changed_stage or changed_progress):
         return job  # no-op
 
-    old_status = job.status
+    # Only log "status change" event if status actually changed; it is buffered and
+    # committed together with the update below
+    if changed_status:
+        log_status_change(db, job, from_status=job.status, to_status=status, stage=stage)
 
-    job = update_job_fields(
+    return update_job_fields(
         db,
         job,
         status=status,
         stage=stage,
         progress=progress,
-    )
-
-    # Only log "status change" event if status actually changed
-    if changed_status:
-        log_status_change(db, job, from_status=old_status, to_status=status, stage=stage)
-
-    return job
\ No newline at end of file
+    )
\ No newline at end of file
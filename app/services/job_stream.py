@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from sqlalchemy import Row
+
+from app.core.logging import get_logger
+from app.db.models.job import Job, JobStatus
+from app.db.models.job_event import JobEvent
+from app.services.sse import format_sse
+
+logger = get_logger()
+
+# Idle connections get a keep-alive comment and a DB resync this often (pub/sub is
+# fire-and-forget, so a message published while the subscriber was busy is not lost)
+JOB_STREAM_HEARTBEAT_SECONDS = float(os.getenv("JOB_STREAM_HEARTBEAT_SECONDS", "15"))
+JOB_STREAM_REPLAY_LIMIT = int(os.getenv("JOB_STREAM_REPLAY_LIMIT", "500"))
+
+TERMINAL_STATUSES = frozenset(
+    {JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELED.value}
+)
+
+# (progress payload or None if the job is gone, events with id > after_id)
+LoadUpdates = Callable[[int], Awaitable[tuple[dict[str, Any] | None, list[dict[str, Any]]]]]
+
+
+def job_channel(job_id: Any) -> str:
+    return f"job:{job_id}:progress"
+
+
+def progress_payload(job: Job) -> dict[str, Any]:
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+    }
+
+
+def event_payload(evt: JobEvent | Row) -> dict[str, Any]:
+    return {
+        "id": evt.id,
+        "type": evt.type,
+        "from_status": evt.from_status,
+        "to_status": evt.to_status,
+        "message": evt.message,
+        "meta": evt.meta,
+        "created_at": evt.created_at.isoformat() if evt.created_at else None,
+    }
+
+
+def encode_message(kind: str, data: dict[str, Any]) -> str:
+    return json.dumps({"kind": kind, "data": data}, default=str, separators=(",", ":"))
+
+
+def decode_message(raw: str | bytes) -> tuple[str, dict[str, Any]] | None:
+    try:
+        msg = json.loads(raw)
+        return str(msg["kind"]), dict(msg["data"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def parse_last_event_id(value: str | None) -> int:
+    """
+    Last-Event-ID header (or ?last_event_id=) -> job_events.id to resume after; 0 = from start.
+    """
+    try:
+        return max(0, int(str(value).strip()))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _publish(job_id: Any, kind: str, data: dict[str, Any]) -> None:
+    """
+    Best effort: a Redis outage must not fail the pipeline (clients resync from the DB).
+    """
+    from app.core.redis_client import redis_client
+
+    try:
+        redis_client.publish(job_channel(job_id), encode_message(kind, data))
+    except Exception as e:
+        logger.warning("job_stream.publish_failed", job_id=str(job_id), kind=kind, error=str(e))
+
+
+def publish_job_progress(job: Job) -> None:
+    _publish(job.id, "progress", progress_payload(job))
+
+
+def publish_job_event(evt: JobEvent | Row) -> None:
+    _publish(evt.job_id, "job_event", event_payload(evt))
+
+
+async def stream_job_updates(
+    job_id: Any,
+    *,
+    pubsub: Any,
+    load: LoadUpdates,
+    last_event_id: int = 0,
+    heartbeat_seconds: float = JOB_STREAM_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    SSE frames for one job: replay job_events after last_event_id, the current progress,
+    then live updates from the job's pub/sub channel until the job is terminal.
+
+    - "job_event" frames carry id: <job_events.id> so EventSource reconnects resume there.
+    - "progress" frames carry {status, stage, progress}; "done" ends the stream.
+    """
+    await pubsub.subscribe(job_channel(job_id))  # before the snapshot: no gap
+
+    def _events(events: list[dict[str, Any]]) -> list[str]:
+        nonlocal last_event_id
+        frames = []
+        for e in events:
+            if int(e["id"]) > last_event_id:
+                last_event_id = int(e["id"])
+                frames.append(format_sse("job_event", e, event_id=last_event_id))
+        return frames
+
+    async def _resync() -> tuple[list[str], dict[str, Any] | None]:
+        progress, events = await load(last_event_id)
+        frames = _events(events)
+        if progress is not None:
+            frames.append(format_sse("progress", progress))
+        return frames, progress
+
+    try:
+        frames, progress = await _resync()
+        for frame in frames:
+            yield frame
+
+        last_sent = time.monotonic()
+        while progress is not None and progress.get("status") not in TERMINAL_STATUSES:
+            msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            decoded = decode_message(msg["data"]) if msg else None
+
+            if decoded is None:
+                if time.monotonic() - last_sent < heartbeat_seconds:
+                    continue
+                frames, progress = await _resync()
+                yield "".join(frames) or ": keep-alive\n\n"
+                last_sent = time.monotonic()
+                continue
+
+            kind, data = decoded
+            if kind == "job_event":
+                frames = _events([data])
+            elif kind == "progress":
+                progress = data
+                frames = [format_sse("progress", data)]
+            else:
+                frames = []
+
+            for frame in frames:
+                yield frame
+                last_sent = time.monotonic()
+
+        if progress is not None:
+            # Events whose pub/sub message was missed while the job was finishing
+            _, events = await load(last_event_id)
+            for frame in _events(events):
+                yield frame
+            yield format_sse("done", {"status": progress.get("status")})
+    finally:
+        try:
+            await pubsub.unsubscribe(job_channel(job_id))
+            await pubsub.aclose()
+        except Exception:
+            pass
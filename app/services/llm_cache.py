@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Mapping, Protocol
+
+import redis
+
+from app.core.logging import get_logger
+
+logger = get_logger()
+
+# Bump to invalidate every cached response (e.g. after a post-processing change).
+LLM_CACHE_KEY_VERSION = 1
+
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "tiered").strip().lower()
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_EVICT_EVERY = int(os.getenv("LLM_CACHE_EVICT_EVERY", "200"))
+
+_REDIS_PREFIX = "llmcache:"
+_REDIS_INDEX_KEY = f"{_REDIS_PREFIX}index"
+_REDIS_STATS_KEY = f"{_REDIS_PREFIX}stats"
+
+
+def llm_cache_key(
+    *,
+    provider: str,
+    model: str,
+    system: str,
+    user: str,
+    params: Mapping[str, Any] | None = None,
+) -> str:
+    """
+    sha256 over a canonical JSON encoding of everything that determines the response.
+    """
+    payload = {
+        "v": LLM_CACHE_KEY_VERSION,
+        "provider": provider,
+        "model": model,
+        "system": system,
+        "user": user,
+        "params": dict(params or {}),
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def is_cacheable_temperature(temperature: float | None) -> bool:
+    """
+    Only cache when the caller didn't ask for sampling: unset (provider default) or 0.
+    """
+    return temperature is None or temperature <= 0
+
+
+class LLMCacheBackend(Protocol):
+    def get(self, key: str) -> str | None: ...
+
+    def set(self, key: str, value: str, *, provider: str, model: str) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class RedisLLMCache:
+    """
+    Fast tier: SET EX per entry plus a ZSET (key -> write time) trimmed to max_entries,
+    so the keyspace stays bounded even before TTLs fire.
+    """
+
+    def __init__(self, client: redis.Redis, *, ttl_seconds: int, max_entries: int) -> None:
+        self.r = client
+        self.ttl_seconds = int(ttl_seconds)
+        self.max_entries = int(max_entries)
+
+    def get(self, key: str) -> str | None:
+        return self.r.get(_REDIS_PREFIX + key)
+
+    def set(self, key: str, value: str, *, provider: str, model: str) -> None:
+        pipe = self.r.pipeline(transaction=False)
+        pipe.set(_REDIS_PREFIX + key, value, ex=self.ttl_seconds)
+        pipe.zadd(_REDIS_INDEX_KEY, {key: time.time()})
+        pipe.zcard(_REDIS_INDEX_KEY)
+        _, _, size = pipe.execute()
+
+        overflow = int(size) - self.max_entries
+        if overflow > 0:
+            oldest = self.r.zpopmin(_REDIS_INDEX_KEY, overflow)
+            if oldest:
+                self.r.delete(*[_REDIS_PREFIX + k for k, _ in oldest])
+
+    def delete(self, key: str) -> None:
+        pipe = self.r.pipeline(transaction=False)
+        pipe.delete(_REDIS_PREFIX + key)
+        pipe.zrem(_REDIS_INDEX_KEY, key)
+        pipe.execute()
+
+
+class PostgresLLMCache:
+    """
+    Durable tier backed by the llm_response_cache table. Each call uses its own short
+    session; eviction runs opportunistically every `evict_every` writes.
+    """
+
+    def __init__(
+        self, *, ttl_seconds: int, max_entries: int, evict_every: int = LLM_CACHE_EVICT_EVERY
+    ) -> None:
+        self.ttl_seconds = int(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self.evict_every = max(1, int(evict_every))
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        from app.db.repositories.llm_response_cache import get_cached_response
+        from app.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            value = get_cached_response(db, key)
+            db.commit()
+            return value
+
+    def set(self, key: str, value: str, *, provider: str, model: str) -> None:
+        from app.db.repositories.llm_response_cache import evict_llm_cache, upsert_cached_response
+        from app.db.session import SessionLocal
+
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % self.evict_every == 0
+
+        with SessionLocal() as db:
+            upsert_cached_response(
+                db,
+                cache_key=key,
+                provider=provider,
+                model=model,
+                response=value,
+                ttl_seconds=self.ttl_seconds,
+            )
+            if evict:
+                deleted = evict_llm_cache(db, max_rows=self.max_entries)
+                logger.info("llm_cache.evicted", deleted=deleted)
+            db.commit()
+
+    def delete(self, key: str) -> None:
+        from app.db.repositories.llm_response_cache import delete_cached_response
+        from app.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            delete_cached_response(db, key)
+            db.commit()
+
+
+class TieredLLMCache:
+    """
+    Read fast then durable; a durable hit is copied back into the fast tier.
+    A failing tier is skipped rather than failing the lookup.
+    """
+
+    def __init__(self, fast: LLMCacheBackend, durable: LLMCacheBackend) -> None:
+        self.fast = fast
+        self.durable = durable
+
+    def get(self, key: str) -> str | None:
+        try:
+            value = self.fast.get(key)
+            if value is not None:
+                return value
+        except Exception as e:
+            logger.warning("llm_cache.tier_failed", tier="fast", op="get", error=str(e))
+
+        value = self.durable.get(key)
+        if value is not None:
+            try:
+                self.fast.set(key, value, provider="", model="")
+            except Exception as e:
+                logger.warning("llm_cache.tier_failed", tier="fast", op="backfill", error=str(e))
+        return value
+
+    def set(self, key: str, value: str, *, provider: str, model: str) -> None:
+        try:
+            self.fast.set(key, value, provider=provider, model=model)
+        except Exception as e:
+            logger.warning("llm_cache.tier_failed", tier="fast", op="set", error=str(e))
+        self.durable.set(key, value, provider=provider, model=model)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.fast.delete(key)
+        except Exception as e:
+            logger.warning("llm_cache.tier_failed", tier="fast", op="delete", error=str(e))
+        self.durable.delete(key)
+
+
+class LLMResponseCache:
+    """
+    Fail-open front for a backend: cache errors are logged and the LLM is called
+    as if the entry were missing. Counts hits/misses locally and (optionally) in a
+    shared Redis hash so the ratio is visible across workers.
+    """
+
+    def __init__(
+        self, backend: LLMCacheBackend | None, *, stats_client: redis.Redis | None = None
+    ) -> None:
+        self.backend = backend
+        self.stats_client = stats_client
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+        if self.stats_client is not None:
+            try:
+                self.stats_client.hincrby(_REDIS_STATS_KEY, field, 1)
+            except Exception:
+                pass
+
+    def _evict(self, key: str) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning("llm_cache.delete_failed", error=str(e))
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], str],
+        *,
+        provider: str,
+        model: str,
+        cacheable: Callable[[str], bool] | None = None,
+    ) -> str:
+        """
+        Cached response for key, else compute() (stored if non-empty). `cacheable` is the
+        caller's output check (does it parse / validate?): a failing fresh value is
+        returned but not stored, and a failing cached value is evicted and recomputed,
+        so one malformed answer is not replayed on every retry.
+        """
+        if self.backend is None:
+            return compute()
+
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning("llm_cache.get_failed", error=str(e))
+            cached = None
+
+        if cached is not None and (cacheable is None or cacheable(cached)):
+            self._count("hits")
+            return cached
+        if cached is not None:
+            logger.warning("llm_cache.invalid_entry_evicted", provider=provider, model=model)
+            self._evict(key)
+
+        self._count("misses")
+        value = compute()
+        if value and cacheable is not None and not cacheable(value):
+            logger.info("llm_cache.skip_invalid", provider=provider, model=model)
+        elif value:
+            try:
+                self.backend.set(key, value, provider=provider, model=model)
+            except Exception as e:
+                self._count("errors")
+                logger.warning("llm_cache.set_failed", error=str(e))
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits, misses, errors = self.hits, self.misses, self.errors
+        out: dict[str, Any] = {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "process": _ratio(hits, misses, errors),
+        }
+        if self.stats_client is not None:
+            try:
+                raw = self.stats_client.hgetall(_REDIS_STATS_KEY) or {}
+                out["cluster"] = _ratio(
+                    int(raw.get("hits", 0)), int(raw.get("misses", 0)), int(raw.get("errors", 0))
+                )
+            except Exception as e:
+                out["cluster"] = {"error": str(e)}
+        return out
+
+
+def _ratio(hits: int, misses: int, errors: int) -> dict[str, Any]:
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "errors": errors,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def _build_cache() -> LLMResponseCache:
+    backend_name = LLM_CACHE_BACKEND
+    if backend_name in ("", "none", "off", "0"):
+        return LLMResponseCache(None)
+
+    redis_client: redis.Redis | None = None
+    if backend_name in ("redis", "tiered"):
+        # Shared pooled client (settings.redis_url), imported lazily: settings-free at import
+        from app.core.redis_client import redis_client
+
+    ttl, max_entries = LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES
+    backend: LLMCacheBackend | None
+    if backend_name == "postgres":
+        backend = PostgresLLMCache(ttl_seconds=ttl, max_entries=max_entries)
+    elif backend_name == "redis" and redis_client is not None:
+        backend = RedisLLMCache(redis_client, ttl_seconds=ttl, max_entries=max_entries)
+    elif backend_name == "tiered" and redis_client is not None:
+        backend = TieredLLMCache(
+            RedisLLMCache(redis_client, ttl_seconds=ttl, max_entries=max_entries),
+            PostgresLLMCache(ttl_seconds=ttl, max_entries=max_entries),
+        )
+    elif backend_name == "tiered":
+        backend = PostgresLLMCache(ttl_seconds=ttl, max_entries=max_entries)
+    else:
+        logger.warning("llm_cache.disabled", backend=backend_name)
+        backend = None
+
+    return LLMResponseCache(backend, stats_client=redis_client)
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Process-wide cache built from LLM_CACHE_* env on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _build_cache()
+    return _cache
@@ -3,10 +3,72 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any
+import threading
+from typing import Any, Callable
 
+import httpx
 import requests
 from openai import OpenAI
+from requests.adapters import HTTPAdapter
+
+from app.services.chapter_parsing_service import parse_chapters_md
+from app.services.llm_cache import get_llm_cache, is_cacheable_temperature, llm_cache_key
+
+# Connection pooling / timeouts shared by every LLMClient in the process.
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "180"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
+# Unset -> provider default. Any value > 0 disables the response cache.
+_temperature_env = os.getenv("LLM_TEMPERATURE", "").strip()
+LLM_TEMPERATURE: float | None = float(_temperature_env) if _temperature_env else None
+
+_pool_lock = threading.Lock()
+_http_session: requests.Session | None = None
+_openai_clients: dict[str, OpenAI] = {}
+
+
+def get_http_session() -> requests.Session:
+    """
+    Process-wide keep-alive session for Ollama calls (created lazily, so each
+    Celery prefork child gets its own pool).
+    """
+    global _http_session
+    if _http_session is None:
+        with _pool_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=LLM_MAX_CONNECTIONS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    One OpenAI client (and httpx connection pool) per API key per process.
+    """
+    client = _openai_clients.get(api_key)
+    if client is None:
+        with _pool_lock:
+            client = _openai_clients.get(api_key)
+            if client is None:
+                client = OpenAI(
+                    api_key=api_key,
+                    timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=LLM_MAX_CONNECTIONS,
+                            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+                        ),
+                    ),
+                )
+                _openai_clients[api_key] = client
+    return client
 
 
 _LATEX_INLINE_RE = re.compile(r"\\\((.*?)\\\)", re.DOTALL)
@@ -79,6 +141,130 @@ def _postprocess_chat_answer(md: str) -> str:
     return s
 
 
+_NEWLINE_RUN_RE = re.compile(r"\n{3,}")
+
+
+def _has_open_latex(md: str) -> bool:
+    """
+    True if md still holds a \\( or \\[ that a later line could close.
+    Mirrors the substitution order used by _neutralize_latex.
+    """
+    s = _LATEX_INLINE_RE.sub(lambda m: f"`{m.group(1).strip()}`", md)
+    if "\\(" in s:
+        return True
+    s = _LATEX_BLOCK_RE.sub(lambda m: f"```text\n{m.group(1).strip()}\n```", s)
+    return "\\[" in s
+
+
+def _format_unit(unit: str) -> str:
+    """
+    Heading/LaTeX post-processing for a run of complete lines. Both passes re-join
+    splitlines(), which drops trailing newlines; keep them so paragraph breaks that
+    arrive inside one delta ("...\n\n") survive.
+    """
+    body = unit.rstrip("\n")
+    return _neutralize_latex(_demote_headings(body)) + unit[len(body):]
+
+
+class ChatAnswerFormatter:
+    """
+    Incremental, line-buffered _postprocess_chat_answer for streamed answers.
+
+    feed() takes raw model deltas and returns text that is safe to show now;
+    finish() flushes the rest. The concatenated output equals
+    _postprocess_chat_answer(full_text.strip()), as answer_question returns.
+    """
+
+    def __init__(self) -> None:
+        self._raw = ""  # incomplete line(s) not yet processed
+        self._held_ws = ""  # trailing whitespace held back (final strip / blank-line collapse)
+        self._started = False
+
+    def _emit(self, processed: str, *, final: bool = False) -> str:
+        s = self._held_ws + processed
+        if not self._started:
+            s = s.lstrip()
+        body = s.rstrip()
+        self._held_ws = "" if final else s[len(body):]
+        if not body:
+            return ""
+        self._started = True
+        return _NEWLINE_RUN_RE.sub("\n\n", body)
+
+    def feed(self, delta: str) -> str:
+        self._raw += delta or ""
+        if not self._started and not self._raw.strip():
+            return ""
+        if not self._started:
+            self._raw = self._raw.lstrip()  # answer_question strips the raw answer
+        cut = self._raw.rfind("\n")
+        if cut < 0:
+            return ""
+
+        unit = self._raw[:cut]
+        if _has_open_latex(unit):
+            return ""  # wait for the closing delimiter
+
+        self._raw = self._raw[cut + 1:]
+        return self._emit(_format_unit(unit) + "\n")
+
+    def finish(self) -> str:
+        unit, self._raw = self._raw.rstrip(), ""
+        return self._emit(_format_unit(unit), final=True)
+
+
+def mock_answer(question: str) -> str:
+    return (
+        "**(MOCK) Answer**\n\n"
+        f"Question: {question}\n\n"
+        "Based on the retrieved transcript context, here’s a placeholder answer.\n"
+    )
+
+
+def answer_prompts(*, question: str, context_md: str) -> tuple[str, str]:
+    """
+    (system, user) prompts for chat answers; shared by the sync and async clients.
+    """
+    # 🔧 Make output chat-friendly:
+    # - No headings (###)
+    # - No LaTeX
+    # - Prefer short paragraphs and bullet lists
+    system = (
+        "You answer questions using ONLY the provided context.\n"
+        "Write for a chat UI.\n"
+        "Formatting rules:\n"
+        "- Use short paragraphs and/or bullet points.\n"
+        "- DO NOT use markdown headings (#, ##, ###).\n"
+        "- DO NOT use LaTeX (no \\frac, no \\sigma, no \\(...\\), no \\[...\\]).\n"
+        "- Keep it concise.\n"
+        "If the answer is not supported by the context, say what is missing and ask a clarifying question."
+    )
+
+    user = f"QUESTION:\n{question}\n\nCONTEXT:\n{context_md}\n"
+    return system, user
+
+
+def is_markdown_summary(md: str) -> bool:
+    """
+    Summary-shaped output: at least one markdown bullet or heading (not a refusal or
+    a bare sentence).
+    """
+    return any(
+        line.lstrip().startswith(("- ", "* ", "#")) for line in (md or "").splitlines()
+    )
+
+
+def has_chapters(md: str) -> bool:
+    return bool(parse_chapters_md(md))
+
+
+def is_json_array(text: str) -> bool:
+    try:
+        return isinstance(json.loads(text), list)
+    except ValueError:
+        return False
+
+
 class LLMClient:
     def __init__(self) -> None:
         self.mock = os.getenv("LLM_MOCK", "0") == "1"
@@ -102,7 +288,7 @@ class LLMClient:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY is missing (or set LLM_MOCK=1, or LLM_PROVIDER=ollama)")
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
 
     def _ollama_chat(self, *, system: str, user: str) -> str:
         url = f"{self.ollama_base_url}/api/chat"
@@ -114,13 +300,63 @@ class LLMClient:
                 {"role": "user", "content": user},
             ],
         }
-        resp = requests.post(url, json=payload, timeout=180)
+        if LLM_TEMPERATURE is not None:
+            payload["options"] = {"temperature": LLM_TEMPERATURE}
+        resp = get_http_session().post(
+            url, json=payload, timeout=(LLM_CONNECT_TIMEOUT_SECONDS, LLM_TIMEOUT_SECONDS)
+        )
         resp.raise_for_status()
         data = resp.json()
         msg = data.get("message", {}) if isinstance(data, dict) else {}
         content = msg.get("content") if isinstance(msg, dict) else None
         return (content or "").strip()
 
+    def _provider_complete(self, *, system: str, user: str) -> str:
+        if self.provider == "ollama":
+            return self._ollama_chat(system=system, user=user)
+
+        kwargs: dict[str, Any] = {}
+        if LLM_TEMPERATURE is not None:
+            kwargs["temperature"] = LLM_TEMPERATURE
+        resp = self.client.responses.create(
+            model=self.model,
+            input=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            **kwargs,
+        )
+        return (resp.output_text or "").strip()
+
+    def _complete(
+        self,
+        *,
+        system: str,
+        user: str,
+        cache: bool = True,
+        cacheable: Callable[[str], bool] | None = None,
+    ) -> str:
+        """
+        Single non-streaming completion on the configured provider, served from the
+        response cache when the same prompt was already answered by the same model.
+        Only outputs passing `cacheable` (the stage's own validity check) are cached.
+        """
+        if not cache or not is_cacheable_temperature(LLM_TEMPERATURE):
+            return self._provider_complete(system=system, user=user)
+
+        model = self.ollama_model if self.provider == "ollama" else self.model
+        key = llm_cache_key(
+            provider=self.provider,
+            model=model,
+            system=system,
+            user=user,
+            params={"temperature": LLM_TEMPERATURE},
+        )
+        return get_llm_cache().get_or_compute(
+            key,
+            lambda: self._provider_complete(system=system, user=user),
+            provider=self.provider,
+            model=model,
+            cacheable=cacheable,
+        )
+
     def summarize_chunk(self, *, chunk_text: str) -> str:
         if self.mock:
             text = " ".join((chunk_text or "").split())
@@ -145,17 +381,7 @@ class LLMClient:
             f"CHUNK:\n{chunk_text}"
         )
 
-        if self.provider == "ollama":
-            return self._ollama_chat(system=system, user=user)
-
-        resp = self.client.responses.create(
-            model=self.model,
-            input=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-        )
-        return (resp.output_text or "").strip()
+        return self._complete(system=system, user=user, cacheable=is_markdown_summary)
 
     def reduce_summaries(self, *, map_summaries_md: str) -> str:
         if getattr(self, "fail_once", False):
@@ -185,14 +411,30 @@ class LLMClient:
             f"{map_summaries_md}"
         )
 
-        if self.provider == "ollama":
-            return self._ollama_chat(system=system, user=user)
+        return self._complete(system=system, user=user, cacheable=is_markdown_summary)
 
-        resp = self.client.responses.create(
-            model=self.model,
-            input=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+    def merge_summaries(self, *, summaries_md: str) -> str:
+        """
+        Intermediate tree-reduce step: condense consecutive sections into one section.
+        """
+        if self.mock:
+            preview = " ".join(summaries_md.split())[:500]
+            return f"- **(MOCK) Merged section**\n- Preview: {preview}...\n"
+
+        system = (
+            "You merge consecutive partial summaries of one transcript into a single "
+            "section summary. Return concise markdown bullet points. No preamble."
         )
-        return (resp.output_text or "").strip()
+        user = (
+            "Merge these consecutive section summaries into one section summary.\n\n"
+            "Rules:\n"
+            "- 6–12 bullet points, in chronological order\n"
+            "- Preserve key facts, names, numbers and decisions\n"
+            "- Drop repetition between sections\n\n"
+            f"SECTIONS:\n{summaries_md}"
+        )
+
+        return self._complete(system=system, user=user, cacheable=is_markdown_summary)
 
     def extract_chapters(self, *, map_summaries_md: str) -> str:
         if self.mock:
@@ -214,14 +456,7 @@ class LLMClient:
             f"{map_summaries_md}"
         )
 
-        if self.provider == "ollama":
-            return self._ollama_chat(system=system, user=user)
-
-        resp = self.client.responses.create(
-            model=self.model,
-            input=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-        )
-        return (resp.output_text or "").strip()
+        return self._complete(system=system, user=user, cacheable=has_chapters)
 
     def extract_key_takeaways(self, summary_md: str) -> list[str]:
         if self.mock:
@@ -238,14 +473,7 @@ class LLMClient:
             f"Summary:\n{summary_md}"
         )
 
-        if self.provider == "ollama":
-            text = self._ollama_chat(system=system, user=user)
-        else:
-            resp = self.client.responses.create(
-                model=self.model,
-                input=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-            )
-            text = resp.output_text or ""
+        text = self._complete(system=system, user=user)
 
         lines = [line.strip() for line in text.split("\n") if line.strip()]
         out: list[str] = []
@@ -268,14 +496,8 @@ class LLMClient:
             f"{summary_md}"
         )
 
-        if self.provider == "ollama":
-            text = self._ollama_chat(system=system, user=user)
-        else:
-            resp = self.client.responses.create(
-                model=self.model,
-                input=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-            )
-            text = (resp.output_text or "").strip()
+        # The line-based fallback below is lossy; only a clean JSON array is worth caching
+        text = self._complete(system=system, user=user, cacheable=is_json_array)
 
         try:
             return json.loads(text)
@@ -289,37 +511,10 @@ class LLMClient:
 
     def answer_question(self, *, question: str, context_md: str) -> str:
         if self.mock:
-            return (
-                "**(MOCK) Answer**\n\n"
-                f"Question: {question}\n\n"
-                "Based on the retrieved transcript context, here’s a placeholder answer.\n"
-            )
+            return mock_answer(question)
 
-        # 🔧 Make output chat-friendly:
-        # - No headings (###)
-        # - No LaTeX
-        # - Prefer short paragraphs and bullet lists
-        system = (
-            "You answer questions using ONLY the provided context.\n"
-            "Write for a chat UI.\n"
-            "Formatting rules:\n"
-            "- Use short paragraphs and/or bullet points.\n"
-            "- DO NOT use markdown headings (#, ##, ###).\n"
-            "- DO NOT use LaTeX (no \\frac, no \\sigma, no \\(...\\), no \\[...\\]).\n"
-            "- Keep it concise.\n"
-            "If the answer is not supported by the context, say what is missing and ask a clarifying question."
-        )
-
-        user = f"QUESTION:\n{question}\n\nCONTEXT:\n{context_md}\n"
-
-        if self.provider == "ollama":
-            raw = self._ollama_chat(system=system, user=user)
-        else:
-            resp = self.client.responses.create(
-                model=self.model,
-                input=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-            )
-            raw = (resp.output_text or "").strip()
+        system, user = answer_prompts(question=question, context_md=context_md)
+        raw = self._complete(system=system, user=user, cache=False)
 
         # 🔧 Final cleanup so the UI doesn't show raw headings/latex artifacts.
-        return _postprocess_chat_answer(raw)
\ No newline at end of file
+        return _postprocess_chat_answer(raw)
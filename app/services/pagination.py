@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(kind: str, **values: Any) -> str:
+    """
+    Opaque keyset cursor: urlsafe base64 of compact JSON, tagged with the endpoint kind
+    so a jobs cursor can't be replayed against transcript pages.
+    """
+    payload = json.dumps({"k": kind, **values}, separators=(",", ":"), sort_keys=True, default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, kind: str) -> dict[str, Any]:
+    """
+    Inverse of encode_cursor. Raises InvalidCursorError on garbage or a kind mismatch.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if not isinstance(data, dict) or data.pop("k", None) != kind:
+        raise InvalidCursorError("Invalid cursor")
+    return data
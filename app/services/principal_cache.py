@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction, object_session
+
+from app.core.logging import get_logger
+from app.db.models.user import User
+
+logger = get_logger()
+
+# Local tier: short TTL bounds staleness on other API processes after a user change
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+# Optional shared tier (explicitly invalidated on user update/delete)
+PRINCIPAL_CACHE_REDIS = os.getenv("PRINCIPAL_CACHE_REDIS", "0").strip().lower() in ("1", "true")
+PRINCIPAL_CACHE_REDIS_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_REDIS_TTL_SECONDS", "300"))
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    What most routes need from the authenticated user (ownership checks use id only).
+    """
+
+    id: UUID
+    email: str
+
+    def to_json(self) -> str:
+        return json.dumps({"id": str(self.id), "email": self.email})
+
+    @classmethod
+    def from_json(cls, raw: str) -> UserPrincipal:
+        data = json.loads(raw)
+        return cls(id=UUID(data["id"]), email=data["email"])
+
+
+def _redis_key(user_id: Any) -> str:
+    return f"principal:{user_id}"
+
+
+class PrincipalCache:
+    """
+    user id -> UserPrincipal. In-process LRU with a TTL, optionally backed by Redis.
+    Redis errors fall through to the DB lookup. get/put use the sync client; aget/aput
+    (async routes) use async_redis_client so the event loop never blocks on Redis.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+        redis_client: Any = None,
+        async_redis_client: Any = None,
+        redis_ttl_seconds: int = PRINCIPAL_CACHE_REDIS_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self._redis = redis_client
+        self._async_redis = async_redis_client
+        self._redis_ttl = int(redis_ttl_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, tuple[float, UserPrincipal]] = OrderedDict()
+
+    def _get_local(self, key: str) -> UserPrincipal | None:
+        with self._lock:
+            hit = self._local.get(key)
+            if hit is None:
+                return None
+            expires_at, principal = hit
+            if expires_at <= self._clock():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return principal
+
+    def _put_local(self, key: str, principal: UserPrincipal) -> None:
+        with self._lock:
+            self._local[key] = (self._clock() + self.ttl_seconds, principal)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def get(self, user_id: Any) -> UserPrincipal | None:
+        key = str(user_id)
+        principal = self._get_local(key)
+        if principal is not None or self._redis is None:
+            return principal
+
+        try:
+            raw = self._redis.get(_redis_key(key))
+        except Exception as e:
+            logger.warning("principal_cache.redis_get_failed", error=str(e))
+            return None
+        if raw is None:
+            return None
+        principal = UserPrincipal.from_json(raw)
+        self._put_local(key, principal)
+        return principal
+
+    def put(self, principal: UserPrincipal) -> None:
+        key = str(principal.id)
+        self._put_local(key, principal)
+        if self._redis is not None:
+            try:
+                self._redis.set(_redis_key(key), principal.to_json(), ex=self._redis_ttl)
+            except Exception as e:
+                logger.warning("principal_cache.redis_set_failed", error=str(e))
+
+    async def aget(self, user_id: Any) -> UserPrincipal | None:
+        key = str(user_id)
+        principal = self._get_local(key)
+        if principal is not None or self._async_redis is None:
+            return principal
+
+        try:
+            raw = await self._async_redis.get(_redis_key(key))
+        except Exception as e:
+            logger.warning("principal_cache.redis_get_failed", error=str(e))
+            return None
+        if raw is None:
+            return None
+        principal = UserPrincipal.from_json(raw)
+        self._put_local(key, principal)
+        return principal
+
+    async def aput(self, principal: UserPrincipal) -> None:
+        key = str(principal.id)
+        self._put_local(key, principal)
+        if self._async_redis is not None:
+            try:
+                await self._async_redis.set(
+                    _redis_key(key), principal.to_json(), ex=self._redis_ttl
+                )
+            except Exception as e:
+                logger.warning("principal_cache.redis_set_failed", error=str(e))
+
+    def invalidate(self, user_id: Any) -> None:
+        key = str(user_id)
+        with self._lock:
+            self._local.pop(key, None)
+        if self._redis is not None:
+            try:
+                self._redis.delete(_redis_key(key))
+            except Exception as e:
+                logger.warning("principal_cache.redis_delete_failed", error=str(e))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+_cache: PrincipalCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                redis_client = async_redis_client = None
+                if PRINCIPAL_CACHE_REDIS:
+                    from app.core.redis_client import async_redis_client, redis_client
+                _cache = PrincipalCache(
+                    redis_client=redis_client, async_redis_client=async_redis_client
+                )
+    return _cache
+
+
+# Session.info key: user ids changed in the current transaction, invalidated on commit
+_CHANGED_USERS = "changed_principal_ids"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_principal(mapper, connection, target: User) -> None:
+    # Flush time: invalidating now would let a concurrent request re-cache the old row
+    # before this transaction commits
+    session = object_session(target)
+    if session is None:
+        get_principal_cache().invalidate(target.id)
+        return
+    session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USERS, None) or ():
+        get_principal_cache().invalidate(user_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_changed_principals(session: Session, transaction: SessionTransaction) -> None:
+    # Outermost transaction only: a rolled-back savepoint must keep the ids changed
+    # by the enclosing transaction (an extra invalidation is harmless, a missed one is not)
+    if transaction.parent is None:
+        session.info.pop(_CHANGED_USERS, None)
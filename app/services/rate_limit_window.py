@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+# Sliding-window log: one ZSET member per accepted request, scored by Redis server time
+# (so API processes with skewed clocks agree). All scopes of one request are checked in
+# one script run and the request is recorded in every scope only if every scope allows
+# it; rejected requests are not recorded anywhere.
+#   KEYS = bucket keys; ARGV = unique member suffix, then window_ms, limit per key
+#   -> flat {allowed (0/1), remaining, retry_after_ms} per key
+SLIDING_WINDOW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local member = now .. ':' .. ARGV[1]
+
+local counts = {}
+local all_allowed = true
+for i, key in ipairs(KEYS) do
+  local window = tonumber(ARGV[2 * i])
+  local limit = tonumber(ARGV[2 * i + 1])
+  redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+  counts[i] = redis.call('ZCARD', key)
+  if counts[i] >= limit then
+    all_allowed = false
+  end
+end
+
+local out = {}
+for i, key in ipairs(KEYS) do
+  local window = tonumber(ARGV[2 * i])
+  local limit = tonumber(ARGV[2 * i + 1])
+  if counts[i] >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local retry = window
+    if oldest[2] then
+      retry = tonumber(oldest[2]) + window - now
+    end
+    table.insert(out, 0)
+    table.insert(out, 0)
+    table.insert(out, retry)
+  elseif all_allowed then
+    redis.call('ZADD', key, now, member)
+    redis.call('PEXPIRE', key, window)
+    table.insert(out, 1)
+    table.insert(out, limit - counts[i] - 1)
+    table.insert(out, 0)
+  else
+    table.insert(out, 1)
+    table.insert(out, limit - counts[i])
+    table.insert(out, 0)
+  end
+end
+return out
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    scope: str
+    identity: str  # user_id, email or ip
+    limit: int
+    window_seconds: int = 60
+
+    @property
+    def key(self) -> str:
+        return f"rlw:{self.scope}:{self.identity}"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after_seconds: int
+
+
+def parse_script_result(raw: Sequence[int | str], *, window_seconds: int) -> RateLimitResult:
+    allowed, remaining, retry_ms = (int(x) for x in raw)
+    retry_after = 0
+    if not allowed:
+        retry_after = max(1, math.ceil(retry_ms / 1000)) if retry_ms > 0 else window_seconds
+    return RateLimitResult(
+        allowed=bool(allowed), remaining=max(0, remaining), retry_after_seconds=retry_after
+    )
+
+
+def script_args(checks: Sequence[RateLimit], member: str) -> list[int | str]:
+    args: list[int | str] = [member]
+    for c in checks:
+        args += [int(c.window_seconds) * 1000, int(c.limit)]
+    return args
+
+
+def parse_script_results(
+    raw: Sequence[int | str], checks: Sequence[RateLimit]
+) -> list[RateLimitResult]:
+    """
+    Split the script's flat reply into one result per check (same order as KEYS).
+    """
+    if len(raw) != 3 * len(checks):
+        raise ValueError(f"Expected {3 * len(checks)} values from the rate limit script")
+    return [
+        parse_script_result(raw[3 * i : 3 * i + 3], window_seconds=c.window_seconds)
+        for i, c in enumerate(checks)
+    ]
+
+
+class LocalBlocklist:
+    """
+    Keys Redis recently rejected, until their retry time. Checked before Redis so an
+    identity hammering an endpoint it is already locked out of costs no round-trip.
+    Bounded; oldest blocks are dropped first.
+    """
+
+    def __init__(
+        self, *, max_entries: int = 10000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._blocked: OrderedDict[str, float] = OrderedDict()
+
+    def retry_after(self, key: str) -> int | None:
+        with self._lock:
+            until = self._blocked.get(key)
+            if until is None:
+                return None
+            left = until - self._clock()
+            if left <= 0:
+                del self._blocked[key]
+                return None
+            return max(1, math.ceil(left))
+
+    def block(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._blocked[key] = self._clock() + float(seconds)
+            self._blocked.move_to_end(key)
+            while len(self._blocked) > self.max_entries:
+                self._blocked.popitem(last=False)
@@ -1,43 +1,59 @@
 from __future__ import annotations
 
-import time
+import uuid
+from typing import Sequence
 
-import redis
 from fastapi import HTTPException
 
 from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.services.rate_limit_window import (
+    SLIDING_WINDOW_LUA,
+    LocalBlocklist,
+    RateLimit,
+    parse_script_results,
+    script_args,
+)
 
-# uses the same Redis as Celery broker
-_redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+# register_script: EVALSHA, falling back to EVAL (script load) on NOSCRIPT
+_script = redis_client.register_script(SLIDING_WINDOW_LUA)
+_blocklist = LocalBlocklist()
 
 
-def _key(scope: str, identity: str) -> str:
-    # identity can be user_id or ip
-    return f"rl:{scope}:{identity}"
+def _raise_429(retry_after: int) -> None:
+    raise HTTPException(
+        status_code=429,
+        detail=f"Rate limit exceeded. Try again in {retry_after}s",
+        headers={"Retry-After": str(retry_after)},
+    )
 
 
-def rate_limit_or_429(scope: str, identity: str, *, limit: int, window_seconds: int = 60) -> None:
+def rate_limits_or_429(checks: Sequence[RateLimit]) -> None:
     """
-    Fixed window counter with TTL.
-    - increment counter
-    - set expiry on first hit
-    - if over limit -> 429
+    Sliding-window limits for every scope of one request, in one atomic Lua call.
+    The request counts against all scopes only if all of them allow it; otherwise
+    429 with the longest Retry-After among the scopes over their limit.
     """
-    if not settings.rate_limit_enabled:
+    if not settings.rate_limit_enabled or not checks:
         return
 
-    k = _key(scope, identity)
-    count = _redis.incr(k)
+    for c in checks:
+        retry_after = _blocklist.retry_after(c.key)
+        if retry_after is not None:
+            _raise_429(retry_after)
+
+    raw = _script(keys=[c.key for c in checks], args=script_args(checks, uuid.uuid4().hex))
+    results = parse_script_results(raw, checks)
 
-    if count == 1:
-        _redis.expire(k, window_seconds)
+    denied = [(c, r) for c, r in zip(checks, results) if not r.allowed]
+    if denied:
+        for c, r in denied:
+            _blocklist.block(c.key, r.retry_after_seconds)
+        _raise_429(max(r.retry_after_seconds for _, r in denied))
 
-    if count > limit:
-        ttl = _redis.ttl(k)
-        retry_after = ttl if ttl and ttl > 0 else window_seconds
 
-        raise HTTPException(
-            status_code=429,
-            detail=f"Rate limit exceeded. Try again in {retry_after}s",
-            headers={"Retry-After": str(retry_after)},
-        )
\ No newline at end of file
+def rate_limit_or_429(scope: str, identity: str, *, limit: int, window_seconds: int = 60) -> None:
+    """
+    At most `limit` requests per identity in any rolling `window_seconds`, else 429.
+    """
+    rate_limits_or_429([RateLimit(scope, identity, limit, window_seconds)])
@@ -1,54 +1,276 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.services.embedding_service import embed_text
 
+# pgvector's default is 40; higher = better recall, slower queries.
+HNSW_EF_SEARCH = int(os.getenv("RETRIEVAL_HNSW_EF_SEARCH", "40"))
 
-def _pgvector_literal(vec: List[float]) -> str:
-    # pgvector accepts: '[0.1,0.2,...]'
-    return "[" + ",".join(f"{x:.8f}" for x in vec) + "]"
+# Jobs with at most this many embedded retrieval chunks are ranked exactly via the job_id
+# btree index: the global HNSW graph only yields ef_search candidates before the job
+# filter runs, so a selective job_id can leave fewer than k rows.
+EXACT_SCAN_MAX_CHUNKS = int(os.getenv("RETRIEVAL_EXACT_SCAN_MAX_CHUNKS", "5000"))
 
+# pgvector >= 0.8 keeps scanning the HNSW graph until the filtered LIMIT is satisfied.
+ITERATIVE_SCAN_MIN_VERSION = (0, 8)
 
-def retrieve_top_k_chunks(
+# Reciprocal rank fusion constant (Cormack et al. use 60).
+RRF_K = int(os.getenv("RETRIEVAL_RRF_K", "60"))
+
+# Candidates fetched from each retriever per requested hit in hybrid mode.
+HYBRID_CANDIDATE_FACTOR = int(os.getenv("RETRIEVAL_HYBRID_CANDIDATE_FACTOR", "4"))
+
+# Query embedding is an HTTP call; run it beside the lexical SQL.
+_embed_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query-embed")
+
+_CHUNK_COLUMNS = "id, idx, start_seconds, end_seconds, text"
+
+
+def set_ef_search(db: Session, ef_search: int) -> None:
+    """
+    Transaction-local hnsw.ef_search (SET LOCAL semantics), so the knob never leaks
+    into other requests sharing the pooled connection.
+    """
+    db.execute(
+        text("SELECT set_config('hnsw.ef_search', :v, true)"),
+        {"v": str(int(ef_search))},
+    )
+
+
+def parse_extension_version(version: str | None) -> tuple[int, ...]:
+    """
+    '0.8.0' -> (0, 8, 0); missing or unparsable -> ().
+    """
+    parts: list[int] = []
+    for p in str(version or "").split("."):
+        m = re.match(r"\d+", p)
+        if m is None:
+            break
+        parts.append(int(m.group()))
+    return tuple(parts)
+
+
+_iterative_scan_supported: bool | None = None
+
+
+def set_iterative_scan(db: Session) -> bool:
+    """
+    Transaction-local hnsw.iterative_scan = relaxed_order where pgvector supports it
+    (older versions reject the setting). Returns whether it was enabled.
+    """
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        version = db.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        ).scalar_one_or_none()
+        _iterative_scan_supported = parse_extension_version(version) >= ITERATIVE_SCAN_MIN_VERSION
+
+    if _iterative_scan_supported:
+        db.execute(text("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)"))
+    return _iterative_scan_supported
+
+
+def rrf_fuse(rankings: Iterable[List[Hashable]], *, k: int = RRF_K) -> List[tuple[Hashable, float]]:
+    """
+    Reciprocal rank fusion: score(d) = sum over rankings of 1 / (k + rank), rank 1-based.
+    Returns (id, score) sorted by score desc; ties keep first-seen order.
+    """
+    scores: dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def _count_embedded_chunks(db: Session, *, job_id: UUID) -> int:
+    return int(
+        db.execute(
+            text(
+                """
+                SELECT count(*)
+                FROM transcript_chunks
+                WHERE job_id = :job_id
+                  AND kind = 'retrieval'
+                  AND embedding IS NOT NULL
+                """
+            ),
+            {"job_id": str(job_id)},
+        ).scalar_one()
+    )
+
+
+def _hnsw_search(
+    db: Session, *, job_id: UUID, query_vec: np.ndarray, k: int, ef_search: int | None
+) -> List[Dict[str, Any]]:
+    set_ef_search(db, max(int(ef_search or HNSW_EF_SEARCH), int(k)))
+    set_iterative_scan(db)
+
+    rows = db.execute(
+        text(
+            f"""
+            SELECT
+                {_CHUNK_COLUMNS},
+                (embedding <=> :qvec) AS distance
+            FROM transcript_chunks
+            WHERE job_id = :job_id
+              AND kind = 'retrieval'
+              AND embedding IS NOT NULL
+            ORDER BY embedding <=> :qvec
+            LIMIT :k
+            """
+        ),
+        {"job_id": str(job_id), "qvec": query_vec, "k": int(k)},
+    ).mappings().all()
+
+    # relaxed_order may return rows slightly out of distance order
+    return sorted((dict(r) for r in rows), key=lambda r: r["distance"])
+
+
+def _exact_search(
+    db: Session, *, job_id: UUID, query_vec: np.ndarray, k: int
+) -> List[Dict[str, Any]]:
+    """
+    Exact ranking of one job's chunks: the MATERIALIZED CTE keeps the planner on the
+    job_id btree index instead of the global HNSW index.
+    """
+    rows = db.execute(
+        text(
+            f"""
+            WITH job_chunks AS MATERIALIZED (
+                SELECT {_CHUNK_COLUMNS}, embedding
+                FROM transcript_chunks
+                WHERE job_id = :job_id
+                  AND kind = 'retrieval'
+                  AND embedding IS NOT NULL
+            )
+            SELECT
+                {_CHUNK_COLUMNS},
+                (embedding <=> :qvec) AS distance
+            FROM job_chunks
+            ORDER BY distance
+            LIMIT :k
+            """
+        ),
+        {"job_id": str(job_id), "qvec": query_vec, "k": int(k)},
+    ).mappings().all()
+
+    return [dict(r) for r in rows]
+
+
+def _vector_search(
     db: Session,
     *,
     job_id: UUID,
-    query: str,
-    k: int = 5,
+    query_vec: np.ndarray,
+    k: int,
+    ef_search: int | None,
 ) -> List[Dict[str, Any]]:
     """
-    Returns top-k transcript_chunks for a given job, ordered by vector distance.
-    Uses cosine distance operator (<=>) by default (works with HNSW index).
+    Top-k chunks of one job by cosine distance. Small jobs are ranked exactly; large
+    ones use HNSW (iterative scan where available), falling back to the exact scan if
+    the filtered index scan still came back short.
     """
-    if not query.strip():
+    total = _count_embedded_chunks(db, job_id=job_id)
+    if total == 0:
         return []
 
-    query_vec = embed_text(query)
-    vec_str = _pgvector_literal(query_vec)
+    if total > EXACT_SCAN_MAX_CHUNKS:
+        rows = _hnsw_search(db, job_id=job_id, query_vec=query_vec, k=k, ef_search=ef_search)
+        if len(rows) >= min(int(k), total):
+            return rows
+
+    return _exact_search(db, job_id=job_id, query_vec=query_vec, k=k)
 
+
+def _lexical_search(db: Session, *, job_id: UUID, query: str, k: int) -> List[Dict[str, Any]]:
+    """
+    Full-text ranking over transcript_chunks.tsv (same 'english' config as segment search).
+    """
     rows = db.execute(
         text(
-            """
+            f"""
             SELECT
-                id,
-                idx,
-                start_seconds,
-                end_seconds,
-                text,
-                (embedding <=> :qvec) AS distance
-            FROM transcript_chunks
+                {_CHUNK_COLUMNS},
+                ts_rank(tsv, query) AS lexical_rank
+            FROM transcript_chunks, websearch_to_tsquery('english', :q) AS query
             WHERE job_id = :job_id
-              AND embedding IS NOT NULL
-            ORDER BY embedding <=> :qvec
+              AND kind = 'retrieval'
+              AND tsv @@ query
+            ORDER BY lexical_rank DESC, idx ASC
             LIMIT :k
             """
         ),
-        {"job_id": str(job_id), "qvec": vec_str, "k": int(k)},
+        {"job_id": str(job_id), "q": query, "k": int(k)},
     ).mappings().all()
 
-    return [dict(r) for r in rows]
\ No newline at end of file
+    return [dict(r) for r in rows]
+
+
+def _query_vector(query: str) -> np.ndarray:
+    # numpy array -> bound as a binary `vector` param (pgvector adapter, see app.db.session)
+    return np.asarray(embed_text(query), dtype=np.float32)
+
+
+def retrieve_top_k_chunks(
+    db: Session,
+    *,
+    job_id: UUID,
+    query: str,
+    k: int = 5,
+    ef_search: int | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Returns top-k transcript_chunks for a given job, ordered by vector distance.
+    Uses cosine distance operator (<=>); see _vector_search for exact vs HNSW.
+    ef_search only applies to the HNSW path (large jobs) and is raised to at least k.
+    """
+    if not query.strip():
+        return []
+
+    return _vector_search(db, job_id=job_id, query_vec=_query_vector(query), k=k, ef_search=ef_search)
+
+
+def retrieve_hybrid_chunks(
+    db: Session,
+    *,
+    job_id: UUID,
+    query: str,
+    k: int = 5,
+    ef_search: int | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Lexical (tsvector) + vector retrieval over transcript_chunks, fused with RRF.
+
+    The query embedding is computed in a worker thread while the lexical query runs.
+    Hits carry `score` (RRF), `distance` (None if only lexical matched) and
+    `lexical_rank` (None if only vector matched).
+    """
+    if not query.strip():
+        return []
+
+    candidates = max(int(k) * HYBRID_CANDIDATE_FACTOR, int(k))
+
+    vec_future = _embed_pool.submit(_query_vector, query)
+    lexical = _lexical_search(db, job_id=job_id, query=query, k=candidates)
+    vector = _vector_search(db, job_id=job_id, query_vec=vec_future.result(), k=candidates, ef_search=ef_search)
+
+    by_id: dict[int, Dict[str, Any]] = {}
+    for h in vector:
+        by_id[h["id"]] = {**h, "lexical_rank": None}
+    for h in lexical:
+        if h["id"] in by_id:
+            by_id[h["id"]]["lexical_rank"] = h["lexical_rank"]
+        else:
+            by_id[h["id"]] = {**h, "distance": None}
+
+    fused = rrf_fuse([[h["id"] for h in vector], [h["id"] for h in lexical]])
+    return [{**by_id[chunk_id], "score": score} for chunk_id, score in fused[: int(k)]]
@@ -7,6 +7,10 @@ import os
 
 DATA_DIR = Path(os.getenv("AIV_DATA_DIR", "./data")).resolve()
 
+# Content-addressed audio blobs shared across jobs (see services.audio_store_service)
+AUDIO_STORE_DIR = DATA_DIR / "audio"
+AUDIO_STORE_MAX_BYTES = int(os.getenv("AIV_AUDIO_STORE_MAX_BYTES", str(20 * 1024**3)))  # 20 GiB
+
 def ensure_job_dir(job_id: str) -> Path:
     p = DATA_DIR / "jobs" / job_id
     p.mkdir(parents=True, exist_ok=True)
@@ -18,4 +22,34 @@ def sha256_file(path: Path) -> str:
     with path.open("rb") as f:
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
-    return h.hexdigest()
\ No newline at end of file
+    return h.hexdigest()
+
+
+def audio_blob_path(content_sha256: str, ext: str) -> Path:
+    """
+    DATA_DIR/audio/<sha[:2]>/<sha>.<ext> (two-level fan-out keeps directories small)
+    """
+    suffix = f".{ext}" if ext else ""
+    return AUDIO_STORE_DIR / content_sha256[:2] / f"{content_sha256}{suffix}"
+
+
+def move_into_audio_store(src: Path, content_sha256: str, ext: str) -> Path:
+    """
+    Move a downloaded file to its content address.
+    If the blob already exists (another worker won the race), the source copy is discarded.
+    """
+    dest = audio_blob_path(content_sha256, ext)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    if dest.exists() and dest.stat().st_size > 0:
+        src.unlink(missing_ok=True)
+        return dest
+
+    os.replace(src, dest)
+    return dest
+
+
+def file_uri_to_path(storage_uri: str) -> Path | None:
+    if not storage_uri or not storage_uri.startswith("file://"):
+        return None
+    return Path(storage_uri.replace("file://", ""))
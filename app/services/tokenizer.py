@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from typing import Protocol
+
+from app.core.logging import get_logger
+
+logger = get_logger()
+
+TOKENIZER = os.getenv("TOKENIZER", "approx").strip().lower()
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "cl100k_base").strip()
+
+# Words, single CJK characters, or single punctuation marks.
+_PIECE_RE = re.compile(r"[぀-ヿ㐀-鿿가-힯]|[^\W_]+|[^\w\s]|_+")
+
+
+class Tokenizer(Protocol):
+    name: str
+
+    def count(self, text: str) -> int: ...
+
+
+class ApproxTokenizer:
+    """
+    Dependency-free BPE estimate: one token per started ~6 characters of a word, one
+    per punctuation mark or CJK character. Close to cl100k on English prose and avoids
+    the wild swings of a flat chars/4 on other scripts.
+    """
+
+    name = "approx"
+
+    def __init__(self, chars_per_token: float = 6.0) -> None:
+        self.chars_per_token = float(chars_per_token)
+
+    def count(self, text: str) -> int:
+        total = 0
+        for piece in _PIECE_RE.findall(text or ""):
+            total += max(1, math.ceil(len(piece) / self.chars_per_token))
+        return total
+
+
+class TiktokenTokenizer:
+    """
+    Exact counts for OpenAI models. Needs the optional `tiktoken` package.
+    """
+
+    def __init__(self, encoding: str = TOKENIZER_ENCODING) -> None:
+        import tiktoken
+
+        self._enc = tiktoken.get_encoding(encoding)
+        self.name = f"tiktoken:{encoding}"
+
+    def count(self, text: str) -> int:
+        return len(self._enc.encode(text or "", disallowed_special=()))
+
+
+_tokenizer: Tokenizer | None = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer() -> Tokenizer:
+    """
+    Process-wide tokenizer chosen by TOKENIZER (approx | tiktoken). Falls back to the
+    approximate tokenizer when tiktoken isn't installed.
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                tok: Tokenizer = ApproxTokenizer()
+                if TOKENIZER == "tiktoken":
+                    try:
+                        tok = TiktokenTokenizer()
+                    except ImportError:
+                        logger.warning("tokenizer.tiktoken_missing", fallback=tok.name)
+                _tokenizer = tok
+    return _tokenizer
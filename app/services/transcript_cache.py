@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.services.idempotency import canonicalize_params
+from app.services.transcript_chunking_service import ChunkingParams
+
+# Models/compute types a job may request via params_json; anything else falls back to the default
+WHISPER_ALLOWED_MODELS = frozenset(
+    m.strip()
+    for m in os.getenv(
+        "WHISPER_ALLOWED_MODELS", "tiny,tiny.en,base,base.en,small,small.en,medium,medium.en"
+    ).split(",")
+    if m.strip()
+)
+WHISPER_ALLOWED_COMPUTE_TYPES = frozenset(
+    c.strip()
+    for c in os.getenv("WHISPER_ALLOWED_COMPUTE_TYPES", "int8,int8_float32,float32").split(",")
+    if c.strip()
+)
+
+
+@dataclass(frozen=True)
+class AsrParams:
+    """
+    Everything that changes the output of a transcription run.
+    Two jobs with the same video fingerprint and the same AsrParams produce the same transcript.
+    """
+
+    whisper_model: str = "base"
+    compute_type: str = "int8"
+    beam_size: int = 5
+    vad_filter: bool = False
+    language: str | None = None
+    # >1: audio split at silences into windows decoded in parallel (cuts change output slightly)
+    parallel_windows: int = 1
+
+    @classmethod
+    def from_job_params(cls, params: dict[str, Any] | None) -> AsrParams:
+        p = params or {}
+
+        language = p.get("language")
+        if not isinstance(language, str) or not language.strip():
+            language = None
+        else:
+            language = language.strip().lower()
+
+        whisper_model = p.get("whisper_model")
+        if whisper_model not in WHISPER_ALLOWED_MODELS:
+            whisper_model = cls.whisper_model
+
+        compute_type = p.get("compute_type")
+        if compute_type not in WHISPER_ALLOWED_COMPUTE_TYPES:
+            compute_type = cls.compute_type
+
+        return cls(whisper_model=whisper_model, compute_type=compute_type, language=language)
+
+
+def build_transcript_cache_key(
+    video_fingerprint: str,
+    params: AsrParams,
+    chunking: ChunkingParams | None = None,
+) -> str:
+    """
+    Content address for a transcript and its chunk sets:
+      sha256("transcript:v2:<video_fingerprint>:<canonical asr params>:<canonical chunking>")
+    chunking defaults to ChunkingParams().
+    """
+    asr = canonicalize_params(asdict(params))
+    chunks = canonicalize_params(asdict(chunking or ChunkingParams()))
+    raw = f"transcript:v2:{video_fingerprint}:{asr}:{chunks}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
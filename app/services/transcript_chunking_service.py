@@ -1,17 +1,111 @@
 from __future__ import annotations
 
-from typing import List, Dict
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
 
-MAX_CHUNK_CHARS = 4000  # ~800–1200 tokens-ish, depends on language
+from app.db.models.transcript_chunk import ChunkKind
+from app.services.tokenizer import Tokenizer, get_tokenizer
 
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…。！？])\s+")
+_SENTENCE_END_CHARS = ".!?…。！？"
+_CLOSING_CHARS = "\"'”’)]»"
 
-def build_transcript_chunks(segments: List[Dict]) -> List[Dict]:
-    chunks = []
-    current_text = []
-    current_start_s = None
-    current_end_s = None
-    current_length = 0
-    chunk_idx = 0
+
+@dataclass(frozen=True)
+class ChunkingParams:
+    """
+    Token budgets for the two chunk sets built from one transcript:
+    large "summary" chunks for map-summarize, small overlapping "retrieval" chunks for RAG.
+    """
+
+    tokenizer: str = "approx"
+    summary_max_tokens: int = 1000
+    summary_overlap_tokens: int = 0
+    retrieval_max_tokens: int = 256
+    retrieval_overlap_tokens: int = 48
+
+
+@dataclass(frozen=True)
+class _Unit:
+    start_seconds: float
+    end_seconds: float
+    text: str
+    tokens: int
+
+
+def _merge(units: List[_Unit]) -> _Unit:
+    return _Unit(
+        start_seconds=units[0].start_seconds,
+        end_seconds=units[-1].end_seconds,
+        text=" ".join(u.text for u in units),
+        tokens=sum(u.tokens for u in units),
+    )
+
+
+def _ends_sentence(text: str) -> bool:
+    s = text.rstrip().rstrip(_CLOSING_CHARS)
+    return bool(s) and s[-1] in _SENTENCE_END_CHARS
+
+
+def _split_segment(text: str, start_s: float, end_s: float) -> Iterator[tuple[str, float, float]]:
+    """
+    Sentences of one segment, with times interpolated by character offset.
+    """
+    total = max(1, len(text))
+    duration = max(0.0, end_s - start_s)
+    pos = 0
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        offset = text.find(sentence, pos)
+        pos = offset + len(sentence)
+        if not sentence.strip():
+            continue
+        yield (
+            sentence.strip(),
+            start_s + duration * offset / total,
+            start_s + duration * pos / total,
+        )
+
+
+def _split_oversized(
+    text: str, start_s: float, end_s: float, tokenizer: Tokenizer, max_tokens: int
+) -> Iterator[_Unit]:
+    """
+    Last resort for a sentence longer than the budget: cut between words.
+    """
+    tokens = tokenizer.count(text)
+    if tokens <= max_tokens:
+        yield _Unit(start_s, end_s, text, tokens)
+        return
+
+    words = text.split()
+    duration = max(0.0, end_s - start_s)
+    piece: List[str] = []
+    piece_tokens = 0
+    done_words = 0
+    for word in words:
+        t = tokenizer.count(word)
+        if piece and piece_tokens + t > max_tokens:
+            s = start_s + duration * done_words / len(words)
+            done_words += len(piece)
+            e = start_s + duration * done_words / len(words)
+            yield _Unit(s, e, " ".join(piece), piece_tokens)
+            piece, piece_tokens = [], 0
+        piece.append(word)
+        piece_tokens += t
+    if piece:
+        s = start_s + duration * done_words / len(words)
+        yield _Unit(s, end_s, " ".join(piece), piece_tokens)
+
+
+def _sentence_units(segments: List[Dict], tokenizer: Tokenizer, max_tokens: int) -> List[_Unit]:
+    """
+    Whole sentences (which may span Whisper segments). A sentence that outgrows the
+    budget is closed at a segment boundary instead, then between words.
+    """
+    units: List[_Unit] = []
+    pending: List[_Unit] = []
+    pending_tokens = 0
 
     for seg in segments:
         text = (seg.get("text") or "").strip()
@@ -21,35 +115,99 @@ def build_transcript_chunks(segments: List[Dict]) -> List[Dict]:
         seg_start_s = float(seg["start_ms"]) / 1000.0
         seg_end_s = float(seg["end_ms"]) / 1000.0
 
-        if current_start_s is None:
-            current_start_s = seg_start_s
-
-        if current_text and (current_length + len(text) + 1 > MAX_CHUNK_CHARS):
-            chunks.append(
-                {
-                    "idx": chunk_idx,
-                    "start_seconds": current_start_s,
-                    "end_seconds": float(current_end_s or current_start_s),
-                    "text": " ".join(current_text).strip(),
-                }
-            )
-            chunk_idx += 1
-            current_text = []
-            current_length = 0
-            current_start_s = seg_start_s
-
-        current_text.append(text)
-        current_length += len(text) + 1
-        current_end_s = seg_end_s
-
-    if current_text and current_start_s is not None:
+        for sentence, s, e in _split_segment(text, seg_start_s, seg_end_s):
+            for part in _split_oversized(sentence, s, e, tokenizer, max_tokens):
+                if pending and pending_tokens + part.tokens > max_tokens:
+                    units.append(_merge(pending))
+                    pending, pending_tokens = [], 0
+                pending.append(part)
+                pending_tokens += part.tokens
+
+            if _ends_sentence(sentence):
+                units.append(_merge(pending))
+                pending, pending_tokens = [], 0
+
+    if pending:
+        units.append(_merge(pending))
+    return units
+
+
+def build_transcript_chunks(
+    segments: List[Dict],
+    *,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    tokenizer: Tokenizer | None = None,
+) -> List[Dict]:
+    """
+    Pack whole sentences into chunks of at most max_tokens. Each chunk after the first
+    repeats up to overlap_tokens of trailing sentences from the previous one.
+
+    Returns [{"idx", "start_seconds", "end_seconds", "text", "token_count"}, ...].
+    """
+    tokenizer = tokenizer or get_tokenizer()
+    max_tokens = max(1, int(max_tokens))
+    overlap_tokens = max(0, min(int(overlap_tokens), max_tokens // 2))
+
+    chunks: List[Dict] = []
+    current: List[_Unit] = []
+    current_tokens = 0
+    fresh = False  # current holds at least one unit not already emitted
+
+    def _emit() -> None:
+        merged = _merge(current)
         chunks.append(
             {
-                "idx": chunk_idx,
-                "start_seconds": current_start_s,
-                "end_seconds": float(current_end_s or current_start_s),
-                "text": " ".join(current_text).strip(),
+                "idx": len(chunks),
+                "start_seconds": merged.start_seconds,
+                "end_seconds": merged.end_seconds,
+                "text": merged.text,
+                "token_count": merged.tokens,
             }
         )
 
+    for unit in _sentence_units(segments, tokenizer, max_tokens):
+        if current and current_tokens + unit.tokens > max_tokens:
+            if fresh:
+                _emit()
+
+            # Carry trailing sentences into the next chunk, leaving room for this unit
+            tail: List[_Unit] = []
+            tail_tokens = 0
+            for prev in reversed(current):
+                if tail_tokens + prev.tokens > min(overlap_tokens, max_tokens - unit.tokens):
+                    break
+                tail.insert(0, prev)
+                tail_tokens += prev.tokens
+            current, current_tokens, fresh = tail, tail_tokens, False
+
+        current.append(unit)
+        current_tokens += unit.tokens
+        fresh = True
+
+    if current and fresh:
+        _emit()
+
     return chunks
+
+
+def build_chunk_sets(
+    segments: List[Dict], params: ChunkingParams, *, tokenizer: Tokenizer | None = None
+) -> Dict[str, List[Dict]]:
+    """
+    Both chunk sets, keyed by transcript_chunks.kind.
+    """
+    return {
+        ChunkKind.SUMMARY.value: build_transcript_chunks(
+            segments,
+            max_tokens=params.summary_max_tokens,
+            overlap_tokens=params.summary_overlap_tokens,
+            tokenizer=tokenizer,
+        ),
+        ChunkKind.RETRIEVAL.value: build_transcript_chunks(
+            segments,
+            max_tokens=params.retrieval_max_tokens,
+            overlap_tokens=params.retrieval_overlap_tokens,
+            tokenizer=tokenizer,
+        ),
+    }
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Iterable, Iterator, Mapping
+
+EXPORT_FORMATS: dict[str, tuple[str, str]] = {
+    # format -> (media type, file extension)
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "srt": ("application/x-subrip", "srt"),
+    "vtt": ("text/vtt", "vtt"),
+    "txt": ("text/plain; charset=utf-8", "txt"),
+}
+
+# Flush to the socket in ~64KB pieces rather than one write per segment.
+STREAM_BUFFER_BYTES = 64 * 1024
+
+
+def _fmt_clock(ms: int, sep: str) -> str:
+    ms = max(0, int(ms))
+    h, rem = divmod(ms, 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    s, frac = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}{frac:03d}"
+
+
+def _one_line(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def iter_transcript_export(rows: Iterable[Mapping[str, Any]], fmt: str) -> Iterator[str]:
+    """
+    Render transcript segments (idx, start_ms, end_ms, text) one row at a time.
+    Never materializes the whole transcript.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+
+    for n, r in enumerate(rows, start=1):
+        start_ms, end_ms, text = int(r["start_ms"]), int(r["end_ms"]), _one_line(r["text"])
+        if fmt == "ndjson":
+            yield json.dumps(
+                {"idx": int(r["idx"]), "start_ms": start_ms, "end_ms": end_ms, "text": r["text"]},
+                ensure_ascii=False,
+            ) + "\n"
+        elif fmt == "srt":
+            yield f"{n}\n{_fmt_clock(start_ms, ',')} --> {_fmt_clock(end_ms, ',')}\n{text}\n\n"
+        elif fmt == "vtt":
+            yield f"{_fmt_clock(start_ms, '.')} --> {_fmt_clock(end_ms, '.')}\n{text}\n\n"
+        else:
+            yield text + "\n"
+
+
+def iter_encoded(chunks: Iterable[str], *, buffer_bytes: int = STREAM_BUFFER_BYTES) -> Iterator[bytes]:
+    buf: list[bytes] = []
+    size = 0
+    for chunk in chunks:
+        b = chunk.encode("utf-8")
+        buf.append(b)
+        size += len(b)
+        if size >= buffer_bytes:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+def gzip_stream(chunks: Iterable[bytes], *, level: int = 6) -> Iterator[bytes]:
+    """
+    Incremental gzip (wbits=31 -> gzip container) for a streamed response body.
+    """
+    z = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    True if the Accept-Encoding header allows gzip (honours q=0).
+    """
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k.strip().lower() == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        return q > 0
+    return False
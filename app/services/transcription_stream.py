@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from app.services.job_progress import PROGRESS_STEPS, TRANSCRIBE_PROGRESS_END
+
+
+class SegmentBatcher:
+    """
+    Buffers transcribed segments and hands back a batch once max_segments are
+    buffered or max_seconds have passed since the last flush.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_segments: int,
+        max_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_segments = max(1, int(max_segments))
+        self.max_seconds = float(max_seconds)
+        self._clock = clock
+        self._buf: list[dict] = []
+        self._last_flush = clock()
+
+    def add(self, segment: dict) -> list[dict] | None:
+        self._buf.append(segment)
+        if (
+            len(self._buf) >= self.max_segments
+            or self._clock() - self._last_flush >= self.max_seconds
+        ):
+            return self.drain()
+        return None
+
+    def drain(self) -> list[dict]:
+        batch, self._buf = self._buf, []
+        self._last_flush = self._clock()
+        return batch
+
+
+def transcribe_progress(position_seconds: float, duration_seconds: float | None) -> int:
+    """
+    Map audio position onto the transcribe band of the job progress bar.
+    """
+    start = PROGRESS_STEPS["transcribe"].progress
+    if not duration_seconds or duration_seconds <= 0:
+        return start
+    fraction = max(0.0, min(1.0, float(position_seconds) / float(duration_seconds)))
+    return start + int((TRANSCRIBE_PROGRESS_END - start) * fraction)
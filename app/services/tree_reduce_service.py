@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Mapping
+
+from app.services.tokenizer import Tokenizer, get_tokenizer
+
+
+@dataclass(frozen=True)
+class SummaryNode:
+    level: int
+    idx: int
+    start_seconds: float
+    end_seconds: float
+    summary_md: str
+
+
+def render_nodes(nodes: list[SummaryNode]) -> str:
+    """
+    Markdown input for a reduce call: one headed section per node, in time order.
+    """
+    parts = []
+    for n in nodes:
+        label = "Chunk" if n.level == 0 else "Section"
+        parts.append(
+            f"### {label} {n.idx} ({n.start_seconds:.0f}s-{n.end_seconds:.0f}s)\n{n.summary_md}"
+        )
+    return "\n\n".join(parts)
+
+
+def plan_batches(
+    nodes: list[SummaryNode],
+    *,
+    budget_tokens: int,
+    max_fan_in: int,
+    tokenizer: Tokenizer | None = None,
+) -> list[list[SummaryNode]]:
+    """
+    Group consecutive nodes into batches that fit budget_tokens and max_fan_in.
+    A node larger than the budget gets a batch of its own; if that would leave the
+    level no smaller, nodes are paired so the tree always shrinks.
+    """
+    tokenizer = tokenizer or get_tokenizer()
+    max_fan_in = max(2, int(max_fan_in))
+    batches: list[list[SummaryNode]] = []
+    current: list[SummaryNode] = []
+    current_tokens = 0
+
+    for n in nodes:
+        cost = tokenizer.count(render_nodes([n])) + 2
+        if current and (current_tokens + cost > budget_tokens or len(current) >= max_fan_in):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(n)
+        current_tokens += cost
+
+    if current:
+        batches.append(current)
+
+    if len(nodes) > 1 and len(batches) == len(nodes):
+        batches = [list(nodes[i : i + 2]) for i in range(0, len(nodes), 2)]
+    return batches
+
+
+def batch_input_hash(batch: list[SummaryNode]) -> str:
+    h = hashlib.sha256()
+    for n in batch:
+        h.update(f"{n.level}:{n.idx}:{n.start_seconds}:{n.end_seconds}\n".encode("utf-8"))
+        h.update(n.summary_md.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def reduce_tree(
+    leaves: list[SummaryNode],
+    merge: Callable[[str], str],
+    *,
+    budget_tokens: int,
+    max_fan_in: int,
+    concurrency: int = 4,
+    existing: Mapping[tuple[int, int], tuple[str, SummaryNode]] | None = None,
+    on_level: Callable[[int, list[tuple[str, SummaryNode]]], None] | None = None,
+) -> tuple[list[SummaryNode], list[int]]:
+    """
+    Merge batches of nodes level by level until the whole level fits in one batch.
+
+    - merge(markdown) -> markdown is called in a thread pool, one call per batch.
+    - existing maps (level, idx) -> (input_hash, node) from an earlier attempt; a node
+      whose input hash still matches is reused instead of re-merged.
+    - on_level(level, [(input_hash, node), ...]) receives newly merged nodes (also the
+      successful ones of a level that partly failed, before the first error is raised).
+
+    Returns (top level nodes, node count per merged level).
+    """
+    existing = existing or {}
+    nodes = list(leaves)
+    level_sizes: list[int] = []
+
+    while len(nodes) > 1:
+        batches = plan_batches(nodes, budget_tokens=budget_tokens, max_fan_in=max_fan_in)
+        if len(batches) == 1:
+            break
+
+        level = len(level_sizes) + 1
+        next_nodes: dict[int, SummaryNode] = {}
+        pending: list[tuple[int, str, list[SummaryNode]]] = []
+        for i, batch in enumerate(batches):
+            input_hash = batch_input_hash(batch)
+            prev = existing.get((level, i))
+            if prev is not None and prev[0] == input_hash:
+                next_nodes[i] = prev[1]
+            else:
+                pending.append((i, input_hash, batch))
+
+        merged: list[tuple[str, SummaryNode]] = []
+        failures: list[tuple[int, Exception]] = []
+        if pending:
+            workers = max(1, min(int(concurrency), len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tree-reduce") as pool:
+                futures = [
+                    (i, input_hash, batch, pool.submit(merge, render_nodes(batch)))
+                    for i, input_hash, batch in pending
+                ]
+                for i, input_hash, batch, fut in futures:
+                    try:
+                        summary_md = fut.result()
+                        if not summary_md:
+                            raise RuntimeError(f"Empty merged summary at level={level} idx={i}")
+                    except Exception as e:
+                        failures.append((i, e))
+                        continue
+                    node = SummaryNode(
+                        level=level,
+                        idx=i,
+                        start_seconds=batch[0].start_seconds,
+                        end_seconds=batch[-1].end_seconds,
+                        summary_md=summary_md,
+                    )
+                    next_nodes[i] = node
+                    merged.append((input_hash, node))
+
+        if on_level is not None and merged:
+            on_level(level, merged)
+        if failures:
+            raise failures[0][1]
+
+        level_sizes.append(len(batches))
+        nodes = [next_nodes[i] for i in range(len(batches))]
+
+    return nodes, level_sizes
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Callable
+
+from app.core.logging import get_logger
+from app.services.transcript_cache import AsrParams
+
+logger = get_logger()
+
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu").strip()
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+WHISPER_MAX_LOADED_MODELS = int(os.getenv("WHISPER_MAX_LOADED_MODELS", "2"))
+# Comma-separated "<model>[:<compute_type>]" loaded at worker boot, e.g. "base:int8,small"
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "").strip()
+
+# Per-job overrides are clamped so one request can't oversubscribe the worker.
+_MAX_CPU_THREADS = os.cpu_count() or 1
+_MAX_NUM_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class WhisperSpec:
+    """
+    How to construct one WhisperModel. Two jobs with equal specs share the loaded model.
+    """
+
+    model: str = AsrParams.whisper_model
+    compute_type: str = AsrParams.compute_type
+    device: str = WHISPER_DEVICE
+    cpu_threads: int = WHISPER_CPU_THREADS
+    num_workers: int = WHISPER_NUM_WORKERS
+
+    @classmethod
+    def for_job(cls, asr: AsrParams, params: dict[str, Any] | None = None) -> WhisperSpec:
+        """
+        Model/compute_type come from the (validated) AsrParams; cpu_threads/num_workers
+        only affect speed, so they are read from params here and kept out of the cache key.
+        """
+        p = params or {}
+        spec = cls(model=asr.whisper_model, compute_type=asr.compute_type)
+
+        cpu_threads = p.get("cpu_threads")
+        if isinstance(cpu_threads, int) and not isinstance(cpu_threads, bool):
+            spec = replace(spec, cpu_threads=max(0, min(cpu_threads, _MAX_CPU_THREADS)))
+
+        num_workers = p.get("num_workers")
+        if isinstance(num_workers, int) and not isinstance(num_workers, bool):
+            spec = replace(spec, num_workers=max(1, min(num_workers, _MAX_NUM_WORKERS)))
+        return spec
+
+
+def parse_preload(value: str) -> list[WhisperSpec]:
+    specs: list[WhisperSpec] = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model, _, compute_type = item.partition(":")
+        spec = WhisperSpec(model=model.strip())
+        if compute_type.strip():
+            spec = replace(spec, compute_type=compute_type.strip())
+        specs.append(spec)
+    return specs
+
+
+def _rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _load_whisper(spec: WhisperSpec) -> Any:
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        spec.model,
+        device=spec.device,
+        compute_type=spec.compute_type,
+        cpu_threads=spec.cpu_threads,
+        num_workers=spec.num_workers,
+        download_root=os.getenv("WHISPER_MODEL_DIR", str(Path("./models").resolve())),
+    )
+
+
+@dataclass
+class _Entry:
+    model: Any
+    load_seconds: float
+    rss_delta_bytes: int | None
+    uses: int = 0
+    last_used: float = 0.0
+
+
+class WhisperModelRegistry:
+    """
+    Per-process LRU of loaded Whisper models, keyed by WhisperSpec. Loads are serialized
+    (one lock), so concurrent callers asking for the same spec load it once.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_models: int = WHISPER_MAX_LOADED_MODELS,
+        loader: Callable[[WhisperSpec], Any] = _load_whisper,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_models = max(1, int(max_models))
+        self._loader = loader
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._models: OrderedDict[WhisperSpec, _Entry] = OrderedDict()
+
+    def get(self, spec: WhisperSpec) -> Any:
+        with self._lock:
+            entry = self._models.get(spec)
+            if entry is None:
+                entry = self._load(spec)
+            self._models.move_to_end(spec)
+            entry.uses += 1
+            entry.last_used = self._clock()
+            return entry.model
+
+    def _load(self, spec: WhisperSpec) -> _Entry:
+        rss_before = _rss_bytes()
+        started = self._clock()
+        model = self._loader(spec)
+        load_seconds = self._clock() - started
+        rss_after = _rss_bytes()
+        rss_delta = None
+        if rss_before is not None and rss_after is not None:
+            rss_delta = rss_after - rss_before
+
+        entry = _Entry(model=model, load_seconds=load_seconds, rss_delta_bytes=rss_delta)
+        self._models[spec] = entry
+        logger.info(
+            "whisper.model.loaded",
+            **asdict(spec),
+            load_seconds=round(load_seconds, 3),
+            rss_delta_mb=round(rss_delta / 2**20, 1) if rss_delta is not None else None,
+        )
+
+        while len(self._models) > self.max_models:
+            evicted, _ = self._models.popitem(last=False)
+            logger.info("whisper.model.evicted", **asdict(evicted))
+        return entry
+
+    def preload(self, specs: list[WhisperSpec]) -> None:
+        for spec in specs[: self.max_models]:
+            try:
+                self.get(spec)
+            except Exception as e:
+                logger.warning("whisper.model.preload_failed", **asdict(spec), error=str(e))
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    **asdict(spec),
+                    "load_seconds": round(e.load_seconds, 3),
+                    "rss_delta_bytes": e.rss_delta_bytes,
+                    "uses": e.uses,
+                    "idle_seconds": round(self._clock() - e.last_used, 1),
+                }
+                for spec, e in reversed(self._models.items())
+            ]
+
+
+_registry: WhisperModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_whisper_registry() -> WhisperModelRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = WhisperModelRegistry()
+    return _registry
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import threading
+
 from celery import Celery
+from celery.signals import worker_process_init
 
 from app.core.config import settings
 from app.core.logging import configure_logging, get_logger
@@ -39,4 +42,26 @@ celery_app.conf.update(
     task_acks_late=True,
 )
 
-logger.info("celery.configured", broker=settings.redis_url)
\ No newline at end of file
+logger.info("celery.configured", broker=settings.redis_url)
+
+
+@worker_process_init.connect
+def _preload_whisper_models(**_: object) -> None:
+    """
+    Warm the per-process Whisper registry (WHISPER_PRELOAD). Runs in a background thread:
+    Celery kills children that take more than a few seconds in worker_process_init, and
+    a task arriving meanwhile just waits on the registry lock for the same model.
+    """
+    from app.services.whisper_registry import (
+        WHISPER_PRELOAD,
+        get_whisper_registry,
+        parse_preload,
+    )
+
+    specs = parse_preload(WHISPER_PRELOAD)
+    if not specs:
+        return
+    logger.info("whisper.preload.start", models=[s.model for s in specs])
+    threading.Thread(
+        target=get_whisper_registry().preload, args=(specs,), name="whisper-preload", daemon=True
+    ).start()
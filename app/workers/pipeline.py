@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from celery import group, signature
+from celery.canvas import Signature
+
+_TASKS = "app.workers.tasks"
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    task: str  # registered Celery task name
+    depends_on: tuple[str, ...] = ()
+
+
+# Declarative job pipeline: a stage is enqueued as soon as everything it depends on has
+# finished (see pipeline_stage_done), so independent branches never wait on each other.
+PIPELINE_STAGES: tuple[Stage, ...] = (
+    Stage("download_audio", f"{_TASKS}.download_audio.download_audio"),
+    Stage("transcribe", f"{_TASKS}.transcribe_audio.transcribe_audio", ("download_audio",)),
+    Stage("embed_chunks", f"{_TASKS}.embed_transcript_chunks.embed_transcript_chunks", ("transcribe",)),
+    Stage("map_summarize", f"{_TASKS}.map_summarize.map_summarize_job", ("transcribe",)),
+    Stage("reduce_summarize", f"{_TASKS}.reduce_summarize.reduce_summarize_job", ("map_summarize",)),
+    # Chapters read the top level of the reduce tree, so they wait for reduce.
+    Stage(
+        "extract_chapters",
+        f"{_TASKS}.extract_chapters.extract_chapters_job",
+        ("reduce_summarize",),
+    ),
+    Stage(
+        "extract_key_takeaways",
+        f"{_TASKS}.extract_key_takeaways.extract_key_takeaways_job",
+        ("reduce_summarize",),
+    ),
+    Stage(
+        "extract_action_items",
+        f"{_TASKS}.extract_action_items.extract_action_items_job",
+        ("reduce_summarize",),
+    ),
+    Stage("format_markdown", f"{_TASKS}.format_markdown.format_markdown_job", ("reduce_summarize",)),
+    Stage(
+        "persist_final_results",
+        f"{_TASKS}.persist_final_results.persist_final_results_job",
+        ("extract_chapters", "extract_key_takeaways", "extract_action_items", "format_markdown"),
+    ),
+    Stage(
+        "finalize",
+        f"{_TASKS}.process_job.finalize_job",
+        ("persist_final_results", "embed_chunks"),
+    ),
+)
+
+STAGE_DONE_TASK = f"{_TASKS}.process_job.pipeline_stage_done"
+
+
+def topological_levels(stages: tuple[Stage, ...] | list[Stage]) -> list[list[Stage]]:
+    """
+    Group stages into levels: every stage lands one level after its deepest dependency.
+    Raises ValueError on unknown dependencies, duplicate names or cycles.
+    """
+    by_name: dict[str, Stage] = {}
+    for s in stages:
+        if s.name in by_name:
+            raise ValueError(f"Duplicate pipeline stage: {s.name}")
+        by_name[s.name] = s
+
+    for s in stages:
+        for dep in s.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Stage {s.name} depends on unknown stage {dep}")
+
+    depth: dict[str, int] = {}
+    visiting: set[str] = set()
+
+    def _depth(name: str) -> int:
+        if name in depth:
+            return depth[name]
+        if name in visiting:
+            raise ValueError(f"Pipeline has a cycle through stage {name}")
+        visiting.add(name)
+        deps = by_name[name].depends_on
+        d = 1 + max((_depth(dep) for dep in deps), default=-1)
+        visiting.discard(name)
+        depth[name] = d
+        return d
+
+    for s in stages:
+        _depth(s.name)
+
+    levels: list[list[Stage]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for s in stages:  # keep declaration order inside a level
+        levels[depth[s.name]].append(s)
+    return levels
+
+
+def ready_stages(
+    stages: tuple[Stage, ...] | list[Stage], done: set[str] | frozenset[str]
+) -> list[Stage]:
+    """
+    Non-root stages not finished yet whose dependencies have all finished. Roots are
+    enqueued by build_pipeline; the caller still has to claim each stage once.
+    """
+    return [
+        s
+        for s in stages
+        if s.depends_on and s.name not in done and all(dep in done for dep in s.depends_on)
+    ]
+
+
+def stage_signature(job_id: str, stage: Stage) -> Signature:
+    """
+    Immutable stage task (receives only job_id) that reports completion on success.
+    """
+    sig = signature(stage.task, args=(job_id,), immutable=True)
+    sig.link(signature(STAGE_DONE_TASK, args=(job_id, stage.name), immutable=True))
+    return sig
+
+
+def build_pipeline(
+    job_id: str, stages: tuple[Stage, ...] | list[Stage] = PIPELINE_STAGES
+) -> Signature:
+    """
+    Root stages of the (validated) DAG as a Celery group. Every stage links to
+    pipeline_stage_done, which enqueues the stages that just became ready.
+    """
+    topological_levels(stages)  # raises on cycles / unknown deps before anything runs
+    return group(stage_signature(job_id, s) for s in stages if not s.depends_on)
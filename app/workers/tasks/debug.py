@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import time
+from typing import Any
 
 from celery import shared_task
 
 from app.core.logging import get_logger
+from app.services.whisper_registry import get_whisper_registry
 
 logger = get_logger()
 
@@ -14,4 +16,12 @@ def ping(self) -> dict[str, str]:
     logger.info("task.ping.start", task_id=self.request.id)
     time.sleep(1)
     logger.info("task.ping.end", task_id=self.request.id)
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@shared_task(bind=True)
+def whisper_models(self) -> list[dict[str, Any]]:
+    """
+    Whisper models loaded in the worker process that ran this task (load time, memory, uses).
+    """
+    return get_whisper_registry().stats()
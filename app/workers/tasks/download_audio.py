@@ -10,27 +10,30 @@ from yt_dlp import YoutubeDL
 from app.core.logging import get_logger
 from app.db.models.artifact import ArtifactType
 from app.db.models.job import Job, JobStatus
-from app.db.repositories.artifacts import get_artifact, upsert_artifact
-from app.db.repositories.jobs import get_job_for_update, update_job_fields
+from app.db.repositories.artifacts import get_artifact
+from app.db.repositories.audio_blobs import upsert_blob
+from app.db.repositories.jobs import get_job_for_update, is_job_stopped, update_job_fields
 from app.db.session import SessionLocal
 from app.services.job_events_service import log_error, log_status_change
-from app.services.storage_service import ensure_job_dir, sha256_file
+from app.services.audio_store_service import attach_blob_to_job, evict_audio_blobs, find_live_blob
+from app.services.storage_service import ensure_job_dir, move_into_audio_store, sha256_file
 
 logger = get_logger()
 
 
 def _set_status(db: Session, job: Job, to_status: str, stage: str, progress: int) -> None:
-    from_status = job.status
+    if job.status != to_status:
+        log_status_change(db, job, from_status=job.status, to_status=to_status, stage=stage)
     update_job_fields(db, job, status=to_status, stage=stage, progress=progress)
-    if from_status != to_status:
-        log_status_change(db, job, from_status=from_status, to_status=to_status, stage=stage)
 
 
 @shared_task(bind=True, max_retries=3)
 def download_audio(self, job_id: str) -> dict[str, str]:
     """
     Download best audio for the job's video (YouTube) using yt-dlp.
-    Stores file under /app/data/jobs/<job_id>/audio.<ext> inside container.
+    Downloads land in /app/data/jobs/<job_id>/ and are then moved into the shared
+    content-addressed store (/app/data/audio/<sha[:2]>/<sha>.<ext>).
+    If any job already stored audio for the same video fingerprint, yt-dlp is skipped.
     """
     logger.info("audio.download.start", job_id=job_id, task_id=self.request.id)
 
@@ -40,6 +43,12 @@ def download_audio(self, job_id: str) -> dict[str, str]:
         job = get_job_for_update(db, job_uuid)
         if not job:
             return {"status": "not_found"}
+        if is_job_stopped(job):
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info(
+                "job.stage.skipped", job_id=job_id, stage="download_audio", status=job.status
+            )
+            return {"status": "skipped", "job_status": job.status}
 
         # Build output dir
         out_dir = ensure_job_dir(job_id)
@@ -56,6 +65,15 @@ def download_audio(self, job_id: str) -> dict[str, str]:
         # Only download if job is in a state where download makes sense
         _set_status(db, job, JobStatus.DOWNLOADING.value, stage="download_audio", progress=10)
 
+        # ✅ Shared store: another job already downloaded this video
+        fingerprint = job.video.fingerprint
+        blob = find_live_blob(db, fingerprint)
+        if blob is not None:
+            art = attach_blob_to_job(db, job_id=job.id, blob=blob, meta={"shared": True})
+            if art is not None:
+                logger.info("audio.download.shared", job_id=job_id, sha256=blob.content_sha256)
+                return {"status": "shared", "path": art.storage_uri.replace("file://", "")}
+
         # We use canonical_url stored on the video record (already normalized)
         video_url = job.video.canonical_url
 
@@ -91,23 +109,37 @@ def download_audio(self, job_id: str) -> dict[str, str]:
 
         size_bytes = file_path.stat().st_size
         checksum = sha256_file(file_path)
-        storage_uri = f"file://{file_path.resolve()}"
+        ext = file_path.suffix.lstrip(".")
 
-        # ✅ Upsert so we do not create duplicate AUDIO artifacts for same job
-        upsert_artifact(
+        # ✅ Move into the content-addressed store and link this job to the blob
+        blob_path = move_into_audio_store(file_path, checksum, ext)
+        blob = upsert_blob(
             db,
-            job_id=job.id,
-            type=ArtifactType.AUDIO.value,
-            storage_uri=storage_uri,
             content_sha256=checksum,
+            video_fingerprint=fingerprint,
+            storage_uri=f"file://{blob_path.resolve()}",
+            ext=ext,
             size_bytes=size_bytes,
+        )
+        art = attach_blob_to_job(
+            db,
+            job_id=job.id,
+            blob=blob,
             meta={
-                "ext": file_path.suffix.lstrip("."),
                 "title": info.get("title"),
                 "webpage_url": info.get("webpage_url"),
                 "extractor": info.get("extractor"),
             },
         )
+        if art is None:
+            raise RuntimeError(f"Audio blob evicted or job ended during download: {checksum}")
+        file_path = blob_path
+
+        try:
+            evict_audio_blobs(db)
+        except Exception:
+            db.rollback()
+            logger.exception("audio.store.evict_failed", job_id=job_id)
 
         logger.info("audio.download.done", job_id=job_id, path=str(file_path))
         return {"status": "ok", "path": str(file_path)}
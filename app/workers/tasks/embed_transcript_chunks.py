@@ -8,9 +8,15 @@ from celery import shared_task
 from app.core.logging import get_logger
 from app.db.session import SessionLocal
 from app.db.models.job import Job, JobStatus
-from app.db.repositories.jobs import update_job_fields
-from app.db.repositories.transcript_chunk_embeddings import list_chunks_for_job, set_chunk_embedding
-from app.services.embeddings_client import EmbeddingsClient
+from app.db.repositories.jobs import STOPPED_STATUSES, get_job_status, update_job_fields
+from app.db.repositories.transcript_chunk_embeddings import (
+    list_chunks_for_job,
+    set_chunk_embeddings,
+)
+from app.services.embedding_service import get_embeddings_client
+from app.services.embeddings_client import iter_batches
+from app.services.job_events_service import log_error, log_retry
+from app.services.llm_retry_service import is_retryable_llm_error, retry_delay_seconds
 
 logger = get_logger()
 
@@ -21,22 +27,29 @@ def embed_transcript_chunks(self, job_id: str) -> dict[str, str]:
 
     db = SessionLocal()
     try:
+        status = get_job_status(db, UUID(job_id))
+        if status in STOPPED_STATUSES:
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info("job.stage.skipped", job_id=job_id, stage="embed_chunks", status=status)
+            return {"status": "skipped", "job_status": status}
+
         job_uuid = UUID(job_id)
 
         chunks = list_chunks_for_job(db, job_uuid)
         if not chunks:
             raise RuntimeError("No transcript_chunks found to embed")
 
-        client = EmbeddingsClient()
+        client = get_embeddings_client()
+
+        # skip if already embedded
+        pending = [c for c in chunks if getattr(c, "embedding", None) is None]
+        texts = [c.text for c in pending]
 
+        # One provider call + one bulk UPDATE per batch
         updated = 0
-        for c in chunks:
-            # skip if already embedded
-            if getattr(c, "embedding", None):
-                continue
-            emb = client.embed(c.text)
-            set_chunk_embedding(db, c.id, emb)
-            updated += 1
+        for batch in iter_batches(texts):
+            vecs = client.embed_batch([texts[i] for i in batch])
+            updated += set_chunk_embeddings(db, [(pending[i].id, v) for i, v in zip(batch, vecs)])
 
         db.commit()
         logger.info("rag.embed.done", job_id=job_id, updated=updated, total=len(chunks))
@@ -46,23 +59,48 @@ def embed_transcript_chunks(self, job_id: str) -> dict[str, str]:
         db.rollback()
         logger.exception("rag.embed.failed", job_id=job_id)
 
-        # optional: mark job failed (up to you). For now, just store error.
+        attempt = int(getattr(self.request, "retries", 0))
+        max_retries = int(getattr(self, "max_retries", 3))
+        is_last_attempt = attempt >= max_retries
+        retryable = is_retryable_llm_error(e)
+
         trace = traceback.format_exc()
         job = db.query(Job).filter(Job.id == UUID(job_id)).one_or_none()
         if job:
             update_job_fields(
                 db,
                 job,
-                status=JobStatus.FAILED.value,
-                stage="embed_failed",
                 error_code=type(e).__name__,
                 error_message=str(e),
                 error_trace=trace,
             )
-            db.commit()
 
-        attempt = int(getattr(self.request, "retries", 0))
-        raise self.retry(exc=e, countdown=2**attempt)
+            if retryable and not is_last_attempt:
+                log_retry(
+                    db,
+                    job,
+                    message="Retrying chunk embedding after transient failure",
+                    meta={"error": str(e), "attempt": attempt + 1, "max_retries": max_retries},
+                )
+            else:
+                # non-retryable OR retries exhausted => FAILED (finalize never runs)
+                update_job_fields(
+                    db,
+                    job,
+                    status=JobStatus.FAILED.value,
+                    stage="embed_failed",
+                )
+                log_error(
+                    db,
+                    job,
+                    message="Chunk embedding failed",
+                    meta={"error": str(e), "attempt": attempt, "max_retries": max_retries},
+                )
+
+        if retryable and not is_last_attempt:
+            raise self.retry(exc=e, countdown=retry_delay_seconds(attempt))
+
+        raise
 
     finally:
         db.close()
\ No newline at end of file
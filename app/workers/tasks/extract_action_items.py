@@ -10,7 +10,7 @@ import traceback
 from uuid import UUID
 
 from app.db.models.job import Job, JobStatus
-from app.db.repositories.jobs import update_job_fields
+from app.db.repositories.jobs import STOPPED_STATUSES, get_job_status, update_job_fields
 from app.services.job_events_service import log_error, log_retry
 from app.services.llm_retry_service import is_retryable_llm_error, retry_delay_seconds
 
@@ -23,6 +23,14 @@ def extract_action_items_job(self, job_id: str):
 
     db = SessionLocal()
     try:
+        status = get_job_status(db, UUID(job_id))
+        if status in STOPPED_STATUSES:
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info(
+                "job.stage.skipped", job_id=job_id, stage="extract_action_items", status=status
+            )
+            return {"status": "skipped", "job_status": status}
+
         # Load reduce summary
         row = db.execute(
             text("""
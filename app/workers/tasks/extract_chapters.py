@@ -9,13 +9,15 @@ from sqlalchemy import text
 from app.core.logging import get_logger
 from app.db.models.job import Job, JobStatus
 from app.db.repositories.chapters import delete_chapters_for_job, insert_chapters
-from app.db.repositories.jobs import get_job_for_update, update_job_fields
+from app.db.repositories.jobs import get_job_for_update, is_job_stopped, update_job_fields
+from app.db.repositories.summary_tree_nodes import list_top_summary_tree_nodes
 from app.db.session import SessionLocal
 from app.services.chapter_parsing_service import parse_chapters_md
 from app.services.job_events_service import log_error
 from app.services.job_progress import PROGRESS_STEPS
 from app.services.job_progress_service import set_job_progress
 from app.services.llm_client import LLMClient
+from app.services.tree_reduce_service import SummaryNode, render_nodes
 import traceback
 from uuid import UUID
 
@@ -37,33 +39,48 @@ def extract_chapters_job(self, job_id: str) -> dict[str, str]:
         job = get_job_for_update(db, job_uuid)
         if not job:
             return {"status": "not_found"}
+        if is_job_stopped(job):
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info(
+                "job.stage.skipped", job_id=job_id, stage="extract_chapters", status=job.status
+            )
+            return {"status": "skipped", "job_status": job.status}
 
         step = PROGRESS_STEPS["summarize"]
         set_job_progress(db, job=job, status=step.status, stage="summarize_chapters", progress=step.progress)
 
-        # Pull map_summaries in order
-        rows = (
-            db.execute(
-                text(
-                    """
-                    SELECT idx, start_seconds, end_seconds, summary_md
-                    FROM map_summaries
-                    WHERE job_id = :job_id
-                    ORDER BY idx ASC
-                    """
-                ),
-                {"job_id": str(job_uuid)},
+        # Long videos: use the top level of the reduce tree (fits one prompt);
+        # otherwise the map_summaries themselves.
+        rows = list_top_summary_tree_nodes(db, job_uuid)
+        if not rows:
+            rows = (
+                db.execute(
+                    text(
+                        """
+                        SELECT 0 AS level, idx, start_seconds, end_seconds, summary_md
+                        FROM map_summaries
+                        WHERE job_id = :job_id
+                        ORDER BY idx ASC
+                        """
+                    ),
+                    {"job_id": str(job_uuid)},
+                )
+                .mappings()
+                .all()
             )
-            .mappings()
-            .all()
-        )
 
         if not rows:
             raise RuntimeError("No map_summaries found; run SUM-1 first")
 
-        combined = "\n\n".join(
+        combined = render_nodes(
             [
-                f"### Chunk {r['idx']} ({r['start_seconds']:.0f}s-{r['end_seconds']:.0f}s)\n{r['summary_md']}"
+                SummaryNode(
+                    level=int(r["level"]),
+                    idx=int(r["idx"]),
+                    start_seconds=float(r["start_seconds"]),
+                    end_seconds=float(r["end_seconds"]),
+                    summary_md=r["summary_md"],
+                )
                 for r in rows
             ]
         )
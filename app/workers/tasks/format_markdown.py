@@ -9,7 +9,7 @@ from sqlalchemy import text
 from app.core.logging import get_logger
 from app.db.models.job import Job, JobStatus
 from app.db.repositories.formatted_results import upsert_formatted_result
-from app.db.repositories.jobs import get_job_for_update, update_job_fields
+from app.db.repositories.jobs import get_job_for_update, is_job_stopped, update_job_fields
 from app.db.session import SessionLocal
 from app.services.job_events_service import log_error
 from app.services.job_progress import PROGRESS_STEPS
@@ -32,6 +32,12 @@ def format_markdown_job(self, job_id: str) -> dict[str, str]:
         job = get_job_for_update(db, job_uuid)
         if not job:
             return {"status": "not_found"}
+        if is_job_stopped(job):
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info(
+                "job.stage.skipped", job_id=job_id, stage="format_markdown", status=job.status
+            )
+            return {"status": "skipped", "job_status": job.status}
 
         # Same overall summarize phase
         step = PROGRESS_STEPS["summarize"]
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from uuid import UUID
 
 from celery import shared_task
 
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.models.job import Job, JobStatus
-from app.db.repositories.jobs import get_job_for_update, update_job_fields
-from app.db.repositories.map_summaries import delete_map_summaries_for_job, upsert_map_summary
+from app.db.repositories.jobs import get_job_for_update, is_job_stopped, update_job_fields
+from app.db.repositories.map_summaries import list_summarized_idxs, upsert_map_summary
 from app.db.session import SessionLocal
 from app.services.job_events_service import log_error
 from app.services.job_progress import PROGRESS_STEPS
@@ -26,11 +29,30 @@ from app.services.llm_retry_service import is_retryable_llm_error, retry_delay_s
 logger = get_logger()
 
 
+def _summarize_with_retry(llm: LLMClient, chunk: dict, *, retries: int) -> str:
+    """
+    Summarize one chunk, retrying transient LLM errors locally so a single
+    flaky call doesn't fail (and re-run) the whole map stage.
+    """
+    attempt = 0
+    while True:
+        try:
+            summary_md = llm.summarize_chunk(chunk_text=chunk["text"])
+            if not summary_md:
+                raise RuntimeError(f"Empty summary for chunk idx={chunk['idx']}")
+            return summary_md
+        except Exception as e:
+            if attempt >= retries or not is_retryable_llm_error(e):
+                raise
+            time.sleep(retry_delay_seconds(attempt))
+            attempt += 1
+
+
 @shared_task(bind=True, max_retries=3)
 def map_summarize_job(self, job_id: str) -> dict[str, str]:
     """
     SUM-1 Map step:
-    - Read transcript_chunks
+    - Read the summary-sized transcript_chunks
     - Summarize each chunk
     - Persist per-chunk markdown summaries in map_summaries
     """
@@ -42,6 +64,12 @@ def map_summarize_job(self, job_id: str) -> dict[str, str]:
         job = get_job_for_update(db, job_uuid)
         if not job:
             return {"status": "not_found"}
+        if is_job_stopped(job):
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info(
+                "job.stage.skipped", job_id=job_id, stage="map_summarize", status=job.status
+            )
+            return {"status": "skipped", "job_status": job.status}
 
         # Mark summarizing progress
         step = PROGRESS_STEPS["summarize"]
@@ -55,6 +83,7 @@ def map_summarize_job(self, job_id: str) -> dict[str, str]:
                     SELECT idx, start_seconds, end_seconds, text
                     FROM transcript_chunks
                     WHERE job_id = :job_id
+                      AND kind = 'summary'
                     ORDER BY idx ASC
                     """
                 ),
@@ -67,27 +96,62 @@ def map_summarize_job(self, job_id: str) -> dict[str, str]:
         if not chunks:
             raise RuntimeError("No transcript_chunks found; cannot summarize")
 
-        # For idempotency: clear existing map summaries (optional)
-        delete_map_summaries_for_job(db, job_uuid)
+        # Resume: chunks summarized by a previous attempt are kept (transcribe clears them on re-run)
+        done = list_summarized_idxs(db, job_uuid)
+        pending = [dict(c) for c in chunks if int(c["idx"]) not in done]
 
         llm = LLMClient()
-
-        for c in chunks:
-            summary_md = llm.summarize_chunk(chunk_text=c["text"])
-            if not summary_md:
-                raise RuntimeError(f"Empty summary for chunk idx={c['idx']}")
-
+        results: dict[int, str] = {}
+        failures: list[tuple[int, Exception]] = []
+
+        workers = max(1, min(int(settings.map_summarize_concurrency), len(pending) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="map-summarize") as pool:
+            futures = {
+                pool.submit(
+                    _summarize_with_retry, llm, c, retries=int(settings.map_summarize_chunk_retries)
+                ): c
+                for c in pending
+            }
+            for fut in as_completed(futures):
+                c = futures[fut]
+                try:
+                    results[int(c["idx"])] = fut.result()
+                except Exception as e:
+                    failures.append((int(c["idx"]), e))
+
+        # Persist in idx order on this thread (Session is not thread-safe)
+        by_idx = {int(c["idx"]): c for c in pending}
+        for idx in sorted(results):
+            c = by_idx[idx]
             upsert_map_summary(
                 db,
                 job_uuid,
-                idx=int(c["idx"]),
+                idx=idx,
                 start_seconds=float(c["start_seconds"]),
                 end_seconds=float(c["end_seconds"]),
-                summary_md=summary_md,
+                summary_md=results[idx],
             )
 
+        if failures:
+            # Keep the successful chunks so the task retry only redoes the failed ones
+            db.commit()
+            _, first_error = min(failures, key=lambda f: f[0])
+            logger.warning(
+                "sum.map.partial",
+                job_id=job_id,
+                failed=[i for i, _ in failures],
+                persisted=len(results),
+            )
+            raise first_error
+
         db.commit()
-        logger.info("sum.map.done", job_id=job_id, chunks=len(chunks))
+        logger.info(
+            "sum.map.done",
+            job_id=job_id,
+            chunks=len(chunks),
+            summarized=len(results),
+            resumed=len(done),
+        )
         return {"status": "ok", "chunks": str(len(chunks))}
 
     except Exception as e:
@@ -12,7 +12,7 @@ import traceback
 from uuid import UUID
 
 from app.db.models.job import Job, JobStatus
-from app.db.repositories.jobs import update_job_fields
+from app.db.repositories.jobs import STOPPED_STATUSES, get_job_status, update_job_fields
 from app.services.job_events_service import log_error, log_retry
 from app.services.llm_retry_service import is_retryable_llm_error, retry_delay_seconds
 
@@ -25,6 +25,14 @@ def persist_final_results_job(self, job_id: str) -> dict[str, str]:
 
     db = SessionLocal()
     try:
+        status = get_job_status(db, UUID(job_id))
+        if status in STOPPED_STATUSES:
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info(
+                "job.stage.skipped", job_id=job_id, stage="persist_final_results", status=status
+            )
+            return {"status": "skipped", "job_status": status}
+
         job_uuid = UUID(job_id)
 
         # reduce summary
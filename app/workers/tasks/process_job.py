@@ -8,21 +8,26 @@ from celery import shared_task
 from sqlalchemy.orm import Session
 
 from app.core.logging import get_logger
+from app.core.redis_client import redis_client
 from app.db.models.job import Job, JobStatus
-from app.db.repositories.jobs import get_job_for_update, update_job_fields
+from app.db.repositories.jobs import (
+    STOPPED_STATUSES,
+    get_job_for_update,
+    get_job_status,
+    is_job_stopped,
+    update_job_fields,
+)
 from app.db.session import SessionLocal
+from app.services.audio_store_service import release_job_audio
 from app.services.job_events_service import log_error, log_retry
 from app.services.job_progress import PROGRESS_STEPS
 from app.services.job_progress_service import set_job_progress
-from app.workers.tasks.download_audio import download_audio
-from app.workers.tasks.transcribe_audio import transcribe_audio
-from app.workers.tasks.map_summarize import map_summarize_job
-from app.workers.tasks.reduce_summarize import reduce_summarize_job
-from app.workers.tasks.extract_chapters import extract_chapters_job
-from app.workers.tasks.extract_key_takeaways import extract_key_takeaways_job
-from app.workers.tasks.extract_action_items import extract_action_items_job
-from app.workers.tasks.persist_final_results import persist_final_results_job
-from app.workers.tasks.format_markdown import format_markdown_job
+from app.workers.pipeline import (
+    PIPELINE_STAGES,
+    build_pipeline,
+    ready_stages,
+    stage_signature,
+)
 
 logger = get_logger()
 
@@ -34,11 +39,11 @@ def _utcnow() -> datetime:
 @shared_task(bind=True, max_retries=3)
 def process_job(self, job_id: str) -> dict[str, str]:
     """
-    Worker pipeline skeleton:
+    Pipeline entrypoint:
     - Claim job if QUEUED
-    - Download audio (TRANS-1/2)
-    - Placeholder steps for transcribe/summarize (TRANS-3+, SUM)
-    - Mark COMPLETED or FAILED with retries
+    - Start the stage DAG (app.workers.pipeline) from its root stages
+    - finalize_job marks COMPLETED once every stage has finished
+    - Stage tasks mark FAILED themselves when their retries are exhausted
     """
     logger.info("job.process.start", job_id=job_id, task_id=self.request.id)
     attempt = int(getattr(self.request, "retries", 0))
@@ -72,28 +77,12 @@ def process_job(self, job_id: str) -> dict[str, str]:
             progress=10,
         )
 
-        # Download audio
-        download_audio(str(job.id))
+        # Each stage is enqueued as soon as its own inputs are done (pipeline_stage_done)
+        _reset_pipeline_state(str(job.id))
+        build_pipeline(str(job.id)).apply_async()
 
-        # Transcribe audio (faster-whisper)
-        transcribe_audio(str(job.id))
-
-        # Summarize (placeholder for now)
-        map_summarize_job(str(job.id))
-        reduce_summarize_job(str(job.id))
-        extract_chapters_job(str(job.id))
-        extract_key_takeaways_job(str(job.id))
-        extract_action_items_job(str(job.id))
-        persist_final_results_job(str(job.id))
-        format_markdown_job(str(job.id))
-
-        # Finalize
-        step = PROGRESS_STEPS["finalize"]
-        set_job_progress(db, job=job, status=step.status, stage=step.stage, progress=step.progress)
-        update_job_fields(db, job, completed_at=_utcnow())
-
-        logger.info("job.process.completed", job_id=job_id)
-        return {"status": "completed"}
+        logger.info("job.process.scheduled", job_id=job_id)
+        return {"status": "scheduled"}
 
     except Exception as e:
         trace = traceback.format_exc()
@@ -147,4 +136,82 @@ def process_job(self, job_id: str) -> dict[str, str]:
         raise
 
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Per-job DAG progress: stages that finished, and stages already enqueued (claimed once)
+PIPELINE_STATE_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _pipeline_keys(job_id: str) -> tuple[str, str]:
+    return f"pipeline:{job_id}:done", f"pipeline:{job_id}:claimed"
+
+
+def _reset_pipeline_state(job_id: str) -> None:
+    redis_client.delete(*_pipeline_keys(job_id))
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+def pipeline_stage_done(self, job_id: str, stage: str) -> dict[str, str]:
+    """
+    Link callback of every stage: record it as done and enqueue each stage whose
+    dependencies are now all done. The claim (SADD) makes sure two dependencies finishing
+    at the same time enqueue a shared successor only once. Nothing is enqueued once the
+    job is FAILED or CANCELED.
+    """
+    db = SessionLocal()
+    try:
+        status = get_job_status(db, UUID(job_id))
+    finally:
+        db.close()
+    if status is None or status in STOPPED_STATUSES:
+        # A failed / canceled (or deleted) job starts nothing else
+        logger.info("job.pipeline.stopped", job_id=job_id, stage=stage, status=status)
+        return {"status": "stopped"}
+
+    done_key, claimed_key = _pipeline_keys(job_id)
+    pipe = redis_client.pipeline()
+    pipe.sadd(done_key, stage)
+    pipe.expire(done_key, PIPELINE_STATE_TTL_SECONDS)
+    pipe.smembers(done_key)
+    done = set(pipe.execute()[2])
+
+    started: list[str] = []
+    for ready in ready_stages(PIPELINE_STAGES, done):
+        if not redis_client.sadd(claimed_key, ready.name):
+            continue
+        redis_client.expire(claimed_key, PIPELINE_STATE_TTL_SECONDS)
+        try:
+            stage_signature(job_id, ready).apply_async()
+        except Exception:
+            redis_client.srem(claimed_key, ready.name)  # let the retry enqueue it
+            raise
+        started.append(ready.name)
+
+    logger.info("job.pipeline.stage_done", job_id=job_id, stage=stage, started=started)
+    return {"status": "ok"}
+
+
+@shared_task
+def finalize_job(job_id: str) -> dict[str, str]:
+    """
+    Last DAG stage: runs only after every other stage succeeded.
+    """
+    db = SessionLocal()
+    try:
+        job = get_job_for_update(db, UUID(job_id))
+        if job is None:
+            return {"status": "not_found"}
+        if is_job_stopped(job):
+            logger.info("job.stage.skipped", job_id=job_id, stage="finalize", status=job.status)
+            return {"status": "skipped", "job_status": job.status}
+
+        step = PROGRESS_STEPS["finalize"]
+        set_job_progress(db, job=job, status=step.status, stage=step.stage, progress=step.progress)
+        release_job_audio(db, job.id)  # audio is no longer needed; blob becomes evictable
+        update_job_fields(db, job, completed_at=_utcnow())
+
+        logger.info("job.process.completed", job_id=job_id)
+        return {"status": "completed"}
+    finally:
+        db.close()
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import time
 import traceback
 from uuid import UUID
 
 from celery import shared_task
 from sqlalchemy import text
 
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.models.job import Job, JobStatus
-from app.db.repositories.jobs import get_job_for_update, update_job_fields
+from app.db.repositories.jobs import get_job_for_update, is_job_stopped, update_job_fields
 from app.db.repositories.reduce_summaries import upsert_reduce_summary
+from app.db.repositories.summary_tree_nodes import (
+    list_summary_tree_nodes,
+    prune_summary_tree,
+    upsert_summary_tree_node,
+)
 from app.db.session import SessionLocal
 from app.services.job_events_service import log_error
 from app.services.job_progress import PROGRESS_STEPS
@@ -17,16 +24,34 @@ from app.services.job_progress_service import set_job_progress
 from app.services.llm_client import LLMClient
 from app.services.llm_retry_service import is_retryable_llm_error, retry_delay_seconds
 from app.services.job_events_service import log_error, log_retry
+from app.services.tree_reduce_service import SummaryNode, reduce_tree, render_nodes
 
 logger = get_logger()
 
 
+def _merge_with_retry(llm: LLMClient, summaries_md: str, *, retries: int) -> str:
+    """
+    One tree-reduce merge, retrying transient LLM errors locally (see map_summarize).
+    """
+    attempt = 0
+    while True:
+        try:
+            return llm.merge_summaries(summaries_md=summaries_md)
+        except Exception as e:
+            if attempt >= retries or not is_retryable_llm_error(e):
+                raise
+            time.sleep(retry_delay_seconds(attempt))
+            attempt += 1
+
+
 @shared_task(bind=True, max_retries=3)
 def reduce_summarize_job(self, job_id: str) -> dict[str, str]:
     """
     SUM-2 Reduce step:
     - Read all map_summaries for job
-    - Combine into one final markdown summary
+    - Merge them level by level in token-budgeted batches (summary_tree_nodes)
+      until one batch is left, so long videos never overflow the context window
+    - Combine the top level into one final markdown summary
     - Persist to reduce_summaries
     """
     logger.info("sum.reduce.start", job_id=job_id, task_id=self.request.id)
@@ -37,6 +62,12 @@ def reduce_summarize_job(self, job_id: str) -> dict[str, str]:
         job = get_job_for_update(db, job_uuid)
         if not job:
             return {"status": "not_found"}
+        if is_job_stopped(job):
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info(
+                "job.stage.skipped", job_id=job_id, stage="reduce_summarize", status=job.status
+            )
+            return {"status": "skipped", "job_status": job.status}
 
         # Keep "summarize" stage; reduce is part of same phase
         step = PROGRESS_STEPS["summarize"]
@@ -46,7 +77,7 @@ def reduce_summarize_job(self, job_id: str) -> dict[str, str]:
             db.execute(
                 text(
                     """
-                    SELECT idx, summary_md
+                    SELECT idx, start_seconds, end_seconds, summary_md
                     FROM map_summaries
                     WHERE job_id = :job_id
                     ORDER BY idx ASC
@@ -61,19 +92,70 @@ def reduce_summarize_job(self, job_id: str) -> dict[str, str]:
         if not rows:
             raise RuntimeError("No map_summaries found; run SUM-1 first")
 
-        # Build combined input
-        combined = "\n\n".join([f"### Chunk {r['idx']}\n{r['summary_md']}" for r in rows])
+        leaves = [
+            SummaryNode(
+                level=0,
+                idx=int(r["idx"]),
+                start_seconds=float(r["start_seconds"]),
+                end_seconds=float(r["end_seconds"]),
+                summary_md=r["summary_md"],
+            )
+            for r in rows
+        ]
+
+        # Resume: nodes merged by a previous attempt are reused while their inputs match
+        existing = {
+            (n.level, n.idx): (
+                n.input_hash,
+                SummaryNode(
+                    level=n.level,
+                    idx=n.idx,
+                    start_seconds=float(n.start_seconds),
+                    end_seconds=float(n.end_seconds),
+                    summary_md=n.summary_md,
+                ),
+            )
+            for n in list_summary_tree_nodes(db, job_uuid)
+        }
+
+        def _persist_level(level: int, merged: list[tuple[str, SummaryNode]]) -> None:
+            # Runs on this thread (Session is not thread-safe); commit so a retry resumes here
+            for input_hash, node in merged:
+                upsert_summary_tree_node(
+                    db,
+                    job_uuid,
+                    level=node.level,
+                    idx=node.idx,
+                    start_seconds=node.start_seconds,
+                    end_seconds=node.end_seconds,
+                    summary_md=node.summary_md,
+                    input_hash=input_hash,
+                )
+            db.commit()
+            logger.info("sum.reduce.level", job_id=job_id, level=level, merged=len(merged))
 
         llm = LLMClient()
-        final_md = llm.reduce_summaries(map_summaries_md=combined)
+        retries = int(settings.map_summarize_chunk_retries)
+        top, level_sizes = reduce_tree(
+            leaves,
+            lambda md: _merge_with_retry(llm, md, retries=retries),
+            budget_tokens=int(settings.reduce_batch_tokens),
+            max_fan_in=int(settings.reduce_max_fan_in),
+            concurrency=int(settings.reduce_concurrency),
+            existing=existing,
+            on_level=_persist_level,
+        )
+        prune_summary_tree(db, job_uuid, level_sizes=level_sizes)
+
+        final_md = llm.reduce_summaries(map_summaries_md=render_nodes(top))
         if not final_md:
             raise RuntimeError("Empty reduce summary")
 
         upsert_reduce_summary(db, job_uuid, summary_md=final_md)
 
         db.commit()
-        logger.info("sum.reduce.done", job_id=job_id, chunks=len(rows))
-        return {"status": "ok", "chunks": str(len(rows))}
+        logger.info("sum.reduce.done", job_id=job_id, chunks=len(rows), levels=len(level_sizes))
+        return {"status": "ok", "chunks": str(len(rows)), "levels": str(len(level_sizes))}
 
     except Exception as e:
         db.rollback()
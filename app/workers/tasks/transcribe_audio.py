@@ -1,53 +1,179 @@
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, replace
 from pathlib import Path
+from typing import Any, Iterator
 from uuid import UUID
 
+import numpy as np
 from celery import shared_task
-from faster_whisper import WhisperModel
+from faster_whisper import WhisperModel, decode_audio
+from faster_whisper.vad import get_speech_timestamps
 
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.models.artifact import ArtifactType
 from app.db.models.job import Job, JobStatus
 from app.db.repositories.artifacts import get_artifact
-from app.db.repositories.jobs import get_job_for_update, update_job_fields
-from app.db.repositories.transcript_segments import delete_segments_for_job, insert_segments
+from app.db.repositories.jobs import get_job_for_update, is_job_stopped, update_job_fields
+from app.db.repositories.transcript import iter_segments_for_export
+from app.db.repositories.transcript_segments import (
+    delete_segments_for_job,
+    get_last_segment,
+    insert_segments,
+)
 from app.db.session import SessionLocal
 from app.services.job_events_service import log_error
-from app.services.transcript_chunking_service import build_transcript_chunks
+from app.services.tokenizer import get_tokenizer
+from app.services.transcript_chunking_service import ChunkingParams, build_chunk_sets
 from app.db.repositories.transcript_chunks import delete_chunks_for_job, insert_chunks
+from app.db.repositories.map_summaries import delete_map_summaries_for_job
+from app.db.repositories.transcript_cache import (
+    clone_transcript,
+    delete_cache_entry,
+    get_cache_entry,
+    record_cache_hit,
+    upsert_cache_entry,
+)
+from app.services.audio_windows import plan_windows, stitch_segments
 from app.services.job_progress import PROGRESS_STEPS
+from app.services.transcript_cache import AsrParams, build_transcript_cache_key
+from app.services.transcription_stream import SegmentBatcher, transcribe_progress
+from app.services.whisper_registry import WhisperSpec, get_whisper_registry
 from app.services.job_progress_service import set_job_progress
-from app.workers.tasks.embed_transcript_chunks import embed_transcript_chunks
-import os
 
 logger = get_logger()
 
-# ✅ Global model cache (loaded once per worker process)
-_MODEL: WhisperModel | None = None
+SAMPLE_RATE = 16000
 
 
 def _ms(seconds: float) -> int:
     return int(seconds * 1000)
 
 
-def get_model() -> WhisperModel:
+def _whisper_spec(asr: AsrParams, params: dict[str, Any] | None) -> WhisperSpec:
+    spec = WhisperSpec.for_job(asr, params)
+    # Window threads (see _window_executor) share one model; give it enough workers
+    # to decode concurrently. Process-pool workers each hold their own model.
+    if asr.parallel_windows > 1 and multiprocessing.current_process().daemon:
+        workers = max(1, int(settings.transcribe_parallel_workers))
+        spec = replace(spec, num_workers=max(spec.num_workers, workers))
+    return spec
+
+
+def get_model(spec: WhisperSpec | None = None) -> WhisperModel:
+    """
+    Loaded model for spec from this process's registry (bounded LRU, see whisper_registry).
+    Model files are cached under WHISPER_MODEL_DIR (mounted volume recommended).
+    """
+    return get_whisper_registry().get(spec or WhisperSpec())
+
+
+def _transcribe_window(audio: np.ndarray, asr: dict[str, Any], spec: dict[str, Any]) -> list[dict]:
+    """
+    Transcribe one audio window (runs in a pool worker with its own registry).
+    Times are relative to the window start.
+    """
+    segments, _ = get_model(WhisperSpec(**spec)).transcribe(
+        audio,
+        vad_filter=asr["vad_filter"],
+        beam_size=asr["beam_size"],
+        language=asr["language"],
+    )
+    return [{"start": s.start, "end": s.end, "text": s.text} for s in segments]
+
+
+def _window_executor(n_windows: int) -> Executor:
+    """
+    Spawned process pool (one WhisperModel per process). Celery prefork children are
+    daemonic and may not fork children, so fall back to threads on the shared model there.
     """
-    Load model once per worker process.
-    Model files will be cached under /app/models (mounted volume recommended).
+    workers = max(1, min(n_windows, int(settings.transcribe_parallel_workers)))
+    if multiprocessing.current_process().daemon:
+        logger.info("transcribe.parallel.threads", workers=workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcribe-window")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _plan_audio_windows(audio: np.ndarray, *, start_seconds: float) -> list[tuple[float, float]]:
+    spans = [
+        (t["start"] / SAMPLE_RATE, t["end"] / SAMPLE_RATE)
+        for t in get_speech_timestamps(audio, sampling_rate=SAMPLE_RATE)
+    ]
+    return plan_windows(
+        spans,
+        start=start_seconds,
+        end=len(audio) / SAMPLE_RATE,
+        n_windows=int(settings.transcribe_parallel_windows),
+        min_window_seconds=float(settings.transcribe_min_window_seconds),
+    )
+
+
+def _iter_window_segments(
+    audio: np.ndarray,
+    windows: list[tuple[float, float]],
+    asr: AsrParams,
+    spec: WhisperSpec,
+    *,
+    start_idx: int,
+) -> Iterator[dict]:
     """
-    global _MODEL
-    if _MODEL is None:
-        # Start with "base" for good speed/quality tradeoff on CPU
-        model_name = "base"
-        _MODEL = WhisperModel(
-            model_name,
-            device="cpu",
-            compute_type="int8",
-            download_root=os.getenv("WHISPER_MODEL_DIR", str(Path("./models").resolve())),
+    Transcribe windows in parallel; yield stitched rows window by window, in order.
+    """
+    with _window_executor(len(windows)) as pool:
+        futures = [
+            pool.submit(
+                _transcribe_window,
+                audio[int(ws * SAMPLE_RATE) : int(we * SAMPLE_RATE)],
+                asdict(asr),
+                asdict(spec),
+            )
+            for ws, we in windows
+        ]
+        yield from stitch_segments(
+            ((w, fut.result()) for w, fut in zip(windows, futures)), start_idx=start_idx
         )
-        logger.info("whisper.model.loaded", model=model_name)
-    return _MODEL
+
+
+def _chunking_params() -> ChunkingParams:
+    return ChunkingParams(
+        tokenizer=get_tokenizer().name,
+        summary_max_tokens=int(settings.summary_chunk_tokens),
+        summary_overlap_tokens=int(settings.summary_chunk_overlap_tokens),
+        retrieval_max_tokens=int(settings.retrieval_chunk_tokens),
+        retrieval_overlap_tokens=int(settings.retrieval_chunk_overlap_tokens),
+    )
+
+
+def _try_clone_cached_transcript(db, job: Job, cache_key: str) -> tuple[int, int] | None:
+    """
+    Clone a cached transcript into this job. Returns (segments, chunks) on hit, None on miss.
+    Stale entries (source rows gone) are dropped so the next job re-registers a fresh source.
+    """
+    entry = get_cache_entry(db, cache_key)
+    if entry is None or entry.source_job_id == job.id:
+        return None
+
+    step = PROGRESS_STEPS["transcribe"]
+    set_job_progress(db, job=job, status=step.status, stage=step.stage, progress=step.progress)
+
+    delete_segments_for_job(db, job.id)
+    delete_chunks_for_job(db, job.id)
+    delete_map_summaries_for_job(db, job.id)
+    segment_count, chunk_count = clone_transcript(db, source_job_id=entry.source_job_id, target_job_id=job.id)
+
+    if segment_count == 0 or chunk_count == 0:
+        db.rollback()
+        delete_cache_entry(db, cache_key)
+        db.commit()
+        logger.info("transcribe.cache.stale", job_id=str(job.id), cache_key=cache_key)
+        return None
+
+    record_cache_hit(db, entry)
+    db.commit()
+    return segment_count, chunk_count
 
 
 @shared_task(bind=True, max_retries=3)
@@ -60,6 +186,31 @@ def transcribe_audio(self, job_id: str) -> dict[str, str]:
         job = get_job_for_update(db, job_uuid)
         if not job:
             return {"status": "not_found"}
+        if is_job_stopped(job):
+            # A sibling stage failed (or the user canceled): don't move the job on
+            logger.info("job.stage.skipped", job_id=job_id, stage="transcribe", status=job.status)
+            return {"status": "skipped", "job_status": job.status}
+
+        asr = replace(
+            AsrParams.from_job_params(job.params_json),
+            parallel_windows=max(1, int(settings.transcribe_parallel_windows)),
+        )
+        spec = _whisper_spec(asr, job.params_json)
+        chunking = _chunking_params()
+        cache_key = build_transcript_cache_key(job.video.fingerprint, asr, chunking)
+
+        # ✅ Cross-job cache: same video + same ASR params => clone rows, skip the model
+        cached = _try_clone_cached_transcript(db, job, cache_key)
+        if cached is not None:
+            segment_count, chunk_count = cached
+            logger.info(
+                "transcribe.cache.hit",
+                job_id=job_id,
+                cache_key=cache_key,
+                segments=segment_count,
+                chunks=chunk_count,
+            )
+            return {"status": "cached", "segments": str(segment_count), "chunks": str(chunk_count)}
 
         # Find audio artifact
         audio_art = get_artifact(db, job_id=job.id, type=ArtifactType.AUDIO.value)
@@ -74,53 +225,121 @@ def transcribe_audio(self, job_id: str) -> dict[str, str]:
         step = PROGRESS_STEPS["transcribe"]
         set_job_progress(db, job=job, status=step.status, stage=step.stage, progress=step.progress)
 
-        # Clear existing transcript segments if re-run
-        delete_segments_for_job(db, job.id)
+        # Chunks/map summaries are rebuilt from the full transcript below (map summaries
+        # are keyed by chunk idx). Segments from an interrupted attempt are kept: resume
+        # decoding right after the last persisted one.
         delete_chunks_for_job(db, job.id)
+        delete_map_summaries_for_job(db, job.id)
+        last = get_last_segment(db, job.id)
+        db.commit()
 
-        model = get_model()
-
-        # Run transcription (segments are streamed)
-        segments_iter, info = model.transcribe(
-            str(audio_path),
-            vad_filter=False,
-            beam_size=5,
-        )
+        next_idx = 0
+        resume_seconds = 0.0
+        if last is not None:
+            next_idx = int(last["idx"]) + 1
+            resume_seconds = int(last["end_ms"]) / 1000.0
+            logger.info(
+                "transcribe.resume", job_id=job_id, from_idx=next_idx, from_ms=last["end_ms"]
+            )
 
-        segments_to_insert: list[dict] = []
-        for idx, seg in enumerate(segments_iter):
-            segments_to_insert.append(
+        windows: list[tuple[float, float]] = []
+        if asr.parallel_windows > 1:
+            # Long audio: split at silences and decode the windows in parallel
+            audio = decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE)
+            duration = len(audio) / SAMPLE_RATE
+            windows = _plan_audio_windows(audio, start_seconds=resume_seconds)
+
+        if len(windows) > 1:
+            logger.info("transcribe.parallel", job_id=job_id, windows=len(windows))
+            source = _iter_window_segments(
+                audio, windows, asr, spec, start_idx=next_idx
+            )
+        else:
+            # clip_timestamps: decode from the resume offset to the end
+            # (faster-whisper skips VAD for clipped runs)
+            resume_kwargs = {"clip_timestamps": [resume_seconds]} if last is not None else {}
+
+            # Run transcription (segments are streamed)
+            segments_iter, info = get_model(spec).transcribe(
+                str(audio_path),
+                vad_filter=asr.vad_filter,
+                beam_size=asr.beam_size,
+                language=asr.language,
+                **resume_kwargs,
+            )
+            duration = float(getattr(info, "duration", 0) or 0)
+            source = (
                 {
                     "idx": idx,
                     "start_ms": _ms(seg.start),
                     "end_ms": _ms(seg.end),
                     "text": (seg.text or "").strip(),
                 }
+                for idx, seg in enumerate(segments_iter, start=next_idx)
             )
 
-        if not segments_to_insert:
+        def _flush(batch: list[dict], position_seconds: float) -> None:
+            # Persist each batch in its own transaction so a crash keeps what was decoded
+            insert_segments(db, job.id, batch)
+            set_job_progress(
+                db,
+                job=job,
+                status=step.status,
+                stage=step.stage,
+                progress=transcribe_progress(position_seconds, duration),
+            )
+            db.commit()
+
+        batcher = SegmentBatcher(
+            max_segments=int(settings.transcribe_flush_segments),
+            max_seconds=float(settings.transcribe_flush_seconds),
+        )
+        for seg in source:
+            next_idx = int(seg["idx"]) + 1
+            batch = batcher.add(seg)
+            if batch:
+                _flush(batch, seg["end_ms"] / 1000.0)
+
+        rest = batcher.drain()
+        if rest:
+            _flush(rest, duration)
+
+        if next_idx == 0:
             raise RuntimeError("No transcript segments produced")
 
-        insert_segments(db, job.id, segments_to_insert)
+        segments_to_insert = list(iter_segments_for_export(db, job.id))
 
-        # ✅ Build + persist chunks (TRANS-5)
-        chunks = build_transcript_chunks(segments_to_insert)
-        if not chunks:
+        # ✅ Build + persist chunks (TRANS-5): summary-sized for map, small + overlapping for RAG
+        chunk_sets = build_chunk_sets(segments_to_insert, chunking)
+        if not all(chunk_sets.values()):
             raise RuntimeError("No transcript chunks produced")
 
-        insert_chunks(db, job.id, chunks)
+        for kind, kind_chunks in chunk_sets.items():
+            insert_chunks(db, job.id, kind_chunks, kind=kind)
+        chunk_count = sum(len(c) for c in chunk_sets.values())
+        if last is None:
+            upsert_cache_entry(
+                db,
+                cache_key=cache_key,
+                video_id=job.video_id,
+                source_job_id=job.id,
+                params=asr,
+                segment_count=len(segments_to_insert),
+                chunk_count=chunk_count,
+            )
+        else:
+            # Stitched from two runs (the clipped resume skips VAD): not what cache_key
+            # describes, so other jobs must not reuse it
+            logger.info("transcribe.cache_skip_resumed", job_id=job_id, cache_key=cache_key)
         db.commit()
 
-        # ✅ RAG-3: embed chunks after they are persisted
-        embed_transcript_chunks.delay(str(job.id))
-
         logger.info(
             "transcribe.done",
             job_id=job_id,
             segments=len(segments_to_insert),
-            chunks=len(chunks),
+            chunks={kind: len(c) for kind, c in chunk_sets.items()},
         )
-        return {"status": "ok", "segments": str(len(segments_to_insert)), "chunks": str(len(chunks))}
+        return {"status": "ok", "segments": str(len(segments_to_insert)), "chunks": str(chunk_count)}
 
     except Exception as e:
         db.rollback()
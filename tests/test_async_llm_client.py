@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from app.services.async_llm_client import AsyncLLMClient
+
+
+def _collect(client: AsyncLLMClient, **kwargs) -> list[str]:
+    async def run() -> list[str]:
+        return [piece async for piece in client.stream_answer_question(**kwargs)]
+
+    return asyncio.run(run())
+
+
+def _ollama_client(monkeypatch: pytest.MonkeyPatch, handler) -> AsyncLLMClient:
+    monkeypatch.setenv("LLM_MOCK", "0")
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setenv("OLLAMA_BASE_URL", "http://ollama.test")
+    client = AsyncLLMClient()
+    client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_mock_mode_never_calls_a_provider(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_MOCK", "1")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = AsyncLLMClient()
+
+    assert client.client is None
+    assert asyncio.run(client.complete(system="s", user="hello  world")).startswith("(MOCK)")
+    answer = asyncio.run(client.answer_question(question="why?", context_md="ctx"))
+    assert "why?" in answer
+    assert "".join(_collect(client, question="why?", context_md="ctx")) == answer
+
+
+def test_ollama_complete_posts_chat_and_strips(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url == "http://ollama.test/api/chat"
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={"message": {"content": "  the answer \n"}})
+
+    client = _ollama_client(monkeypatch, handler)
+
+    assert asyncio.run(client.complete(system="sys", user="usr")) == "the answer"
+    assert seen[0]["stream"] is False
+    assert [m["role"] for m in seen[0]["messages"]] == ["system", "user"]
+
+
+def test_ollama_stream_yields_deltas_until_done(monkeypatch: pytest.MonkeyPatch) -> None:
+    lines = [
+        {"message": {"content": "Hel"}, "done": False},
+        {"message": {"content": "lo"}, "done": False},
+        {"message": {"content": ""}, "done": True},
+        {"message": {"content": "ignored"}, "done": False},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=body.encode())
+
+    client = _ollama_client(monkeypatch, handler)
+
+    assert _collect(client, question="q", context_md="c") == ["Hel", "lo"]
+
+
+def test_ollama_http_errors_propagate(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _ollama_client(monkeypatch, lambda request: httpx.Response(503))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.complete(system="s", user="u"))
+
+
+def test_temperature_is_sent_to_ollama(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        done = json.dumps({"message": {"content": "ok"}, "done": True})
+        return httpx.Response(200, content=done.encode())
+
+    monkeypatch.setattr("app.services.async_llm_client.LLM_TEMPERATURE", 0.0)
+    client = _ollama_client(monkeypatch, handler)
+
+    asyncio.run(client.complete(system="s", user="u"))
+    _collect(client, question="q", context_md="c")
+    assert [payload["options"] for payload in seen] == [{"temperature": 0.0}] * 2
+
+
+def test_temperature_is_sent_to_openai(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={"id": "r", "object": "response", "output": []})
+
+    monkeypatch.setenv("LLM_MOCK", "0")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr("app.services.async_llm_client.LLM_TEMPERATURE", 0.2)
+    client = AsyncLLMClient()
+    client.client = AsyncOpenAI(
+        api_key="sk-test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    asyncio.run(client.complete(system="s", user="u"))
+    assert seen[0]["temperature"] == 0.2
@@ -0,0 +1,28 @@
+from app.services.audio_windows import plan_windows, stitch_segments
+
+
+def test_windows_cut_in_silence_nearest_even_split() -> None:
+    # speech with pauses at 95-105s, 190-210s and 290-300s in 400s of audio
+    spans = [(0.0, 95.0), (105.0, 190.0), (210.0, 290.0), (300.0, 400.0)]
+    windows = plan_windows(spans, start=0.0, end=400.0, n_windows=4, min_window_seconds=60)
+
+    assert windows == [(0.0, 100.0), (100.0, 200.0), (200.0, 295.0), (295.0, 400.0)]
+
+
+def test_windows_respect_min_length_and_resume_offset() -> None:
+    windows = plan_windows([], start=0.0, end=100.0, n_windows=8, min_window_seconds=120)
+    assert windows == [(0.0, 100.0)]
+
+    windows = plan_windows([], start=50.0, end=350.0, n_windows=3, min_window_seconds=100)
+    assert windows == [(50.0, 150.0), (150.0, 250.0), (250.0, 350.0)]
+
+
+def test_stitch_offsets_and_continuous_idx() -> None:
+    first = [{"start": 0.0, "end": 4.0, "text": " a "}, {"start": 98, "end": 103, "text": "b"}]
+    second = [{"start": 0.0, "end": 2.5, "text": "c"}]
+    rows = list(stitch_segments([((0.0, 100.0), first), ((100.0, 200.0), second)], start_idx=7))
+
+    assert [r["idx"] for r in rows] == [7, 8, 9]
+    spans = [(r["start_ms"], r["end_ms"]) for r in rows]
+    assert spans == [(0, 4000), (98000, 100000), (100000, 102500)]
+    assert rows[0]["text"] == "a"
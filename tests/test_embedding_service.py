@@ -0,0 +1,35 @@
+from app.services.embedding_service import QueryEmbeddingCache, normalize_query
+
+
+def test_normalize_query_collapses_case_and_whitespace() -> None:
+    assert normalize_query("  What IS   the\tpoint? ") == normalize_query("what is the\tpoint?")
+    assert normalize_query("What is\n the point?") == "what is the point?"
+
+
+def test_query_cache_counts_hits_and_expires_entries() -> None:
+    now = [0.0]
+    cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=60, clock=lambda: now[0])
+    key = ("mock", "mock", "hello")
+
+    assert cache.get(key) is None
+    cache.put(key, [1.0, 2.0])
+    assert cache.get(key) == [1.0, 2.0]
+
+    now[0] = 61.0
+    assert cache.get(key) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_query_cache_evicts_least_recently_used() -> None:
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60)
+    a, b, c = ("p", "m", "a"), ("p", "m", "b"), ("p", "m", "c")
+
+    cache.put(a, [1.0])
+    cache.put(b, [2.0])
+    cache.get(a)  # a is now most recent
+    cache.put(c, [3.0])
+
+    assert cache.get(b) is None
+    assert cache.get(a) == [1.0]
+    assert cache.get(c) == [3.0]
@@ -0,0 +1,24 @@
+from app.services.embeddings_client import EMBED_DIM, EmbeddingsClient, iter_batches
+
+
+def test_iter_batches_respects_item_and_token_limits() -> None:
+    texts = ["x" * 40] * 5  # ~10 tokens each
+
+    assert list(iter_batches(texts, max_items=2, max_tokens=1000)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_batches(texts, max_items=100, max_tokens=25)) == [[0, 1], [2, 3], [4]]
+
+
+def test_iter_batches_keeps_oversized_item_alone() -> None:
+    texts = ["a", "x" * 400, "b"]
+    assert list(iter_batches(texts, max_items=10, max_tokens=50)) == [[0], [1], [2]]
+
+
+def test_embed_batch_matches_single_embed_in_order(monkeypatch) -> None:
+    monkeypatch.setenv("EMBEDDINGS_MOCK", "1")
+    client = EmbeddingsClient()
+
+    vecs = client.embed_batch(["first", "", "second"])
+
+    assert vecs[0] == client.embed("first")
+    assert vecs[1] == [0.0] * EMBED_DIM
+    assert vecs[2] == client.embed("second")
@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.db.models.job_event import JobEvent
+from app.db.repositories import job_events
+from app.db.repositories.job_events import create_job_event
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    published = []
+    monkeypatch.setattr(job_events, "publish_job_event", published.append)
+    engine = create_engine("sqlite://")
+    JobEvent.__table__.create(engine)
+    with Session(engine) as session:
+        session.info["published"] = published
+        yield session
+
+
+def _count(db: Session) -> int:
+    return db.execute(select(func.count()).select_from(JobEvent)).scalar_one()
+
+
+def test_commit_writes_buffered_events_and_publishes_them(db):
+    job_id = uuid.uuid4()
+    create_job_event(db, job_id=job_id, type="INFO", message="a")
+    create_job_event(db, job_id=job_id, type="RETRY", message="b", meta={"attempt": 2})
+    assert _count(db) == 0  # buffered, not written yet
+
+    published = db.info["published"]
+    db.commit()
+
+    assert _count(db) == 2
+    assert [row.message for row in published] == ["a", "b"]
+
+
+def test_rollback_drops_buffered_events(db):
+    db.connection()  # the transaction the events belong to
+    create_job_event(db, job_id=uuid.uuid4(), type="INFO", message="a")
+    db.rollback()
+    db.commit()
+
+    assert _count(db) == 0
+    assert "pending_job_events" not in db.info
+
+
+def test_savepoint_rollback_keeps_events_of_outer_transaction(db):
+    db.connection()
+    create_job_event(db, job_id=uuid.uuid4(), type="INFO", message="outer")
+    db.begin_nested().rollback()  # e.g. upsert_artifact losing its insert race
+    db.commit()
+
+    assert _count(db) == 1
@@ -0,0 +1,58 @@
+import uuid
+
+from sqlalchemy.orm import Session
+
+import app.db.models  # noqa: F401  (resolve Job relationships)
+from app.db.models.job import Job, JobStatus
+from app.db.repositories.jobs import update_job_fields
+from app.services.job_progress_service import set_job_progress
+
+
+class RecordingSession:
+    def __init__(self):
+        self.commits = 0
+
+    def add(self, obj):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+    def refresh(self, obj):
+        pass
+
+
+def _failed_job() -> Job:
+    return Job(
+        id=uuid.uuid4(), status=JobStatus.FAILED.value, stage="embed_failed", progress=60
+    )
+
+
+def test_sibling_stage_progress_does_not_revive_failed_job():
+    job = _failed_job()
+    db = Session()  # unbound: any SQL would raise
+
+    set_job_progress(
+        db, job=job, status=JobStatus.SUMMARIZING.value, stage="summarize", progress=70
+    )
+
+    assert (job.status, job.stage, job.progress) == ("FAILED", "embed_failed", 60)
+    assert "pending_job_events" not in db.info  # no bogus STATUS_CHANGE event
+
+
+def test_update_job_fields_keeps_failed_status_but_records_errors():
+    job = _failed_job()
+    db = RecordingSession()
+
+    update_job_fields(
+        db,
+        job,
+        status=JobStatus.SUMMARIZING.value,
+        stage="summarize",
+        progress=80,
+        error_message="sibling failed too",
+    )
+
+    assert (job.status, job.stage, job.progress) == ("FAILED", "embed_failed", 60)
+    assert job.error_message == "sibling failed too"
+    assert db.commits == 1
@@ -0,0 +1,78 @@
+import asyncio
+
+from app.services.job_stream import (
+    decode_message,
+    encode_message,
+    parse_last_event_id,
+    stream_job_updates,
+)
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.subscribed = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def unsubscribe(self, channel):
+        self.subscribed.remove(channel)
+
+    async def aclose(self):
+        self.closed = True
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        if not self.messages:
+            return None
+        return {"type": "message", "data": self.messages.pop(0)}
+
+
+def _collect(gen):
+    async def run():
+        return [frame async for frame in gen]
+
+    return asyncio.run(run())
+
+
+def test_message_roundtrip():
+    raw = encode_message("progress", {"status": "TRANSCRIBING", "progress": 40})
+    assert decode_message(raw) == ("progress", {"status": "TRANSCRIBING", "progress": 40})
+    assert decode_message("not json") is None
+
+
+def test_parse_last_event_id():
+    assert parse_last_event_id("42") == 42
+    assert parse_last_event_id(None) == 0
+    assert parse_last_event_id("abc") == 0
+    assert parse_last_event_id("-5") == 0
+
+
+def test_stream_replays_then_follows_until_terminal():
+    events = [{"id": 3, "type": "INFO"}, {"id": 4, "type": "STATUS_CHANGE"}]
+
+    async def load(after_id):
+        return {"status": "TRANSCRIBING", "progress": 40}, [e for e in events if e["id"] > after_id]
+
+    pubsub = FakePubSub(
+        [
+            encode_message("job_event", {"id": 4, "type": "STATUS_CHANGE"}),  # already replayed
+            encode_message("job_event", {"id": 5, "type": "INFO"}),
+            encode_message("progress", {"status": "COMPLETED", "progress": 100}),
+        ]
+    )
+    frames = _collect(stream_job_updates("j1", pubsub=pubsub, load=load, last_event_id=3))
+
+    assert [f.split("\n")[0] for f in frames if f.startswith("id:")] == ["id: 4", "id: 5"]
+    assert "event: progress" in frames[1]
+    assert frames[-1].startswith("event: done")
+    assert pubsub.closed and pubsub.subscribed == []
+
+
+def test_stream_ends_immediately_for_terminal_job():
+    async def load(after_id):
+        return {"status": "FAILED", "progress": 20}, []
+
+    frames = _collect(stream_job_updates("j1", pubsub=FakePubSub([]), load=load))
+    assert [f.split("\n")[0] for f in frames] == ["event: progress", "event: done"]
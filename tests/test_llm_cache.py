@@ -0,0 +1,74 @@
+from app.services.llm_cache import LLMResponseCache, TieredLLMCache, llm_cache_key
+
+
+class DictCache:
+    def __init__(self, fail: bool = False) -> None:
+        self.data: dict[str, str] = {}
+        self.fail = fail
+
+    def get(self, key: str) -> str | None:
+        if self.fail:
+            raise ConnectionError("down")
+        return self.data.get(key)
+
+    def set(self, key: str, value: str, *, provider: str, model: str) -> None:
+        if self.fail:
+            raise ConnectionError("down")
+        self.data[key] = value
+
+    def delete(self, key: str) -> None:
+        if self.fail:
+            raise ConnectionError("down")
+        self.data.pop(key, None)
+
+
+def _key(**overrides: object) -> str:
+    args = {"provider": "openai", "model": "m", "system": "s", "user": "u"}
+    args["params"] = {"a": 1, "b": 2}
+    args.update(overrides)
+    return llm_cache_key(**args)  # type: ignore[arg-type]
+
+
+def test_cache_key_is_deterministic_and_prompt_sensitive() -> None:
+    assert _key() == _key(params={"b": 2, "a": 1})
+    assert len(_key()) == 64
+    assert _key() != _key(model="other")
+    assert _key() != _key(user="u ")
+
+
+def test_tiered_backfills_fast_tier_and_counts_hits() -> None:
+    fast, durable = DictCache(), DictCache()
+    durable.data["k"] = "cached"
+    cache = LLMResponseCache(TieredLLMCache(fast, durable))
+
+    assert cache.get_or_compute("k", lambda: "fresh", provider="p", model="m") == "cached"
+    assert fast.data["k"] == "cached"
+
+    assert cache.get_or_compute("x", lambda: "fresh", provider="p", model="m") == "fresh"
+    assert fast.data["x"] == durable.data["x"] == "fresh"
+    assert cache.stats()["process"]["hit_ratio"] == 0.5
+
+
+def test_cache_fails_open() -> None:
+    cache = LLMResponseCache(DictCache(fail=True))
+
+    assert cache.get_or_compute("k", lambda: "fresh", provider="p", model="m") == "fresh"
+    assert cache.errors == 2
+
+
+def test_invalid_output_is_not_cached_and_bad_entry_is_evicted() -> None:
+    backend = DictCache()
+    cache = LLMResponseCache(backend)
+
+    def valid(v: str) -> bool:
+        return v.startswith("ok")
+
+    out = cache.get_or_compute("k", lambda: "garbage", provider="p", model="m", cacheable=valid)
+    assert out == "garbage"
+    assert "k" not in backend.data
+
+    backend.data["k"] = "stale garbage"
+    out = cache.get_or_compute("k", lambda: "ok fresh", provider="p", model="m", cacheable=valid)
+    assert out == "ok fresh"
+    assert backend.data["k"] == "ok fresh"
+    assert cache.hits == 0
@@ -0,0 +1,72 @@
+import random
+
+from app.services.llm_client import (
+    ChatAnswerFormatter,
+    _postprocess_chat_answer,
+    has_chapters,
+    is_json_array,
+    is_markdown_summary,
+)
+
+SAMPLES = [
+    "  ## Overview\nThe speaker covers \\(x^2\\) and\n\n\n\n- point one\n- point two\n\n",
+    "Intro line\n\\[\n\\frac{a}{b}\n\\]\nAfter the block.\n### Next\r\nTail without newline",
+    "Mixed \\(open inline that\ncloses later\\) then\n\n\n\n\n# Heading\n\\sigma appears here\n",
+    "no newline at all",
+]
+
+
+def _stream(text: str, rng: random.Random) -> str:
+    fmt = ChatAnswerFormatter()
+    out: list[str] = []
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, 7)
+        out.append(fmt.feed(text[i : i + n]))
+        i += n
+    out.append(fmt.finish())
+    return "".join(out)
+
+
+def test_streaming_formatter_matches_batch_postprocess() -> None:
+    rng = random.Random(7)
+    for text in SAMPLES:
+        expected = _postprocess_chat_answer(text.strip())
+        for _ in range(25):
+            assert _stream(text, rng) == expected
+
+
+def test_streaming_formatter_emits_complete_lines_early() -> None:
+    fmt = ChatAnswerFormatter()
+    assert fmt.feed("### Title\nbody") == "**Title**"
+    assert fmt.feed(" text") == ""
+    assert fmt.finish() == "\nbody text"
+
+
+def _feed_all(deltas: list[str]) -> str:
+    fmt = ChatAnswerFormatter()
+    return "".join(fmt.feed(d) for d in deltas) + fmt.finish()
+
+
+def test_streaming_formatter_keeps_newlines_inside_one_delta() -> None:
+    assert _feed_all(["Para one.\n\n", "Para two."]) == "Para one.\n\nPara two."
+    assert _feed_all(["Intro:\n\n- a\n", "- b\n\n\n\n", "### End\n\nbye"]) == (
+        _postprocess_chat_answer("Intro:\n\n- a\n- b\n\n\n\n### End\n\nbye")
+    )
+
+
+def test_streaming_formatter_single_whole_text_delta() -> None:
+    for text in SAMPLES + ["Para one.\n\nPara two.", "Para one.\n\n- x\n- y\n\nEnd"]:
+        assert _feed_all([text]) == _postprocess_chat_answer(text.strip())
+
+
+def test_cacheable_checks_reject_malformed_outputs() -> None:
+    assert is_markdown_summary("## Summary\n- point")
+    assert not is_markdown_summary("I'm sorry, I can't help with that.")
+
+    assert has_chapters("### 0:00 - 1:23 | Intro\n- bullet\n")
+    assert not has_chapters("Chapters:\n1. Intro")
+
+    assert is_json_array('[{"content": "x"}]')
+    assert not is_json_array("- do the thing")
+    assert not is_json_array('{"content": "x"}')
@@ -0,0 +1,19 @@
+import pytest
+
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_is_opaque() -> None:
+    token = encode_cursor("segments", idx=42)
+
+    assert "42" not in token
+    assert "=" not in token
+    assert decode_cursor(token, "segments") == {"idx": 42}
+
+
+def test_cursor_rejects_garbage_and_other_kinds() -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor!", "segments")
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor("jobs", id="x"), "segments")
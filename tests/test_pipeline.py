@@ -0,0 +1,70 @@
+import pytest
+
+from app.workers.pipeline import (
+    PIPELINE_STAGES,
+    STAGE_DONE_TASK,
+    Stage,
+    build_pipeline,
+    ready_stages,
+    topological_levels,
+)
+
+
+def _names(levels: list[list[Stage]]) -> list[list[str]]:
+    return [[s.name for s in level] for level in levels]
+
+
+def test_pipeline_levels_run_independent_stages_together() -> None:
+    levels = _names(topological_levels(PIPELINE_STAGES))
+
+    assert levels[0] == ["download_audio"]
+    assert levels[1] == ["transcribe"]
+    assert set(levels[2]) == {"embed_chunks", "map_summarize"}
+    assert levels[3] == ["reduce_summarize"]
+    assert set(levels[4]) == {
+        "extract_chapters",
+        "extract_key_takeaways",
+        "extract_action_items",
+        "format_markdown",
+    }
+    assert levels[-2] == ["persist_final_results"]
+    assert levels[-1] == ["finalize"]
+
+
+def test_topological_levels_rejects_cycles_and_unknown_deps() -> None:
+    with pytest.raises(ValueError):
+        topological_levels([Stage("a", "t.a", ("b",)), Stage("b", "t.b", ("a",))])
+
+    with pytest.raises(ValueError):
+        topological_levels([Stage("a", "t.a", ("missing",))])
+
+
+def test_build_pipeline_starts_roots_linked_to_stage_done() -> None:
+    tasks = list(build_pipeline("job-1").tasks)
+
+    assert [t.task for t in tasks] == [PIPELINE_STAGES[0].task]
+    assert tasks[0].args == ("job-1",)
+    (done,) = tasks[0].options["link"]
+    assert done.task == STAGE_DONE_TASK
+    assert tuple(done.args) == ("job-1", "download_audio")
+
+
+def test_build_pipeline_rejects_invalid_dag() -> None:
+    with pytest.raises(ValueError):
+        build_pipeline("job-1", [Stage("a", "t.a", ("missing",))])
+
+
+def test_ready_stages_do_not_wait_for_unrelated_branches() -> None:
+    done = {"download_audio", "transcribe", "map_summarize"}
+    ready = {s.name for s in ready_stages(PIPELINE_STAGES, done)}
+
+    # reduce must not wait for embeddings, and finalize still waits for both branches
+    assert ready == {"embed_chunks", "reduce_summarize"}
+
+
+def test_ready_stages_finalize_needs_all_dependencies() -> None:
+    before = {s.name for s in PIPELINE_STAGES} - {"finalize", "embed_chunks"}
+    assert "finalize" not in {s.name for s in ready_stages(PIPELINE_STAGES, before)}
+
+    ready = ready_stages(PIPELINE_STAGES, before | {"embed_chunks"})
+    assert [s.name for s in ready] == ["finalize"]
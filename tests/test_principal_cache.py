@@ -0,0 +1,141 @@
+import asyncio
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.db.models  # noqa: F401  (resolve User relationships)
+from app.db.models.user import User
+from app.services.principal_cache import PrincipalCache, UserPrincipal, get_principal_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _principal(email="a@example.com"):
+    return UserPrincipal(id=uuid.uuid4(), email=email)
+
+
+def test_local_entries_expire():
+    clock = FakeClock()
+    cache = PrincipalCache(ttl_seconds=30, clock=clock)
+    p = _principal()
+    cache.put(p)
+    assert cache.get(p.id) == p
+    assert cache.get(str(p.id)) == p
+    clock.now = 31
+    assert cache.get(p.id) is None
+
+
+def test_local_tier_is_bounded_lru():
+    cache = PrincipalCache(max_entries=2)
+    a, b, c = _principal(), _principal(), _principal()
+    cache.put(a)
+    cache.put(b)
+    cache.get(a.id)
+    cache.put(c)
+    assert cache.get(b.id) is None
+    assert cache.get(a.id) == a and cache.get(c.id) == c
+
+
+def test_redis_tier_backfills_and_invalidates():
+    redis = FakeRedis()
+    writer = PrincipalCache(redis_client=redis)
+    reader = PrincipalCache(redis_client=redis)
+    p = _principal()
+
+    writer.put(p)
+    assert reader.get(p.id) == p  # from Redis, now also local
+
+    writer.invalidate(p.id)
+    assert writer.get(p.id) is None
+    assert redis.data == {}
+
+
+def test_redis_errors_fall_through():
+    class BrokenRedis:
+        def get(self, key):
+            raise ConnectionError("down")
+
+    assert PrincipalCache(redis_client=BrokenRedis()).get(uuid.uuid4()) is None
+
+
+def test_async_tier_uses_async_client():
+    class FakeAsyncRedis(FakeRedis):
+        async def get(self, key):
+            return FakeRedis.get(self, key)
+
+        async def set(self, key, value, ex=None):
+            FakeRedis.set(self, key, value, ex=ex)
+
+    redis = FakeAsyncRedis()
+    writer = PrincipalCache(async_redis_client=redis)
+    reader = PrincipalCache(async_redis_client=redis)
+    p = _principal()
+
+    asyncio.run(writer.aput(p))
+    assert asyncio.run(reader.aget(p.id)) == p
+    assert reader.get(p.id) == p  # backfilled into the local tier
+    assert asyncio.run(reader.aget(uuid.uuid4())) is None
+
+
+def test_user_changes_invalidate_only_after_commit():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    cache = get_principal_cache()
+
+    with Session(engine) as db:
+        user = User(email="a@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        cache.put(UserPrincipal(id=user.id, email=user.email))
+
+        user.email = "b@example.com"
+        db.flush()
+        assert cache.get(user.id) is not None  # not committed yet
+
+        db.rollback()
+        assert cache.get(user.id) is not None
+
+        user.email = "b@example.com"
+        db.commit()
+        assert cache.get(user.id) is None
+    cache.clear()
+
+
+def test_savepoint_rollback_keeps_pending_invalidation():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    cache = get_principal_cache()
+
+    with Session(engine) as db:
+        user = User(email="a@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        cache.put(UserPrincipal(id=user.id, email=user.email))
+
+        user.email = "b@example.com"
+        db.flush()
+        db.begin_nested().rollback()
+        db.commit()
+        assert cache.get(user.id) is None
+    cache.clear()
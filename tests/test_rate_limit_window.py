@@ -0,0 +1,64 @@
+import pytest
+
+from app.services.rate_limit_window import (
+    LocalBlocklist,
+    RateLimit,
+    parse_script_result,
+    parse_script_results,
+    script_args,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_allowed():
+    r = parse_script_result([1, 4, 0], window_seconds=60)
+    assert r.allowed and r.remaining == 4 and r.retry_after_seconds == 0
+
+
+def test_parse_denied_rounds_retry_up():
+    assert parse_script_result([0, 0, 1200], window_seconds=60).retry_after_seconds == 2
+    assert parse_script_result([0, 0, 10], window_seconds=60).retry_after_seconds == 1
+    assert parse_script_result([0, 0, 0], window_seconds=60).retry_after_seconds == 60
+
+
+def test_key_is_per_scope_and_identity():
+    assert RateLimit("auth:login", "a@b.c", 5).key == "rlw:auth:login:a@b.c"
+    assert RateLimit("jobs:create", "u1", 5).key != RateLimit("auth:login", "u1", 5).key
+
+
+def test_blocklist_expires():
+    clock = FakeClock()
+    bl = LocalBlocklist(clock=clock)
+    assert bl.retry_after("k") is None
+    bl.block("k", 2.5)
+    assert bl.retry_after("k") == 3
+    clock.now += 2.5
+    assert bl.retry_after("k") is None
+
+
+def test_blocklist_is_bounded():
+    bl = LocalBlocklist(max_entries=2)
+    for key in ("a", "b", "c"):
+        bl.block(key, 60)
+    assert bl.retry_after("a") is None
+    assert bl.retry_after("c") == 60
+
+
+def test_script_args_and_results_follow_check_order():
+    checks = [RateLimit("auth:login", "a@b.c", 20, 60), RateLimit("auth:login:ip", "1.2.3.4", 100)]
+    assert script_args(checks, "m") == ["m", 60000, 20, 60000, 100]
+
+    # the ip scope is full: the email scope had room but nothing was recorded
+    results = parse_script_results([1, 20, 0, 0, 0, 1500], checks)
+    assert [r.allowed for r in results] == [True, False]
+    assert results[1].retry_after_seconds == 2
+
+    with pytest.raises(ValueError):
+        parse_script_results([1, 4, 0], checks)
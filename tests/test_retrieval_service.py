@@ -0,0 +1,29 @@
+from app.services.retrieval_service import (
+    ITERATIVE_SCAN_MIN_VERSION,
+    parse_extension_version,
+    rrf_fuse,
+)
+
+
+def test_rrf_fuse_rewards_agreement_between_rankings() -> None:
+    fused = rrf_fuse([[1, 2, 3], [3, 4, 1]], k=60)
+    ids = [doc_id for doc_id, _ in fused]
+
+    # 1 and 3 appear in both lists and outrank single-list hits
+    assert set(ids[:2]) == {1, 3}
+    assert ids[0] == 1  # tied with 3 (ranks 1+3 vs 3+1); first seen wins
+    assert set(ids[2:]) == {2, 4}
+
+
+def test_rrf_fuse_scores_and_empty_inputs() -> None:
+    fused = dict(rrf_fuse([["a"], []], k=10))
+    assert fused == {"a": 1.0 / 11}
+    assert rrf_fuse([]) == []
+
+
+def test_parse_extension_version() -> None:
+    assert parse_extension_version("0.8.0") == (0, 8, 0)
+    assert parse_extension_version("0.7.4") < ITERATIVE_SCAN_MIN_VERSION
+    assert parse_extension_version("0.10.1") >= ITERATIVE_SCAN_MIN_VERSION
+    assert parse_extension_version("0.8.0-dev") >= ITERATIVE_SCAN_MIN_VERSION
+    assert parse_extension_version(None) == ()
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from app.services import storage_service
+from app.services.storage_service import move_into_audio_store, sha256_file
+
+
+def test_move_into_audio_store_is_content_addressed(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(storage_service, "AUDIO_STORE_DIR", tmp_path / "audio")
+
+    src = tmp_path / "audio.m4a"
+    src.write_bytes(b"same audio")
+    sha = sha256_file(src)
+
+    dest = move_into_audio_store(src, sha, "m4a")
+    assert dest == tmp_path / "audio" / sha[:2] / f"{sha}.m4a"
+    assert dest.read_bytes() == b"same audio"
+    assert not src.exists()
+
+
+def test_move_into_audio_store_discards_duplicate(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(storage_service, "AUDIO_STORE_DIR", tmp_path / "audio")
+
+    first = tmp_path / "a.webm"
+    first.write_bytes(b"payload")
+    sha = sha256_file(first)
+    dest = move_into_audio_store(first, sha, "webm")
+
+    second = tmp_path / "b.webm"
+    second.write_bytes(b"payload")
+    assert move_into_audio_store(second, sha, "webm") == dest
+    assert not second.exists()
@@ -0,0 +1,23 @@
+from app.services.transcript_cache import AsrParams, build_transcript_cache_key
+
+
+def test_transcript_cache_key_stable_for_same_input() -> None:
+    fp = "a" * 64
+    k1 = build_transcript_cache_key(fp, AsrParams(language="en"))
+    k2 = build_transcript_cache_key(fp, AsrParams.from_job_params({"language": " EN "}))
+    assert k1 == k2
+    assert len(k1) == 64
+
+
+def test_transcript_cache_key_changes_with_asr_params() -> None:
+    fp = "a" * 64
+    base = build_transcript_cache_key(fp, AsrParams())
+    assert base != build_transcript_cache_key(fp, AsrParams(beam_size=1))
+    assert base != build_transcript_cache_key(fp, AsrParams(vad_filter=True))
+    assert base != build_transcript_cache_key(fp, AsrParams(whisper_model="small"))
+    assert base != build_transcript_cache_key("b" * 64, AsrParams())
+
+
+def test_asr_params_ignore_blank_language() -> None:
+    assert AsrParams.from_job_params({"language": "  "}).language is None
+    assert AsrParams.from_job_params(None) == AsrParams()
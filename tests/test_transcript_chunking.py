@@ -0,0 +1,66 @@
+from app.services.tokenizer import ApproxTokenizer
+from app.services.transcript_chunking_service import (
+    ChunkingParams,
+    build_chunk_sets,
+    build_transcript_chunks,
+)
+
+TOK = ApproxTokenizer()
+
+
+def _segments(texts: list[str]) -> list[dict]:
+    return [
+        {"idx": i, "start_ms": i * 5000, "end_ms": (i + 1) * 5000, "text": t}
+        for i, t in enumerate(texts)
+    ]
+
+
+def test_approx_tokenizer_counts_words_punctuation_and_cjk() -> None:
+    assert TOK.count("") == 0
+    assert TOK.count("Hello, world!") == 4
+    assert TOK.count("internationalization") == 4
+    assert TOK.count("東京都") == 3
+
+
+def test_chunks_respect_budget_and_sentence_boundaries() -> None:
+    # Whisper segments split sentences mid-way; chunks must not.
+    texts = [
+        "The first sentence starts here and",
+        "ends here. Second one is short.",
+        "Third goes on.",
+    ]
+    segs = _segments(texts * 6)
+    chunks = build_transcript_chunks(segs, max_tokens=20, tokenizer=TOK)
+
+    assert len(chunks) > 1
+    for c in chunks:
+        assert c["token_count"] <= 20
+        assert c["text"].endswith(".")
+    assert [c["idx"] for c in chunks] == list(range(len(chunks)))
+    assert chunks[0]["start_seconds"] == 0.0
+    assert chunks[-1]["end_seconds"] == 90.0
+
+
+def test_overlap_repeats_trailing_sentences() -> None:
+    segs = _segments([f"Sentence number {i} is here." for i in range(12)])
+    chunks = build_transcript_chunks(segs, max_tokens=24, overlap_tokens=8, tokenizer=TOK)
+
+    for prev, nxt in zip(chunks, chunks[1:]):
+        last_sentence = prev["text"].rsplit(". ", 1)[-1]
+        assert nxt["text"].startswith(last_sentence.rstrip("."))
+    assert "Sentence number 11 is here." in chunks[-1]["text"]
+
+
+def test_oversized_sentence_is_split_between_words() -> None:
+    segs = _segments([" ".join(["word"] * 100)])
+    chunks = build_transcript_chunks(segs, max_tokens=30, tokenizer=TOK)
+
+    assert sum(len(c["text"].split()) for c in chunks) == 100
+    assert all(c["token_count"] <= 30 for c in chunks)
+
+
+def test_chunk_sets_use_separate_budgets() -> None:
+    segs = _segments([f"Point {i} matters a lot today." for i in range(200)])
+    sets = build_chunk_sets(segs, ChunkingParams(), tokenizer=TOK)
+
+    assert len(sets["retrieval"]) > len(sets["summary"]) >= 1
@@ -0,0 +1,36 @@
+import gzip
+import json
+
+from app.services.transcript_export import accepts_gzip, gzip_stream, iter_encoded, iter_transcript_export
+
+ROWS = [
+    {"idx": 0, "start_ms": 0, "end_ms": 1500, "text": " Hello   there "},
+    {"idx": 1, "start_ms": 3_661_001, "end_ms": 3_662_000, "text": "Second line"},
+]
+
+
+def test_srt_and_vtt_cues() -> None:
+    srt = "".join(iter_transcript_export(ROWS, "srt"))
+    assert srt.startswith("1\n00:00:00,000 --> 00:00:01,500\nHello there\n\n2\n01:01:01,001 --> ")
+
+    vtt = "".join(iter_transcript_export(ROWS, "vtt"))
+    assert vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nHello there\n\n")
+
+
+def test_ndjson_lines_round_trip() -> None:
+    lines = list(iter_transcript_export(ROWS, "ndjson"))
+    assert [json.loads(line)["idx"] for line in lines] == [0, 1]
+    assert all(line.endswith("\n") for line in lines)
+
+
+def test_gzip_stream_decompresses_to_original() -> None:
+    body = b"".join(iter_encoded(iter_transcript_export(ROWS * 500, "txt"), buffer_bytes=128))
+    zipped = b"".join(gzip_stream(iter_encoded(iter_transcript_export(ROWS * 500, "txt"))))
+    assert gzip.decompress(zipped) == body
+
+
+def test_accepts_gzip() -> None:
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0, br")
+    assert not accepts_gzip(None)
@@ -0,0 +1,25 @@
+from app.services.job_progress import PROGRESS_STEPS, TRANSCRIBE_PROGRESS_END
+from app.services.transcription_stream import SegmentBatcher, transcribe_progress
+
+
+def test_batcher_flushes_by_count_and_by_time() -> None:
+    now = [0.0]
+    batcher = SegmentBatcher(max_segments=3, max_seconds=10, clock=lambda: now[0])
+
+    assert batcher.add({"idx": 0}) is None
+    assert batcher.add({"idx": 1}) is None
+    assert [s["idx"] for s in batcher.add({"idx": 2}) or []] == [0, 1, 2]
+
+    assert batcher.add({"idx": 3}) is None
+    now[0] = 11.0
+    assert [s["idx"] for s in batcher.add({"idx": 4}) or []] == [3, 4]
+    assert batcher.drain() == []
+
+
+def test_transcribe_progress_stays_inside_its_band() -> None:
+    start = PROGRESS_STEPS["transcribe"].progress
+
+    assert transcribe_progress(0, 600) == start
+    assert transcribe_progress(300, 600) == start + (TRANSCRIBE_PROGRESS_END - start) // 2
+    assert transcribe_progress(900, 600) == TRANSCRIBE_PROGRESS_END
+    assert transcribe_progress(10, None) == start
@@ -0,0 +1,67 @@
+import pytest
+
+from app.services.tree_reduce_service import SummaryNode, plan_batches, reduce_tree
+
+
+def _words(n: int) -> str:
+    return " ".join(["word"] * n)
+
+
+def _leaves(n: int, words: int = 100) -> list[SummaryNode]:
+    return [SummaryNode(0, i, i * 60.0, (i + 1) * 60.0, _words(words)) for i in range(n)]
+
+
+def test_plan_batches_respects_budget_and_fan_in() -> None:
+    batches = plan_batches(_leaves(10), budget_tokens=350, max_fan_in=8)
+    assert [len(b) for b in batches] == [3, 3, 3, 1]
+
+    batches = plan_batches(_leaves(10, words=3), budget_tokens=10_000, max_fan_in=4)
+    assert [len(b) for b in batches] == [4, 4, 2]
+
+
+def test_plan_batches_always_shrinks_a_level() -> None:
+    batches = plan_batches(_leaves(5, words=1000), budget_tokens=100, max_fan_in=8)
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+
+def test_reduce_tree_recurses_until_one_batch_fits() -> None:
+    calls: list[str] = []
+
+    def merge(md: str) -> str:
+        calls.append(md)
+        return _words(100)
+
+    top, sizes = reduce_tree(_leaves(20), merge, budget_tokens=350, max_fan_in=8)
+
+    assert sizes == [7, 3]
+    assert len(top) == 3
+    assert len(calls) == 10
+    assert top[0].start_seconds == 0.0 and top[-1].end_seconds == 1200.0
+
+
+def test_reduce_tree_resumes_and_persists_partial_levels() -> None:
+    saved: dict[tuple[int, int], tuple[str, SummaryNode]] = {}
+
+    def on_level(level: int, merged: list[tuple[str, SummaryNode]]) -> None:
+        for h, node in merged:
+            saved[(node.level, node.idx)] = (h, node)
+
+    def flaky(md: str) -> str:
+        if "960s" in md:  # the batch holding leaf 16
+            raise TimeoutError("llm timeout")
+        return _words(100)
+
+    with pytest.raises(TimeoutError):
+        reduce_tree(_leaves(20), flaky, budget_tokens=350, max_fan_in=8, on_level=on_level)
+    assert len(saved) == 6
+
+    calls: list[str] = []
+
+    def merge(md: str) -> str:
+        calls.append(md)
+        return _words(100)
+
+    reduce_tree(
+        _leaves(20), merge, budget_tokens=350, max_fan_in=8, existing=saved, on_level=on_level
+    )
+    assert len(calls) == 1 + 3
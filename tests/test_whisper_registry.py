@@ -0,0 +1,72 @@
+from app.services.transcript_cache import AsrParams
+from app.services.whisper_registry import WhisperModelRegistry, WhisperSpec, parse_preload
+
+
+def _registry(max_models: int = 2) -> tuple[WhisperModelRegistry, list[WhisperSpec]]:
+    loads: list[WhisperSpec] = []
+
+    def loader(spec: WhisperSpec) -> object:
+        loads.append(spec)
+        return object()
+
+    return WhisperModelRegistry(max_models=max_models, loader=loader), loads
+
+
+def test_registry_reuses_loaded_model():
+    reg, loads = _registry()
+    spec = WhisperSpec(model="base")
+    assert reg.get(spec) is reg.get(WhisperSpec(model="base"))
+    assert loads == [spec]
+    assert reg.stats()[0]["uses"] == 2
+
+
+def test_registry_evicts_least_recently_used():
+    reg, loads = _registry(max_models=2)
+    tiny, base, small = (WhisperSpec(model=m) for m in ("tiny", "base", "small"))
+    reg.get(tiny)
+    reg.get(base)
+    reg.get(tiny)
+    reg.get(small)
+    assert [s["model"] for s in reg.stats()] == ["small", "tiny"]
+    reg.get(base)
+    assert loads == [tiny, base, small, base]
+
+
+def test_registry_keys_on_full_spec():
+    reg, loads = _registry()
+    reg.get(WhisperSpec(model="base", num_workers=1))
+    reg.get(WhisperSpec(model="base", num_workers=4))
+    assert len(loads) == 2
+
+
+def test_preload_skips_failures():
+    def loader(spec: WhisperSpec) -> object:
+        if spec.model == "bad":
+            raise RuntimeError("no such model")
+        return object()
+
+    reg = WhisperModelRegistry(max_models=2, loader=loader)
+    reg.preload(parse_preload("bad, small:float32"))
+    assert [(s["model"], s["compute_type"]) for s in reg.stats()] == [("small", "float32")]
+
+
+def test_parse_preload():
+    assert parse_preload("") == []
+    specs = parse_preload("base:int8, small ,")
+    assert [(s.model, s.compute_type) for s in specs] == [("base", "int8"), ("small", "int8")]
+
+
+def test_job_params_select_model():
+    asr = AsrParams.from_job_params({"whisper_model": "small", "compute_type": "float32"})
+    assert (asr.whisper_model, asr.compute_type) == ("small", "float32")
+
+    bad = AsrParams.from_job_params({"whisper_model": "../evil", "compute_type": 3})
+    assert (bad.whisper_model, bad.compute_type) == ("base", "int8")
+
+
+def test_spec_for_job_clamps_speed_knobs():
+    spec = WhisperSpec.for_job(AsrParams(), {"cpu_threads": -3, "num_workers": 1000})
+    assert spec.cpu_threads == 0
+    assert 1 <= spec.num_workers <= 8
+    default_workers = WhisperSpec().num_workers
+    assert WhisperSpec.for_job(AsrParams(), {"num_workers": True}).num_workers == default_workers